@@ -0,0 +1 @@
+# Configuración del paquete benchmark
@@ -0,0 +1,164 @@
+"""Benchmarks del ETL de video games sales: python -m benchmark.steam_dbBenchmark [factor]"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from config.configuraciones import configuracion
+from extract.steam_dbExtract import PYARROW_AVAILABLE, SteamDBExtractor
+from transform.steam_dbTransform import SteamDBTransform
+
+
+def legacy_clean(df):
+    """Implementación original de SteamDBTransform.clean (columna por columna), usada como referencia"""
+    df = df.copy()
+    sales_cols = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales']
+    for col in sales_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    df = df.dropna(subset=['Name'])
+    df = df[df['Name'].str.strip() != '']
+    for col in ['Platform', 'Genre', 'Publisher']:
+        if col in df.columns:
+            df[col] = df[col].fillna('Unknown')
+    if 'Year' in df.columns:
+        df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(0).astype(int)
+    if 'Rank' in df.columns:
+        df['Rank'] = pd.to_numeric(df['Rank'], errors='coerce').fillna(0).astype(int)
+    if 'Name' in df.columns:
+        df['Name'] = df['Name'].str.strip()
+    if 'Year' in df.columns:
+        df['Decade'] = (df['Year'] // 10) * 10
+    regional_sales = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']
+    df['Total_Regional_Sales'] = df[regional_sales].sum(axis=1)
+    df['Sales_Difference'] = abs(df['Global_Sales'] - df['Total_Regional_Sales'])
+    return df
+
+
+def replicate_dataset(df, factor):
+    """Replicar el dataset `factor` veces para simular archivos más grandes"""
+    return pd.concat([df] * factor, ignore_index=True)
+
+
+def measure(func, *args, repeat=3):
+    """Ejecutar func y devolver (resultado, segundos, pico de memoria en MB)
+    
+    El tiempo es el mejor de `repeat` ejecuciones sin tracemalloc, que ralentiza
+    mucho las asignaciones; el pico de memoria se mide en una ejecución aparte.
+    """
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 ** 2
+
+
+def frames_match(expected, actual):
+    """Comparar la salida del clean original con la nueva (tolerancia de float32)"""
+    if list(expected.columns) != list(actual.columns) or len(expected) != len(actual):
+        return False
+    for col in expected.columns:
+        a, b = expected[col].to_numpy(), actual[col].to_numpy()
+        if expected[col].dtype.kind == 'f':
+            if not np.allclose(a, b.astype('float64'), atol=1e-4):
+                return False
+        elif not (a.astype(str) == b.astype(str)).all():
+            return False
+    return True
+
+
+def benchmark_transform(factor=10, csv_path=None):
+    """Comparar tiempo y memoria del clean original y del vectorizado sobre vgsales.csv x factor"""
+    csv_path = csv_path or configuracion.INPUT_PATH
+    df = replicate_dataset(pd.read_csv(csv_path), factor)
+    print(f"Benchmark de transformación: {len(df):,} registros ({factor}x {csv_path})")
+    
+    legacy, legacy_time, legacy_peak = measure(legacy_clean, df)
+    # Sin validación: el clean original no la hace y descartaría otras filas (duplicados de la clave)
+    current, current_time, current_peak = measure(
+        lambda d: SteamDBTransform(d, verbose=False, validate=False).clean(), df)
+    
+    legacy_size = legacy.memory_usage(deep=True).sum() / 1024 ** 2
+    current_size = current.memory_usage(deep=True).sum() / 1024 ** 2
+    
+    print(f"{'':<14} {'Tiempo (s)':>11} {'Pico (MB)':>10} {'Resultado (MB)':>15}")
+    print(f"{'Original':<14} {legacy_time:>11.3f} {legacy_peak:>10.1f} {legacy_size:>15.1f}")
+    print(f"{'Vectorizado':<14} {current_time:>11.3f} {current_peak:>10.1f} {current_size:>15.1f}")
+    print(f"Aceleración: {legacy_time / current_time:.2f}x - "
+          f"Reducción de memoria del resultado: {1 - current_size / legacy_size:.0%}")
+    print(f"Salida equivalente: {'sí' if frames_match(legacy, current) else 'NO'}")
+    return {
+        'rows': len(df),
+        'legacy_seconds': legacy_time,
+        'seconds': current_time,
+        'legacy_peak_mb': legacy_peak,
+        'peak_mb': current_peak,
+        'legacy_result_mb': legacy_size,
+        'result_mb': current_size,
+    }
+
+
+def benchmark_extract(factor=10, csv_path=None):
+    """Comparar pd.read_csv sin tipos con la lectura tipada de SteamDBExtractor sobre vgsales.csv x factor"""
+    csv_path = csv_path or configuracion.INPUT_PATH
+    df = replicate_dataset(pd.read_csv(csv_path), factor)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        big_csv = os.path.join(tmp_dir, 'vgsales_big.csv')
+        df.to_csv(big_csv, index=False)
+        print(f"Benchmark de extracción: {len(df):,} registros ({factor}x {csv_path}), "
+              f"motor {'pyarrow' if PYARROW_AVAILABLE else 'c'}")
+        
+        untyped, untyped_time, untyped_peak = measure(pd.read_csv, big_csv)
+        typed, typed_time, typed_peak = measure(SteamDBExtractor(big_csv)._read_csv)
+    
+    untyped_size = untyped.memory_usage(deep=True).sum() / 1024 ** 2
+    typed_size = typed.memory_usage(deep=True).sum() / 1024 ** 2
+    
+    print(f"{'':<14} {'Tiempo (s)':>11} {'Pico (MB)':>10} {'Resultado (MB)':>15}")
+    print(f"{'Sin tipos':<14} {untyped_time:>11.3f} {untyped_peak:>10.1f} {untyped_size:>15.1f}")
+    print(f"{'Tipado':<14} {typed_time:>11.3f} {typed_peak:>10.1f} {typed_size:>15.1f}")
+    return {
+        'rows': len(df),
+        'untyped_seconds': untyped_time,
+        'seconds': typed_time,
+        'untyped_result_mb': untyped_size,
+        'result_mb': typed_size,
+    }
+
+
+def benchmark_parallel(factor=10, files=8, csv_path=None):
+    """Medir la extracción y transformación en paralelo de `files` archivos con 1..N procesos"""
+    csv_path = csv_path or configuracion.INPUT_PATH
+    df = replicate_dataset(pd.read_csv(csv_path), factor)
+    cores = os.cpu_count() or 1
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for number, part in enumerate(np.array_split(np.arange(len(df)), files)):
+            df.iloc[part].to_csv(os.path.join(tmp_dir, f'vgsales_{number:02d}.csv'), index=False)
+        print(f"Benchmark de extracción en paralelo: {len(df):,} registros en {files} archivos, {cores} núcleos")
+        
+        extractor = SteamDBExtractor(tmp_dir)
+        print(f"{'Procesos':<10} {'Tiempo (s)':>11} {'Filas/s':>12}")
+        for workers in sorted({1, max(cores // 2, 1), cores}):
+            _, elapsed, _ = measure(extractor.extract_transform_parallel, workers, repeat=1)
+            results[workers] = elapsed
+            print(f"{workers:<10} {elapsed:>11.3f} {len(df) / elapsed:>12,.0f}")
+    return {'rows': len(df), 'files': files, 'seconds_by_workers': results}
+
+
+if __name__ == "__main__":
+    factor = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    benchmark_extract(factor)
+    print()
+    benchmark_transform(factor)
+    print()
+    benchmark_parallel(factor)
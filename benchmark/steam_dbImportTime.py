@@ -0,0 +1,89 @@
+"""Tiempo de arranque de main.py, la vista y la CLI (mediana en intérpretes nuevos)"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Módulos de entrada medidos
+MODULES = ['main', 'view.steam_dbView', 'view.steam_dbAsyncView', 'view.steam_dbCli']
+
+# Llamadas cortas a la CLI medidas con --commands
+COMMANDS = [
+    ['stats', '--format', 'json'],
+    ['search', 'mario', '--format', 'json'],
+    ['top-publishers', '--format', 'json'],
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(args):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} terminó con código {result.returncode}: {result.stderr.strip()[-300:]}")
+    return elapsed, result
+
+
+def interpreter_time(repeat):
+    """Mediana (s) de arrancar un intérprete sin importar nada: la base de cada medida"""
+    return statistics.median(_run(['-c', 'pass'])[0] for _ in range(repeat))
+
+
+def import_time(module, repeat):
+    """Mediana (s) de un intérprete nuevo que solo importa module"""
+    return statistics.median(_run(['-c', f'import {module}'])[0] for _ in range(repeat))
+
+
+def import_offenders(module, top=8):
+    """Paquetes que más tiempo de importación suman: [(paquete, ms)]
+
+    Usa la salida de `-X importtime`: el tiempo propio de cada módulo se
+    atribuye a su paquete de primer nivel (sqlalchemy.engine -> sqlalchemy).
+    """
+    _, result = _run(['-X', 'importtime', '-c', f'import {module}'])
+    totals = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0) + int(own) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def command_time(command, repeat):
+    """Mediana (s) de una llamada completa a la CLI"""
+    return statistics.median(_run(['-m', 'view.steam_dbCli'] + command)[0] for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de importación de main.py, la vista y la CLI")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por medida (se usa la mediana)")
+    parser.add_argument('--top', type=int, default=8, help="Importaciones más caras a mostrar por módulo")
+    parser.add_argument('--commands', action='store_true', help="Medir también las llamadas a la CLI")
+    args = parser.parse_args()
+
+    base = interpreter_time(args.repeat)
+    print(f"Intérprete vacío: {base * 1000:.0f} ms (se resta de cada medida)\n")
+    print(f"{'Módulo':<26} {'Importación (ms)':>17}")
+    for module in MODULES:
+        print(f"{module:<26} {(import_time(module, args.repeat) - base) * 1000:>17.0f}")
+
+    for module in MODULES:
+        print(f"\nImportaciones más caras de {module}:")
+        for package, ms in import_offenders(module, args.top):
+            print(f"  {package:<30} {ms:>8.1f} ms")
+
+    if args.commands:
+        print(f"\n{'Comando CLI':<40} {'Total (ms)':>11}")
+        for command in COMMANDS:
+            print(f"{' '.join(command):<40} {command_time(command, args.repeat) * 1000:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
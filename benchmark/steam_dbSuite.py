@@ -0,0 +1,208 @@
+"""Suite de benchmarks del ETL completo sobre datasets sintéticos (resultados en JSON)"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+import pandas as pd
+import sqlalchemy
+from sqlalchemy import inspect, text
+
+from benchmark.steam_dbSynthetic import SyntheticDataset
+from config.conexiones import dispose_engines, get_engine
+from config.configuraciones import configuracion
+from extract.steam_dbExtract import SteamDBExtractor
+from load.steam_dbLoad import Load
+from load.steam_dbRollups import ROLLUPS
+from load.steam_dbSchema import DIMENSIONS, FACT_TABLE
+from load.steam_dbSketches import SKETCH_TABLE
+from monitor.steam_dbMonitor import RunMonitor, stage
+from transform.steam_dbTransform import SteamDBTransform
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+RESULTS_DIR = 'benchmark/results'
+
+# Tablas (y la vista video_games_sales) que crea el ETL y que la suite elimina entre tamaños;
+# la vista va antes que las tablas de las que depende
+ETL_TABLES = (['video_games_sales', FACT_TABLE, 'video_games_sales_quarantine', 'schema_migrations',
+               'etl_load_generation', SKETCH_TABLE] + [table for table, _, _ in DIMENSIONS.values()] + list(ROLLUPS))
+
+# Informes de SteamDBView medidos: (fase, método, argumentos)
+VIEW_REPORTS = [
+    ('view.database_info', 'get_database_info', ()),
+    ('view.basic_stats', 'get_basic_stats', ()),
+    ('view.platform', 'get_platform_analysis', ()),
+    ('view.genre', 'get_genre_analysis', ()),
+    ('view.yearly', 'get_yearly_analysis', ()),
+    ('view.top_publishers', 'get_top_publishers', ()),
+    ('view.search', 'search_games', ('mario',)),
+    ('view.search_sql', 'search_games', ('mario',)),
+]
+
+
+def environment(db_url):
+    """Datos del entorno para poder comparar resultados de máquinas distintas"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'sqlalchemy': sqlalchemy.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'dialect': db_url.split(':', 1)[0],
+        'commit': commit,
+    }
+
+
+def reset_database(engine):
+    """Eliminar las tablas del ETL para que cada tamaño empiece con la base vacía"""
+    # video_games_sales es una tabla en esquemas anteriores a la migración 6
+    views = set(inspect(engine).get_view_names())
+    with engine.begin() as conn:
+        for table in ETL_TABLES:
+            conn.execute(text(f"DROP {'VIEW' if table in views else 'TABLE'} IF EXISTS {table}"))
+
+
+def run_size(rows, db_url, work_dir, seed=42):
+    """Medir el ETL y los informes para un dataset de `rows` filas"""
+    # La vista se importa aquí: no hace falta para generar los datos ni para el ETL
+    from view.steam_dbView import SteamDBView
+
+    csv_path = os.path.join(work_dir, f'vgsales_{rows}.csv')
+    monitor = RunMonitor()
+    log = io.StringIO()
+    with monitor.activate():
+        with stage('generate') as step:
+            SyntheticDataset(seed=seed).write_csv(csv_path, rows)
+            step.rows_out = rows
+
+        reset_database(get_engine(db_url))
+        with contextlib.redirect_stdout(log):
+            with stage('extract') as step:
+                df = SteamDBExtractor(csv_path).extract()
+                step.rows_out = len(df)
+            with stage('transform', rows_in=len(df)) as step:
+                df = SteamDBTransform(df, verbose=False).clean()
+                step.rows_out = len(df)
+            with stage('load', rows_in=len(df)):
+                if not Load(df).load_to_database(mode='append'):
+                    raise RuntimeError(f"La carga de {rows} filas falló")
+            del df
+
+            view = SteamDBView()
+            for name, method, args in VIEW_REPORTS:
+                if name == 'view.search_sql':
+                    # Sin índice en memoria: fuerza la consulta LIKE en la base de datos
+                    view._get_search_index = lambda: None
+                    view._rebuild_search_index = lambda signature=None: None
+                with stage(name):
+                    getattr(view, method)(*args)
+    os.remove(csv_path)
+    # Los informes no lanzan excepciones: sus errores solo aparecen en la salida
+    errors = [line.strip() for line in log.getvalue().splitlines() if '❌' in line]
+    return {'rows': rows, **monitor.report(), 'errors': errors}
+
+
+def run_suite(sizes=None, db_url=None, output=None, seed=42):
+    """Ejecutar todos los tamaños y guardar los resultados en output (JSON)"""
+    sizes = sizes or DEFAULT_SIZES
+    work_dir = tempfile.mkdtemp(prefix='steam_db_bench_')
+    db_url = db_url or f"sqlite:///{os.path.join(work_dir, 'bench.sqlite')}"
+    output = output or os.path.join(RESULTS_DIR, f"suite_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+    # Los componentes del ETL leen la URL y el resto de opciones de configuracion
+    configuracion.DB_URL = db_url
+    configuracion.SEARCH_INDEX_PATH = ''
+    configuracion.CACHE_PATH = ''
+    configuracion.QUARANTINE_PATH = ''
+    # Sin caché de resultados: cada informe debe llegar a la base de datos
+    configuracion.QUERY_CACHE_MAX_MB = 0
+
+    results = {'created_at': datetime.now().isoformat(timespec='seconds'),
+               'seed': seed, 'environment': environment(db_url), 'runs': []}
+    try:
+        for rows in sizes:
+            print(f"▶ {rows:,} filas...")
+            run = run_size(rows, db_url, work_dir, seed)
+            results['runs'].append(run)
+            print_run(run)
+    finally:
+        dispose_engines()
+
+    parent = os.path.dirname(output)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📄 Resultados guardados en {output}")
+    return results
+
+
+def print_run(run):
+    for error in run['errors']:
+        print(f"   {error}")
+    print(f"{'Fase':<22} {'Real (s)':>9} {'CPU (s)':>9} {'RSS (MB)':>9} {'Filas/s':>12}")
+    for item in run['stages']:
+        rate = item['rows_per_second']
+        print(f"{item['stage']:<22} {item['wall_seconds']:>9.3f} {item['cpu_seconds']:>9.3f} "
+              f"{item['peak_rss_mb']:>9.1f} {f'{rate:,.0f}' if rate else '-':>12}")
+
+
+def compare(baseline, current, threshold=0.2):
+    """Comparar dos resultados y devolver las fases más lentas que baseline en más de threshold
+
+    Las fases de menos de 10 ms se ignoran: su variación es sobre todo ruido.
+    """
+    base = {(run['rows'], item['stage']): item['wall_seconds']
+            for run in baseline['runs'] for item in run['stages']}
+    regressions = []
+    if baseline['environment'].get('dialect') != current['environment'].get('dialect'):
+        print("⚠️  Los resultados usan bases de datos distintas; la comparación es orientativa")
+    print(f"\n{'Filas':>10} {'Fase':<22} {'Base (s)':>9} {'Actual (s)':>10} {'Cambio':>8}")
+    for run in current['runs']:
+        for item in run['stages']:
+            key = (run['rows'], item['stage'])
+            if key not in base:
+                continue
+            before, after = base[key], item['wall_seconds']
+            change = (after - before) / before if before > 0 else 0.0
+            flag = ''
+            if max(before, after) >= 0.01 and change > threshold:
+                regressions.append({'rows': key[0], 'stage': key[1], 'baseline': before,
+                                    'current': after, 'change': change})
+                flag = ' ⚠️'
+            print(f"{key[0]:>10,} {key[1]:<22} {before:>9.3f} {after:>10.3f} {change:>+8.0%}{flag}")
+    print(f"\n{'❌' if regressions else '✅'} {len(regressions)} regresiones por encima del {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del ETL sobre datasets sintéticos")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="Tamaños separados por comas (p. ej. 10000,100000,50000000)")
+    parser.add_argument('--db-url', help="Base de datos de pruebas: se borran sus tablas del ETL "
+                                          "(por defecto un SQLite temporal)")
+    parser.add_argument('--output', help=f"Archivo de resultados (por defecto {RESULTS_DIR}/suite_<fecha>.json)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--compare', help="Resultados de referencia para detectar regresiones")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Ralentización tolerada (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    results = run_suite(sizes, args.db_url, args.output, args.seed)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Generador de datasets sintéticos con la forma de vgsales.csv"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from config.configuraciones import configuracion
+from config.esquema import REGIONAL_SALES_COLUMNS
+
+# Proporción de nombres con espacios sobrantes y de nombres vacíos
+DIRTY_NAME_RATE = 0.005
+EMPTY_NAME_RATE = 0.0005
+# Desviación del ruido log-normal aplicado a las ventas regionales
+SALES_NOISE = 0.3
+
+
+class SyntheticDataset:
+    """Generador reproducible (misma semilla, mismas filas) a partir de un CSV de referencia
+
+    Plataforma, año, género y editor se toman juntos de una fila real (se
+    conservan cardinalidades, correlaciones y nulos), las ventas llevan ruido
+    log-normal y los nombres un sufijo por réplica; unos pocos se ensucian o vacían.
+    """
+
+    def __init__(self, reference_path=None, seed=42):
+        self.reference = pd.read_csv(reference_path or configuracion.INPUT_PATH)
+        self.seed = seed
+
+    def generate(self, rows, start=0):
+        """Generar las filas [start, start + rows) como DataFrame con las columnas de vgsales.csv"""
+        # Semilla derivada del desplazamiento: cada bloque es reproducible por separado
+        rng = np.random.default_rng([self.seed, start])
+        reference = self.reference
+        positions = np.arange(start, start + rows)
+        base = reference.iloc[positions % len(reference)].reset_index(drop=True)
+        replica = positions // len(reference)
+
+        names = base['Name'].astype(str).to_numpy(dtype=object)
+        suffixed = replica > 0
+        names[suffixed] = names[suffixed] + ' ' + replica[suffixed].astype(str)
+        dirty = rng.random(rows)
+        names[dirty < DIRTY_NAME_RATE] = '  ' + names[dirty < DIRTY_NAME_RATE] + ' '
+        names[dirty < EMPTY_NAME_RATE] = ''
+
+        df = pd.DataFrame({
+            'Rank': positions + 1,
+            'Name': names,
+            'Platform': base['Platform'],
+            'Year': base['Year'].astype('Int64'),
+            'Genre': base['Genre'],
+            'Publisher': base['Publisher'],
+        })
+        for col in REGIONAL_SALES_COLUMNS:
+            noise = rng.lognormal(0.0, SALES_NOISE, rows)
+            df[col] = (base[col].to_numpy() * noise).round(2)
+        # Global_Sales: suma regional con el pequeño desfase de redondeo del dataset real
+        df['Global_Sales'] = (df[REGIONAL_SALES_COLUMNS].sum(axis=1)
+                              + rng.choice([-0.01, 0.0, 0.01], rows, p=[0.1, 0.8, 0.1])).clip(lower=0.01).round(2)
+        return df
+
+    def write_csv(self, path, rows, chunk_rows=1_000_000):
+        """Escribir `rows` filas en path por bloques (memoria constante para decenas de millones)"""
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        for start in range(0, rows, chunk_rows):
+            chunk = self.generate(min(chunk_rows, rows - start), start)
+            # Los nulos se escriben como 'N/A', igual que en vgsales.csv
+            chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False, na_rep='N/A')
+        return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python -m benchmark.steam_dbSynthetic filas salida.csv [semilla]")
+        sys.exit(1)
+    rows, output = int(sys.argv[1]), sys.argv[2]
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 42
+    SyntheticDataset(seed=seed).write_csv(output, rows)
+    print(f"Dataset sintético de {rows:,} filas guardado en {output}")
@@ -0,0 +1,175 @@
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from config.configuraciones import configuracion
+
+# Registro de engines compartido por Load y SteamDBView (uno por URL)
+_engines = {}
+_async_engines = {}
+_lock = threading.Lock()
+
+# Driver asíncrono equivalente a cada driver síncrono de DATABASE_URL
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+}
+
+
+class PoolMetrics:
+    """Contadores de uso del pool de conexiones"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_created = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool que mide cuánto espera cada petición hasta obtener una conexión"""
+
+    metrics = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self._record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self._record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # dispose() crea un pool nuevo: conservar las métricas acumuladas
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _record_wait(self, seconds, timed_out=False):
+        if self.metrics is not None:
+            self.metrics.record_wait(seconds, timed_out)
+
+
+def get_engine(url=None):
+    """Devolver el engine compartido para la URL (por defecto DATABASE_URL), creándolo una sola vez"""
+    config = configuracion()
+    url = url or config.DATABASE_URL
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = _create_engine(url, config)
+            _engines[url] = engine
+        return engine
+
+
+def _create_engine(url, config):
+    """Crear un engine con el pool configurado en configuracion y sus métricas"""
+    if url.startswith('sqlite') and (':memory:' in url or url == 'sqlite://'):
+        # SQLite en memoria usa un pool de una conexión por hilo
+        return create_engine(url)
+    
+    engine = create_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics
+    
+    event.listen(engine, 'connect', lambda *args: metrics.increment('connections_created'))
+    event.listen(engine, 'checkout', lambda *args: metrics.increment('checkouts'))
+    event.listen(engine, 'checkin', lambda *args: metrics.increment('checkins'))
+    return engine
+
+
+def async_url(url):
+    """Traducir una URL síncrona a su driver asíncrono (asyncpg, aiosqlite)"""
+    scheme, separator, rest = url.partition('://')
+    return ASYNC_DRIVERS.get(scheme, scheme) + separator + rest
+
+
+def get_async_engine(url=None):
+    """Devolver el engine asíncrono compartido para la URL, con el mismo tamaño de pool"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    config = configuracion()
+    url = async_url(url or config.DATABASE_URL)
+    with _lock:
+        engine = _async_engines.get(url)
+        if engine is None:
+            options = {}
+            if not (url.startswith('sqlite') and ':memory:' in url):
+                options = dict(
+                    pool_size=config.DB_POOL_SIZE,
+                    max_overflow=config.DB_MAX_OVERFLOW,
+                    pool_timeout=config.DB_POOL_TIMEOUT,
+                    pool_recycle=config.DB_POOL_RECYCLE,
+                    pool_pre_ping=config.DB_POOL_PRE_PING,
+                )
+            engine = create_async_engine(url, **options)
+            _async_engines[url] = engine
+        return engine
+
+
+def get_pool_metrics(url=None):
+    """Métricas del pool del engine compartido: uso acumulado y estado actual"""
+    engine = get_engine(url)
+    pool = engine.pool
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is None:
+        return {'pool': pool.status()}
+    
+    with metrics._lock:
+        checkouts = metrics.checkouts
+        return {
+            'pool_size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+            'connections_created': metrics.connections_created,
+            'checkouts': checkouts,
+            'checkins': metrics.checkins,
+            'timeouts': metrics.timeouts,
+            'wait_total_s': metrics.wait_total,
+            'wait_avg_ms': metrics.wait_total / checkouts * 1000 if checkouts else 0.0,
+            'wait_max_ms': metrics.wait_max * 1000,
+        }
+
+
+def dispose_engines():
+    """Cerrar todas las conexiones de los engines registrados"""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+async def dispose_async_engines():
+    """Cerrar las conexiones de los engines asíncronos registrados"""
+    with _lock:
+        engines = list(_async_engines.values())
+        _async_engines.clear()
+    for engine in engines:
+        await engine.dispose()
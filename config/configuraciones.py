@@ -1,4 +1,5 @@
 import os
+from datetime import datetime
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
@@ -6,8 +7,32 @@ load_dotenv()
 
 class configuracion:
     # Configuración de archivos
+    # Un CSV, un directorio con CSV o un glob (p. ej. extract/files/ventas_*.csv)
     INPUT_PATH = os.getenv('INPUT_PATH', 'extract/files/vgsales.csv')
+    # Procesos para extraer y transformar varios archivos en paralelo (0 = núcleos disponibles)
+    EXTRACT_WORKERS = int(os.getenv('EXTRACT_WORKERS', '0'))
     OUTPUT_PATH = os.getenv('OUTPUT_PATH', 'extract/files/vgsales_clean.csv')
+    # Caché columnar (Arrow IPC) del dataset limpio; vacío para desactivarla
+    CACHE_PATH = os.getenv('CACHE_PATH', 'extract/files/vgsales_clean.arrow')
+    # Índice de búsqueda por nombre serializado (pickle: solo rutas de confianza) y cada cuánto se comprueba su vigencia
+    SEARCH_INDEX_PATH = os.getenv('SEARCH_INDEX_PATH', 'extract/files/search_index.pkl')
+    SEARCH_INDEX_TTL = float(os.getenv('SEARCH_INDEX_TTL', '30'))
+    # Caché de resultados de consultas de la vista: memoria máxima en MB (0 = desactivada)
+    # y cada cuántos segundos se consulta la generación de carga para invalidarla
+    QUERY_CACHE_MAX_MB = float(os.getenv('QUERY_CACHE_MAX_MB', '64'))
+    QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', '5'))
+    # Registros por bloque al exportar la tabla desde la vista
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '50000'))
+    # Salida de los informes de la vista (table | json | csv) y filas por página en los listados
+    VIEW_OUTPUT_FORMAT = os.getenv('VIEW_OUTPUT_FORMAT', 'table')
+    VIEW_PAGE_SIZE = int(os.getenv('VIEW_PAGE_SIZE', '50'))
+    # Modo aproximado de la vista: informes por muestreo con márgenes de error y sketches del loader.
+    # APPROX_SAMPLE_ROWS: filas de la muestra (reservoir del loader y objetivo de TABLESAMPLE);
+    # APPROX_SAMPLE_METHOD: system (por páginas, más rápido) | bernoulli (por filas, márgenes más estrechos)
+    VIEW_APPROXIMATE = os.getenv('VIEW_APPROXIMATE', 'false').lower() in ('1', 'true', 'yes')
+    APPROX_SAMPLE_ROWS = int(os.getenv('APPROX_SAMPLE_ROWS', '20000'))
+    APPROX_SAMPLE_METHOD = os.getenv('APPROX_SAMPLE_METHOD', 'system')
+    APPROX_CONFIDENCE = float(os.getenv('APPROX_CONFIDENCE', '0.95'))
     
     # Configuración de base de datos
     DB_HOST = os.getenv('DB_HOST')
@@ -15,8 +40,51 @@ class configuracion:
     DB_NAME = os.getenv('DB_NAME')
     DB_USER = os.getenv('DB_USER')
     DB_PASSWORD = os.getenv('DB_PASSWORD')
+    # URL completa opcional (p. ej. sqlite:///steam_db.sqlite); tiene prioridad sobre DB_*
+    DB_URL = os.getenv('DB_URL')
+    
+    # Pool de conexiones compartido (config/conexiones.py)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # segundos
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Configuración de carga
+    LOAD_METHOD = os.getenv('LOAD_METHOD', 'copy')  # copy | multi
+    LOAD_CHUNK_SIZE = int(os.getenv('LOAD_CHUNK_SIZE', '50000'))
+    LOAD_MODE = os.getenv('LOAD_MODE', 'append')  # append | incremental (upsert) | replace (particiones)
+    # Conexiones que cargan particiones en paralelo (solo PostgreSQL; 1 = una sola conexión)
+    LOAD_WORKERS = int(os.getenv('LOAD_WORKERS', '1'))
+    # Cargas con al menos estas filas quitan y reconstruyen los índices secundarios (0 = nunca)
+    INDEX_REBUILD_MIN_ROWS = int(os.getenv('INDEX_REBUILD_MIN_ROWS', '100000'))
+    # Particionado por rangos de year de la tabla de hechos (solo PostgreSQL): year | decade | vacío
+    PARTITION_BY = os.getenv('PARTITION_BY', '')
+    
+    # Validación de calidad: tolerancia entre Global_Sales y la suma regional y rango de años válido
+    VALIDATION_SALES_TOLERANCE = float(os.getenv('VALIDATION_SALES_TOLERANCE', '0.05'))
+    VALIDATION_YEAR_MIN = int(os.getenv('VALIDATION_YEAR_MIN', '1970'))
+    VALIDATION_YEAR_MAX = int(os.getenv('VALIDATION_YEAR_MAX', str(datetime.now().year + 1)))
+    # Filas rechazadas: CSV de cuarentena (vacío = no guardar) y tabla video_games_sales_quarantine
+    QUARANTINE_PATH = os.getenv('QUARANTINE_PATH', 'extract/files/vgsales_quarantine.csv')
+    QUARANTINE_TO_DB = os.getenv('QUARANTINE_TO_DB', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Modo streaming: si CHUNK_SIZE > 0 el ETL procesa el CSV por bloques
+    CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', '0'))
+    # Pipeline: extracción, transformación, carga y backup en hilos a la vez con colas de como
+    # mucho PIPELINE_QUEUE_SIZE bloques entre etapas (0 = etapas en secuencia)
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '2'))
+    
+    # Métricas por fase del ETL: informe JSON (vacío = no guardar) y textfile de Prometheus opcional
+    METRICS_PATH = os.getenv('METRICS_PATH', 'metrics/etl_run.json')
+    PROMETHEUS_PATH = os.getenv('PROMETHEUS_PATH', '')
+    # Perfilado opcional por fase: cprofile, tracemalloc o ambos separados por comas
+    PROFILE_MODE = os.getenv('PROFILE_MODE', '')
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
     
     # URL de conexión a la base de datos
     @property
     def DATABASE_URL(self):
-        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
\ No newline at end of file
+        if self.DB_URL:
+            return self.DB_URL
+        return f"postgresql+psycopg2://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
@@ -0,0 +1,61 @@
+# Esquema declarativo del dataset vgsales compartido por las fases del ETL
+
+# Columnas de ventas (millones de unidades)
+REGIONAL_SALES_COLUMNS = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']
+SALES_COLUMNS = REGIONAL_SALES_COLUMNS + ['Global_Sales']
+
+# Columnas de texto con pocos valores distintos y su valor por defecto
+CATEGORY_COLUMNS = ['Platform', 'Genre', 'Publisher']
+UNKNOWN_VALUE = 'Unknown'
+
+# Tipos con los que SteamDBExtractor lee el CSV (enteros nullable porque el
+# archivo trae 'N/A' en Year; Name se deja con el tipo de texto por defecto)
+READ_DTYPES = {
+    'Rank': 'Int32',
+    'Platform': 'category',
+    'Year': 'Int16',
+    'Genre': 'category',
+    'Publisher': 'category',
+    'NA_Sales': 'float32',
+    'EU_Sales': 'float32',
+    'JP_Sales': 'float32',
+    'Other_Sales': 'float32',
+    'Global_Sales': 'float32',
+}
+READ_COLUMNS = ['Rank', 'Name', 'Platform', 'Year', 'Genre', 'Publisher'] + SALES_COLUMNS
+
+# Tipos del DataFrame limpio que produce SteamDBTransform.clean
+# (Name conserva el tipo de texto por defecto de pandas)
+CLEAN_DTYPES = {
+    'Rank': 'int32',
+    'Platform': 'category',
+    'Year': 'int16',
+    'Genre': 'category',
+    'Publisher': 'category',
+    'NA_Sales': 'float32',
+    'EU_Sales': 'float32',
+    'JP_Sales': 'float32',
+    'Other_Sales': 'float32',
+    'Global_Sales': 'float32',
+    'Decade': 'int16',
+    'Total_Regional_Sales': 'float32',
+    'Sales_Difference': 'float32',
+}
+
+# Nombres de columnas del DataFrame -> columnas de la tabla video_games_sales
+COLUMN_MAPPING = {
+    'Rank': 'rank',
+    'Name': 'name',
+    'Platform': 'platform',
+    'Year': 'year',
+    'Genre': 'genre',
+    'Publisher': 'publisher',
+    'NA_Sales': 'na_sales',
+    'EU_Sales': 'eu_sales',
+    'JP_Sales': 'jp_sales',
+    'Other_Sales': 'other_sales',
+    'Global_Sales': 'global_sales',
+    'Decade': 'decade',
+    'Total_Regional_Sales': 'total_regional_sales',
+    'Sales_Difference': 'sales_difference'
+}
@@ -0,0 +1,30 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Módulo que se carga al acceder a su primer atributo
+
+    Para dependencias pesadas (pandas, numpy) en módulos que también se usan
+    desde la CLI: `pd = lazy_import('pandas')` no cuesta nada hasta la primera
+    llamada `pd.algo`. Si el módulo ya está importado se devuelve tal cual.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def module_available(name):
+    """Comprobar si un módulo opcional está instalado sin importarlo"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
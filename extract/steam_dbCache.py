@@ -0,0 +1,145 @@
+import hashlib
+import importlib.util
+import json
+import os
+from config.configuraciones import configuracion
+from config.esquema import CLEAN_DTYPES, READ_COLUMNS, READ_DTYPES
+from config.importaciones import lazy_import, module_available
+from extract.steam_dbExtract import resolve_input_paths
+
+# pyarrow es opcional: sin él la caché columnar queda desactivada
+PYARROW_AVAILABLE = module_available('pyarrow')
+pa = lazy_import('pyarrow') if PYARROW_AVAILABLE else None
+
+METADATA_KEY = b'steam_db.source'
+
+# Módulos cuyo código determina el DataFrame limpio: si cambian, las cachés anteriores dejan de valer
+TRANSFORM_MODULES = ['config.esquema', 'extract.steam_dbExtract', 'transform.steam_dbTransform',
+                     'transform.steam_dbValidate']
+
+
+def transform_version():
+    """Hash del esquema, del código de lectura, limpieza y validación y de sus umbrales"""
+    config = configuracion()
+    digest = hashlib.blake2b(digest_size=16)
+    schema = {
+        'read_columns': READ_COLUMNS,
+        'read_dtypes': READ_DTYPES,
+        'clean_dtypes': CLEAN_DTYPES,
+        # Las reglas de validación deciden qué filas quedan fuera del DataFrame cacheado
+        'validation': [config.VALIDATION_SALES_TOLERANCE, config.VALIDATION_YEAR_MIN, config.VALIDATION_YEAR_MAX],
+    }
+    digest.update(json.dumps(schema, sort_keys=True).encode())
+    for name in TRANSFORM_MODULES:
+        with open(importlib.util.find_spec(name).origin, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class SteamDBCache:
+    """Caché columnar (Arrow IPC) del DataFrame limpio
+    
+    La caché se asocia al tamaño, la fecha de modificación y el hash del
+    contenido del CSV (o de los CSV) de origen, y a la versión del esquema y
+    de la limpieza (transform_version); se lee con memory-map.
+    """
+
+    def __init__(self, source_path, cache_path):
+        self.source_path = source_path
+        self.cache_path = cache_path
+
+    @property
+    def enabled(self):
+        return PYARROW_AVAILABLE and bool(self.cache_path)
+
+    def source_fingerprint(self, with_hash=True):
+        """Tamaño, mtime y (opcionalmente) hash blake2b del origen
+        
+        Si el origen es un directorio o un glob se suman los tamaños, se toma el
+        mtime más reciente, se guarda la lista de archivos y el hash cubre todos.
+        """
+        paths = resolve_input_paths(self.source_path)
+        stats = [os.stat(path) for path in paths]
+        fingerprint = {
+            'size': sum(stat.st_size for stat in stats),
+            'mtime_ns': max(stat.st_mtime_ns for stat in stats),
+        }
+        if paths != [self.source_path]:
+            fingerprint['files'] = [os.path.basename(path) for path in paths]
+        if with_hash:
+            digest = hashlib.blake2b(digest_size=16)
+            for path in paths:
+                with open(path, 'rb') as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(block)
+            fingerprint['sha'] = digest.hexdigest()
+        return fingerprint
+
+    def is_valid(self):
+        """Comprobar si la caché corresponde al archivo de origen y a la limpieza actuales
+        
+        Si tamaño y mtime coinciden no se lee el origen; si solo cambió el mtime
+        se compara el hash del contenido.
+        """
+        stored = self._stored_fingerprint()
+        paths = resolve_input_paths(self.source_path)
+        if stored is None or not paths or not all(os.path.exists(path) for path in paths):
+            return False
+        if stored.get('version') != transform_version():
+            return False
+        
+        current = self.source_fingerprint(with_hash=False)
+        if current['size'] != stored.get('size') or current.get('files') != stored.get('files'):
+            return False
+        if current['mtime_ns'] == stored.get('mtime_ns'):
+            return True
+        return self.source_fingerprint()['sha'] == stored.get('sha')
+
+    def load(self):
+        """Devolver el DataFrame cacheado si sigue siendo válido, o None"""
+        try:
+            if not self.enabled or not self.is_valid():
+                return None
+            df = self.read()
+            print(f"Caché columnar válida: {len(df)} registros leídos de {self.cache_path}")
+            return df
+        except Exception as e:
+            print(f"Error al leer la caché columnar: {e}")
+            return None
+
+    def read(self):
+        """Leer la caché con memory-map sin comprobar su vigencia (fuente de datos offline)"""
+        with pa.memory_map(self.cache_path, 'r') as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    def save(self, df):
+        """Guardar el DataFrame limpio junto con la huella del origen y la versión de la limpieza"""
+        try:
+            if not self.enabled:
+                return False
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            fingerprint = {**self.source_fingerprint(), 'version': transform_version()}
+            metadata[METADATA_KEY] = json.dumps(fingerprint).encode()
+            table = table.replace_schema_metadata(metadata)
+            
+            # Escribir a un archivo temporal y renombrar para no dejar cachés a medias
+            tmp_path = f"{self.cache_path}.tmp"
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, self.cache_path)
+            print(f"Caché columnar actualizada en {self.cache_path}")
+            return True
+        except Exception as e:
+            print(f"Error al guardar la caché columnar: {e}")
+            return False
+
+    def _stored_fingerprint(self):
+        """Leer la huella guardada en los metadatos del esquema Arrow"""
+        if not self.enabled or not os.path.exists(self.cache_path):
+            return None
+        with pa.memory_map(self.cache_path, 'r') as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        raw = metadata.get(METADATA_KEY)
+        return json.loads(raw) if raw else None
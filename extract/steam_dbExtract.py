@@ -1,19 +1,118 @@
 import pandas as pd
+import glob
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config.esquema import CATEGORY_COLUMNS, READ_COLUMNS, READ_DTYPES
+from config.importaciones import lazy_import, module_available
+
+# El motor pyarrow es opcional: si no está instalado se usa el lector C de pandas
+PYARROW_AVAILABLE = module_available('pyarrow')
+pa = lazy_import('pyarrow') if PYARROW_AVAILABLE else None
+
+
+def resolve_input_paths(path):
+    """Archivos CSV de una ruta: el propio archivo, los *.csv de un directorio o los que casen con un glob"""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '*.csv')))
+    if glob.has_magic(path):
+        return sorted(p for p in glob.glob(path) if os.path.isfile(p))
+    return [path]
+
+
+def _encode_frame(df):
+    """Serializar un DataFrame como buffer compacto para devolverlo desde un proceso
+    
+    Con pyarrow se usa un stream Arrow IPC; sin él, un diccionario de arrays
+    NumPy (las categorías viajan como códigos más su lista de valores).
+    """
+    if PYARROW_AVAILABLE:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return 'arrow', sink.getvalue().to_pybytes()
+    
+    columns = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            columns[col] = ('category', df[col].cat.codes.to_numpy(), df[col].cat.categories.to_numpy())
+        else:
+            columns[col] = ('array', df[col].to_numpy())
+    return 'numpy', columns
+
+
+def _decode_frame(payload):
+    """Reconstruir el DataFrame serializado por _encode_frame"""
+    kind, data = payload
+    if kind == 'arrow':
+        return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+    
+    columns = {}
+    for col, value in data.items():
+        if value[0] == 'category':
+            columns[col] = pd.Categorical.from_codes(value[1], categories=value[2])
+        else:
+            columns[col] = value[1]
+    return pd.DataFrame(columns)
+
+
+def _extract_transform_file(path, columns, dtypes):
+    """Tarea de cada proceso: leer y limpiar un archivo
+    
+    Devuelve (ruta, payload, filas leídas, filas descartadas, error); los
+    errores se devuelven en lugar de lanzarse para no abortar el lote. La
+    validación se hace en el proceso principal, sobre todos los archivos a la
+    vez, para detectar duplicados entre archivos.
+    """
+    from transform.steam_dbTransform import SteamDBTransform
+    
+    try:
+        df = SteamDBExtractor(path, columns, dtypes)._read_csv()
+        rows = len(df)
+        transformer = SteamDBTransform(df, verbose=False, validate=False)
+        df = transformer.clean()
+        return path, _encode_frame(df), rows, transformer.quarantine, None
+    except Exception as e:
+        return path, None, 0, None, f"{type(e).__name__}: {e}"
+
 
 class SteamDBExtractor:
-    def __init__(self, csv_path):
+    def __init__(self, csv_path, columns=None, dtypes=None):
         self.csv_path = csv_path
+        self.columns = columns or READ_COLUMNS
+        self.dtypes = READ_DTYPES if dtypes is None else dtypes
+        self.paths = resolve_input_paths(csv_path)
+        # Errores por archivo de la última extracción en paralelo: [(ruta, mensaje)]
+        self.errors = []
+        # Cuarentena y conteo por regla de la última extracción en paralelo
+        self.quarantine = None
+        self.validation = {}
 
-    def extract(self):
+    @property
+    def multi_file(self):
+        """La entrada es un directorio o un glob (aunque case con un solo archivo)"""
+        return os.path.isdir(self.csv_path) or glob.has_magic(self.csv_path)
+
+    def extract(self, chunk_size=None):
+        """Leer el CSV completo, o devolver un iterador de bloques si se indica chunk_size
+        
+        Con un directorio o un glob los archivos se leen en orden y se concatenan.
+        """
         try:
             # Verificar si el archivo existe
-            if not os.path.exists(self.csv_path):
+            if not self.paths or not os.path.exists(self.paths[0]):
                 print(f"Error: El archivo {self.csv_path} no existe")
                 return None
             
+            if chunk_size:
+                readers = (self._read_chunks(path, chunk_size) for path in self.paths)
+                print(f"Extracción por bloques de {chunk_size:,} registros")
+                return self._iter_chunks(readers)
+            
             # Leer el archivo CSV
-            df = pd.read_csv(self.csv_path)
+            frames = [self._read_csv(path=path) for path in self.paths]
+            df = frames[0] if len(frames) == 1 else self._concat(frames)
             print(f"Datos extraídos exitosamente: {len(df)} registros encontrados")
             print(f"Columnas disponibles: {list(df.columns)}")
             return df
@@ -21,6 +120,144 @@ class SteamDBExtractor:
             print(f"Error al leer el archivo CSV: {e}")
             return None
 
+    def extract_transform_parallel(self, workers=None):
+        """Leer y limpiar cada archivo en un pool de procesos y unir los resultados
+        
+        Cada proceso devuelve su DataFrame limpio como buffer Arrow (o arrays
+        NumPy) en lugar de un DataFrame serializado con pickle. Un archivo que
+        falla se registra en self.errors sin detener el resto del lote. Las
+        filas rechazadas quedan en self.quarantine.
+        """
+        from transform.steam_dbValidate import EMPTY_NAME_RULE, SteamDBValidator, merge_quarantine
+        
+        self.errors = []
+        if not self.paths:
+            print(f"Error: {self.csv_path} no contiene archivos CSV")
+            return None
+        
+        workers = min(workers or os.cpu_count() or 1, len(self.paths))
+        print(f"Extracción y transformación en paralelo: {len(self.paths)} archivos, {workers} procesos")
+        start = time.perf_counter()
+        results = {}
+        try:
+            if workers == 1:
+                # Sin beneficio de un pool: procesar en el propio proceso
+                for path in self.paths:
+                    results[path] = _extract_transform_file(path, self.columns, self.dtypes)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = {
+                        executor.submit(_extract_transform_file, path, self.columns, self.dtypes): path
+                        for path in self.paths
+                    }
+                    for future in as_completed(futures):
+                        path = futures[future]
+                        try:
+                            results[path] = future.result()
+                        except Exception as e:
+                            # El proceso murió (p. ej. sin memoria): se pierde solo este archivo
+                            results[path] = (path, None, 0, None, f"{type(e).__name__}: {e}")
+        except Exception as e:
+            print(f"Error en la extracción en paralelo: {e}")
+            return None
+        
+        frames, dropped, rows_read = [], [], 0
+        for path in self.paths:
+            _, payload, rows, quarantine, error = results[path]
+            if error:
+                self.errors.append((path, error))
+                print(f"  ❌ {path}: {error}")
+                continue
+            frames.append(_decode_frame(payload))
+            dropped.append(quarantine)
+            rows_read += rows
+        
+        if not frames:
+            print("Error: no se pudo procesar ningún archivo")
+            return None
+        
+        validator = SteamDBValidator()
+        df, rejected = validator.validate(self._concat(frames))
+        self.quarantine = merge_quarantine(dropped + [rejected])
+        self.validation = {EMPTY_NAME_RULE: sum(len(frame) for frame in dropped), **validator.counts}
+        elapsed = time.perf_counter() - start
+        rate = rows_read / elapsed if elapsed > 0 else float('inf')
+        print(f"Datos extraídos y transformados: {len(df)} registros de {len(frames)}/{len(self.paths)} "
+              f"archivos en {elapsed:.2f} s ({rate:,.0f} filas/s)")
+        return df
+
+    def _concat(self, frames):
+        """Concatenar DataFrames conservando las columnas categóricas del esquema"""
+        df = pd.concat(frames, ignore_index=True)
+        for col in CATEGORY_COLUMNS:
+            # Categorías distintas por archivo dejan la columna como object
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        return df
+
+    def _read_csv(self, path=None):
+        """Leer solo las columnas del esquema con tipos explícitos
+        
+        Se usa el motor pyarrow cuando está instalado. Si el archivo trae
+        valores que no encajan en los tipos declarados se vuelve a leer sin
+        tipos y la transformación los convierte.
+        """
+        path = path or self.csv_path
+        usecols, dtypes = self._schema(path)
+        engine = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+        try:
+            return pd.read_csv(path, usecols=usecols, dtype=dtypes, engine=engine)
+        except (ValueError, TypeError) as e:
+            print(f"Aviso: no se pudieron aplicar los tipos del esquema ({e}); se leen sin tipos")
+            return pd.read_csv(path, usecols=usecols)
+
+    def _read_chunks(self, path, chunk_size):
+        """Bloques de un archivo con tipos explícitos (motor C: pyarrow no lee por bloques)
+        
+        El lector es perezoso, así que un valor que no encaja en los tipos falla
+        al llegar a su bloque: desde ese bloque se sigue leyendo sin tipos
+        (saltando los bloques ya entregados) y la transformación los convierte.
+        """
+        usecols, dtypes = self._schema(path)
+        delivered = 0
+        try:
+            with pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunk_size) as reader:
+                for chunk in reader:
+                    delivered += len(chunk)
+                    yield chunk
+            return
+        except (ValueError, TypeError) as e:
+            print(f"Aviso: no se pudieron aplicar los tipos del esquema en {path} desde el registro "
+                  f"{delivered + 1} ({e}); se leen sin tipos")
+        
+        skipped = 0
+        with pd.read_csv(path, usecols=usecols, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                # Todos los bloques tienen chunk_size filas salvo el último: se saltan bloques enteros
+                if skipped < delivered:
+                    skipped += len(chunk)
+                    continue
+                yield chunk
+
+    def _schema(self, path):
+        """Columnas del esquema presentes en el archivo y sus tipos declarados"""
+        header = set(self._header(path))
+        usecols = [col for col in self.columns if col in header]
+        return usecols, {col: dtype for col, dtype in self.dtypes.items() if col in usecols}
+
+    def _header(self, path=None):
+        """Columnas presentes en la cabecera del CSV"""
+        return pd.read_csv(path or self.csv_path, nrows=0).columns
+
+    def _iter_chunks(self, readers):
+        """Entregar los bloques de los lectores uno a uno sin acumularlos en memoria"""
+        total = 0
+        for reader in readers:
+            for chunk in reader:
+                total += len(chunk)
+                yield chunk
+        print(f"Datos extraídos exitosamente: {total} registros encontrados")
+
     """
     def queries(self):
         self.data = pd.read_csv(self.csv_path)
@@ -0,0 +1,63 @@
+import os
+from config.importaciones import lazy_import, module_available
+
+# Dependencia opcional: el backup en Parquet requiere pyarrow
+PYARROW_AVAILABLE = module_available('pyarrow')
+pa = lazy_import('pyarrow') if PYARROW_AVAILABLE else None
+
+
+def write_parquet_chunks(path, chunks, compression='zstd'):
+    """Escribir cada DataFrame del iterable como un row group de Parquet y devolver el número de registros
+
+    Sin bloques no se crea el archivo. Requiere pyarrow.
+    """
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression=compression)
+            else:
+                # Un bloque con una columna toda nula infiere otro tipo: usar el del primero
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+class BackupWriter:
+    """Backup del dataset limpio escrito bloque a bloque en CSV o Parquet
+
+    El formato sale de la extensión (.parquet -> un row group por bloque;
+    cualquier otra -> CSV). A diferencia de Load.clean_csv, los errores se
+    propagan: en el pipeline un backup fallido cancela las demás etapas.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fmt = 'parquet' if os.path.splitext(path.lower())[1] == '.parquet' else 'csv'
+
+    def write_all(self, chunks):
+        """Escribir todos los bloques del iterable y devolver el número de registros"""
+        rows = self._write_parquet(chunks) if self.fmt == 'parquet' else self._write_csv(chunks)
+        print(f"Backup {self.fmt.upper()} guardado en {self.path}: {rows:,} registros")
+        return rows
+
+    def _write_csv(self, chunks):
+        rows = 0
+        with open(self.path, 'w', newline='') as output:
+            for number, chunk in enumerate(chunks):
+                chunk.to_csv(output, index=False, header=number == 0)
+                rows += len(chunk)
+        return rows
+
+    def _write_parquet(self, chunks):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("El backup en Parquet requiere pyarrow")
+        return write_parquet_chunks(self.path, chunks)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from load.steam_dbSchema import DIMENSIONS
+
+
+class DimensionEncoder:
+    """Sustituir platform, genre y publisher por sus claves enteras antes de escribir
+
+    Las claves se resuelven por categoría y no por fila: cada columna se
+    convierte a categórica, los valores distintos que falten se insertan en su
+    dimensión con una sola sentencia y la clave de cada fila sale de indexar el
+    array de claves con los códigos de la categórica. Las claves ya conocidas
+    se guardan entre lotes, así que una carga por bloques solo consulta las
+    dimensiones cuando aparece un valor nuevo.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        # columna -> {valor: clave}
+        self.keys = {column: {} for column in DIMENSIONS}
+
+    def encode(self, df):
+        """DataFrame con <columna>_id (entero nullable) en lugar de cada columna de DIMENSIONS"""
+        encoded = {}
+        for column in DIMENSIONS:
+            if column not in df.columns:
+                continue
+            values = df[column].astype('category').cat.remove_unused_categories()
+            keys = self.resolve(column, values.cat.categories)
+            codes = values.cat.codes.to_numpy()
+            # El código -1 (nulo) toma el último elemento y queda enmascarado
+            lookup = np.append(keys, 0).astype('int32')
+            encoded[column] = pd.arrays.IntegerArray(lookup[codes], codes < 0)
+
+        df = df.assign(**encoded)
+        return df.rename(columns={column: f"{column}_id" for column in encoded})
+
+    def resolve(self, column, values):
+        """Claves de los valores (en el mismo orden), creando en la dimensión los que falten"""
+        known = self.keys[column]
+        missing = [value for value in values if value not in known]
+        if missing:
+            table = DIMENSIONS[column][0]
+            with self.engine.begin() as conn:
+                # Otro proceso puede haber creado el valor: ON CONFLICT lo deja como está
+                conn.execute(
+                    text(f"INSERT INTO {table} ({column}) VALUES (:value) ON CONFLICT ({column}) DO NOTHING"),
+                    [{'value': value} for value in missing]
+                )
+                known.update((value, key) for key, value in conn.execute(text(f"SELECT id, {column} FROM {table}")))
+        return np.array([known[value] for value in values], dtype='int64')
@@ -1,116 +1,580 @@
-from sqlalchemy import create_engine, text
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
 from config.configuraciones import configuracion
+from config.conexiones import get_engine
+from config.esquema import COLUMN_MAPPING
+from load.steam_dbDimensions import DimensionEncoder
+from load.steam_dbRollups import SalesRollups
+from load.steam_dbSchema import (FACT_NATURAL_KEY, FACT_TABLE, NATURAL_KEY_INDEX, PARTITION_GRANULARITIES,
+                                 SchemaManager)
+from load.steam_dbSketches import SalesSketches
+from transform.steam_dbValidate import REASONS_COLUMN
+
+# Clave natural usada por la carga incremental (upsert); en la tabla de hechos es FACT_NATURAL_KEY
+NATURAL_KEY = ['name', 'platform', 'year']
+
+# Filas mínimas por partición en la carga en paralelo (por debajo no compensa abrir conexiones)
+PARALLEL_MIN_PARTITION_ROWS = 10000
+
+# Tabla con las filas rechazadas por la validación (migración 5)
+QUARANTINE_TABLE = 'video_games_sales_quarantine'
+
+# Columnas con decimales en la tabla (DECIMAL(10,2))
+DECIMAL_COLUMNS = ['na_sales', 'eu_sales', 'jp_sales', 'other_sales', 'global_sales',
+                   'total_regional_sales', 'sales_difference']
 
 class Load:
-    def __init__(self, df):
+    def __init__(self, df=None):
         self.df = df
         self.config = configuracion()
+        # Claves de las dimensiones ya resueltas (se reutilizan entre bloques)
+        self.dimensions = None
+        # Sketches ya leídos de la base (se reutilizan entre bloques)
+        self.sketches = None
 
     def create_table(self):
-        """Crear la tabla en la base de datos si no existe"""
+        """Crear la tabla en la base de datos si no existe (migraciones versionadas)"""
         try:
-            # Crear conexión usando SQLAlchemy
-            engine = create_engine(self.config.DATABASE_URL)
-            
-            # Definir el esquema de la tabla
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS video_games_sales (
-                id SERIAL PRIMARY KEY,
-                rank INTEGER,
-                name VARCHAR(255) NOT NULL,
-                platform VARCHAR(50),
-                year INTEGER,
-                genre VARCHAR(50),
-                publisher VARCHAR(255),
-                na_sales DECIMAL(10,2),
-                eu_sales DECIMAL(10,2),
-                jp_sales DECIMAL(10,2),
-                other_sales DECIMAL(10,2),
-                global_sales DECIMAL(10,2),
-                decade INTEGER,
-                total_regional_sales DECIMAL(10,2),
-                sales_difference DECIMAL(10,2),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """
-            
-            with engine.connect() as conn:
-                conn.execute(text(create_table_sql))
-                conn.commit()
+            # Engine compartido (un solo pool de conexiones por ejecución)
+            engine = get_engine(self.config.DATABASE_URL)
             
+            # Crear o actualizar el esquema e índices de la tabla
+            schema = SchemaManager(engine)
+            schema.migrate()
+            if self.config.PARTITION_BY:
+                schema.partition_fact_table(self.config.PARTITION_BY)
             print("Tabla 'video_games_sales' creada exitosamente")
+            
+            # Tablas de resumen que usan los informes de SteamDBView
+            SalesRollups(engine).ensure_tables()
+            # HyperLogLog, t-digest y muestra reservoir del modo aproximado de la vista
+            SalesSketches(engine, self.config.APPROX_SAMPLE_ROWS).ensure_table()
             return True
             
         except Exception as e:
             print(f"Error al crear la tabla: {e}")
             return False
 
-    def load_to_database(self):
-        """Cargar datos transformados a la base de datos"""
+    def load_to_database(self, method=None, chunk_size=None, mode=None, workers=None):
+        """Cargar datos transformados a la base de datos
+        
+        method: 'copy' (COPY FROM STDIN en PostgreSQL, executemany por lotes
+        en otros dialectos) o 'multi' (DataFrame.to_sql con INSERT multi-fila).
+        mode: 'append' agrega todas las filas; 'incremental' hace upsert solo
+        de las filas nuevas o modificadas según su clave natural y hash;
+        'replace' sustituye entera cada partición con años presentes en los
+        datos (requiere la tabla particionada, ver PARTITION_BY).
+        workers: conexiones que cargan particiones en paralelo con COPY
+        (solo PostgreSQL; por defecto LOAD_WORKERS).
+        """
+        method = method or self.config.LOAD_METHOD
+        mode = mode or self.config.LOAD_MODE
+        chunk_size = chunk_size or self.config.LOAD_CHUNK_SIZE
+        workers = workers or self.config.LOAD_WORKERS
         try:
             # Crear la tabla primero
             if not self.create_table():
                 return False
             
             # Preparar los datos para la inserción
-            df_to_load = self.df.copy()
-            
-            # Mapear nombres de columnas del DataFrame a los nombres de la tabla
-            column_mapping = {
-                'Rank': 'rank',
-                'Name': 'name',
-                'Platform': 'platform',
-                'Year': 'year',
-                'Genre': 'genre',
-                'Publisher': 'publisher',
-                'NA_Sales': 'na_sales',
-                'EU_Sales': 'eu_sales',
-                'JP_Sales': 'jp_sales',
-                'Other_Sales': 'other_sales',
-                'Global_Sales': 'global_sales',
-                'Decade': 'decade',
-                'Total_Regional_Sales': 'total_regional_sales',
-                'Sales_Difference': 'sales_difference'
-            }
-            
-            # Renombrar columnas
-            df_to_load = df_to_load.rename(columns=column_mapping)
-            
-            # Seleccionar solo las columnas que existen en el DataFrame
-            available_columns = [col for col in column_mapping.values() if col in df_to_load.columns]
-            df_to_load = df_to_load[available_columns]
-            
-            # Crear conexión usando SQLAlchemy
-            engine = create_engine(self.config.DATABASE_URL)
+            df_to_load = self._prepare_dataframe(self.df)
+            
+            # Engine compartido (un solo pool de conexiones por ejecución)
+            engine = get_engine(self.config.DATABASE_URL)
+            
+            mode = self._resolve_mode(engine, mode)
+            incremental = mode == 'incremental'
+            
+            # En cargas masivas los índices secundarios se reconstruyen al final
+            # (al sustituir particiones cada una llega ya con sus índices)
+            schema = SchemaManager(engine)
+            bulk_load = mode != 'replace' and self._is_bulk_load(len(df_to_load))
+            if bulk_load:
+                schema.drop_secondary_indexes()
+            try:
+                if mode == 'replace':
+                    self._replace_partitions(engine, df_to_load, chunk_size)
+                    new_rows, changed_rows = None, None
+                elif incremental:
+                    schema.ensure_partitions(df_to_load['year'].unique())
+                    snapshot = self._fetch_snapshot(engine)
+                    new_rows, changed_rows = self._upsert_dataframe(engine, df_to_load, chunk_size, snapshot, workers=workers)
+                else:
+                    schema.ensure_partitions(df_to_load['year'].unique())
+                    self._insert_dataframe(engine, df_to_load, method, chunk_size, workers=workers)
+                    print(f"Datos cargados exitosamente: {len(df_to_load)} registros insertados")
+                    new_rows, changed_rows = df_to_load, None
+            finally:
+                if bulk_load:
+                    schema.rebuild_secondary_indexes()
+            
+            if mode == 'replace':
+                self._rebuild_rollups(engine)
+                self._refresh_sketches(engine, None, rebuild=True)
+            else:
+                self._refresh_rollups(engine, new_rows, changed_rows)
+                self._refresh_sketches(engine, new_rows, changed_rows)
+            self._publish_load(engine)
+            return True
+            
+        except Exception as e:
+            print(f"Error al cargar datos a la base de datos: {e}")
+            return False
+
+    def load_stream(self, chunks, method=None, chunk_size=None, backup_path=None, mode=None, workers=None):
+        """Cargar un iterador de DataFrames agregando cada bloque a medida que llega
+        
+        Solo se mantiene en memoria el bloque actual; si se indica backup_path,
+        cada bloque también se agrega al CSV de respaldo.
+        """
+        method = method or self.config.LOAD_METHOD
+        mode = mode or self.config.LOAD_MODE
+        chunk_size = chunk_size or self.config.LOAD_CHUNK_SIZE
+        workers = workers or self.config.LOAD_WORKERS
+        try:
+            if not self.create_table():
+                return False
             
+            engine = get_engine(self.config.DATABASE_URL)
+            if mode == 'replace':
+                # Cada bloque sustituiría las particiones que cargó el anterior
+                raise ValueError("LOAD_MODE=replace no admite carga por bloques (usar CHUNK_SIZE=0)")
+            incremental = self._resolve_mode(engine, mode) == 'incremental'
+            # La instantánea de hashes se consulta una sola vez para todo el flujo
+            snapshot = self._fetch_snapshot(engine) if incremental else None
+            
+            schema = SchemaManager(engine)
+            indexes_dropped = False
+            total = 0
+            # Con filas modificadas los sketches se recalculan una sola vez al final del flujo
+            changed = False
+            try:
+                for number, chunk in enumerate(chunks, 1):
+                    if len(chunk) == 0:
+                        continue
+                    # Al superar el umbral de carga masiva se quitan los índices secundarios
+                    if not indexes_dropped and self._is_bulk_load(total + len(chunk)):
+                        schema.drop_secondary_indexes()
+                        indexes_dropped = True
+                    
+                    chunk_start = time.perf_counter()
+                    df_to_load = self._prepare_dataframe(chunk)
+                    schema.ensure_partitions(df_to_load['year'].unique())
+                    if incremental:
+                        new_rows, changed_rows = self._upsert_dataframe(engine, df_to_load, chunk_size, snapshot,
+                                                                        verbose=False, workers=workers)
+                    else:
+                        self._insert_dataframe(engine, df_to_load, method, chunk_size, verbose=False, workers=workers)
+                        new_rows, changed_rows = df_to_load, None
+                    self._refresh_rollups(engine, new_rows, changed_rows, verbose=False)
+                    self._refresh_sketches(engine, new_rows, verbose=False)
+                    changed = changed or (changed_rows is not None and len(changed_rows) > 0)
+                    if backup_path:
+                        self.clean_csv(backup_path, df=chunk, append=total > 0)
+                    total += len(chunk)
+                    elapsed = time.perf_counter() - chunk_start
+                    rate = len(chunk) / elapsed if elapsed > 0 else float('inf')
+                    print(f"  Bloque {number}: {len(chunk):,} registros cargados ({rate:,.0f} filas/s, total {total:,})")
+            finally:
+                if indexes_dropped:
+                    schema.rebuild_secondary_indexes()
+                if changed:
+                    self._refresh_sketches(engine, None, rebuild=True, verbose=False)
+                # Los bloques ya cargados son visibles aunque el flujo falle
+                if total > 0:
+                    self._publish_load(engine)
+            
+            print(f"Datos cargados exitosamente: {total} registros procesados")
+            return True
+            
+        except Exception as e:
+            print(f"Error al cargar datos a la base de datos: {e}")
+            return False
+
+    def _is_bulk_load(self, rows):
+        """Una carga es masiva si alcanza INDEX_REBUILD_MIN_ROWS (0 desactiva la reconstrucción)"""
+        threshold = self.config.INDEX_REBUILD_MIN_ROWS
+        return threshold > 0 and rows >= threshold
+
+    def _fact_frame(self, engine, df):
+        """Filas listas para la tabla de hechos: textos de las dimensiones cambiados por sus claves"""
+        if self.dimensions is None or self.dimensions.engine is not engine:
+            self.dimensions = DimensionEncoder(engine)
+        return self.dimensions.encode(df)
+
+    def _insert_dataframe(self, engine, df, method, chunk_size, verbose=True, workers=1):
+        """Insertar un DataFrame ya preparado con el método indicado"""
+        df = self._fact_frame(engine, df)
+        partitions = self._parallel_partitions(engine, len(df), workers)
+        if method != 'multi' and partitions > 1:
+            self._parallel_copy(engine, df, partitions, chunk_size, verbose=verbose)
+        elif method == 'multi':
             # Cargar datos a la base de datos
-            df_to_load.to_sql(
-                'video_games_sales',
+            df.to_sql(
+                FACT_TABLE,
                 engine,
                 if_exists='append',  # Agregar datos sin reemplazar
                 index=False,
                 method='multi'  # Inserción más eficiente
             )
+        elif engine.dialect.name == 'postgresql':
+            self._copy_chunks(engine, df, chunk_size, verbose=verbose)
+        else:
+            self._executemany_chunks(engine, df, chunk_size, verbose=verbose)
+
+    def _prepare_dataframe(self, df):
+        """Renombrar columnas, quedarse solo con las que existen en la tabla y calcular row_hash"""
+        df_to_load = df.rename(columns=COLUMN_MAPPING)
+        available_columns = [col for col in COLUMN_MAPPING.values() if col in df_to_load.columns]
+        df_to_load = df_to_load[available_columns]
+        return df_to_load.assign(row_hash=self._row_hashes(df_to_load))
+
+    def _row_hashes(self, df):
+        """Hash vectorizado del contenido de cada fila (estable entre ejecuciones)
+        
+        Los decimales se redondean como en la tabla para que un cambio de tipo
+        (float32/float64) no cambie el hash.
+        """
+        canonical = pd.DataFrame({
+            col: df[col].astype('float64').round(2) if col in DECIMAL_COLUMNS else df[col].astype(object)
+            for col in df.columns
+        })
+        # BIGINT es con signo: reinterpretar el uint64 como int64
+        return pd.util.hash_pandas_object(canonical, index=False).to_numpy().view('int64')
+
+    def _resolve_mode(self, engine, mode):
+        """Validar el modo de carga y preparar el esquema para el modo incremental"""
+        if mode == 'incremental':
+            self._ensure_natural_key(engine)
+            return mode
+        if mode == 'replace':
+            if not SchemaManager(engine).is_partitioned():
+                raise ValueError("LOAD_MODE=replace requiere la tabla particionada (PostgreSQL y PARTITION_BY)")
+            return mode
+        
+        # Con la clave única creada, agregar duplicaría claves: cambiar a upsert
+        if SchemaManager(engine).has_index(NATURAL_KEY_INDEX):
+            print("La tabla tiene clave natural única: se usa carga incremental")
+            return 'incremental'
+        return mode
+
+    def _ensure_natural_key(self, engine):
+        """Crear el índice único de la clave natural, eliminando duplicados previos"""
+        key = ', '.join(FACT_NATURAL_KEY)
+        if SchemaManager(engine).has_index(NATURAL_KEY_INDEX):
+            return
+        
+        with engine.begin() as conn:
+            # Cargas anteriores en modo append pueden haber duplicado filas
+            result = conn.execute(text(f"""
+                DELETE FROM {FACT_TABLE}
+                WHERE id NOT IN (SELECT MIN(id) FROM {FACT_TABLE} GROUP BY {key})
+            """))
+            removed = result.rowcount
+            if removed:
+                print(f"Eliminados {removed} registros duplicados por ({key})")
             
-            print(f"Datos cargados exitosamente: {len(df_to_load)} registros insertados")
-            return True
-            
+            conn.execute(text(f"CREATE UNIQUE INDEX {NATURAL_KEY_INDEX} ON {FACT_TABLE} ({key})"))
+            print(f"Índice único {NATURAL_KEY_INDEX} creado")
+        
+        if removed:
+            SalesRollups(engine).rebuild()
+            # Los sketches contaban las filas eliminadas: recalcularlos antes de agregar la carga
+            self._refresh_sketches(engine, None, rebuild=True, verbose=False)
+
+    def _fetch_snapshot(self, engine):
+        """Leer en una sola consulta la clave natural y el hash de las filas existentes"""
+        query = f"SELECT {', '.join(NATURAL_KEY)}, row_hash FROM video_games_sales"
+        snapshot = pd.read_sql(query, engine, dtype={'row_hash': 'Int64'})
+        return snapshot.set_index(NATURAL_KEY)['row_hash']
+
+    def _upsert_dataframe(self, engine, df, chunk_size, snapshot, verbose=True, workers=1):
+        """Insertar o actualizar solo las filas nuevas o modificadas
+        
+        La comparación con la instantánea se hace en memoria, así que las filas
+        sin cambios nunca se envían a la base de datos.
+        """
+        # ON CONFLICT no admite la misma clave dos veces en una sentencia
+        df = df.drop_duplicates(subset=NATURAL_KEY, keep='first')
+        
+        keys = pd.MultiIndex.from_frame(df[NATURAL_KEY])
+        is_new = ~keys.isin(snapshot.index)
+        # Filas antiguas sin row_hash (NULL) se consideran modificadas
+        existing = snapshot.reindex(keys).to_numpy(dtype='int64', na_value=0)
+        is_changed = ~is_new & (existing != df['row_hash'].to_numpy())
+        pending = df[is_new | is_changed]
+        
+        if len(pending) > 0:
+            rows = self._fact_frame(engine, pending)
+            update_columns = [col for col in rows.columns if col not in FACT_NATURAL_KEY]
+            on_conflict = (
+                f" ON CONFLICT ({', '.join(FACT_NATURAL_KEY)}) DO UPDATE SET "
+                + ', '.join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+            )
+            partitions = self._parallel_partitions(engine, len(rows), workers)
+            if partitions > 1:
+                self._parallel_copy(engine, rows, partitions, chunk_size, on_conflict, verbose=verbose)
+            elif engine.dialect.name == 'postgresql':
+                self._copy_upsert(engine, rows, chunk_size, on_conflict, verbose=verbose)
+            else:
+                self._executemany_chunks(engine, rows, chunk_size, on_conflict=on_conflict, verbose=verbose)
+        
+        if verbose:
+            print(f"Carga incremental: {int(is_new.sum())} nuevos, {int(is_changed.sum())} modificados, "
+                  f"{len(df) - len(pending)} sin cambios (omitidos)")
+        return df[is_new], df[is_changed]
+
+    def _replace_partitions(self, engine, df, chunk_size):
+        """Sustituir cada partición con años presentes en df por una tabla nueva con sus filas
+        
+        Las filas de cada partición se copian con COPY a una tabla de staging
+        con la misma estructura e índices que la tabla de hechos y un CHECK con
+        los límites de la partición; después SchemaManager.swap_partition la
+        intercambia por la anterior con DETACH/ATTACH en una transacción. Las
+        particiones sin filas en df no se tocan.
+        """
+        schema = SchemaManager(engine)
+        granularity = schema.partition_granularity() or self.config.PARTITION_BY
+        if schema.has_index(NATURAL_KEY_INDEX):
+            # El índice único se construye en la partición nueva: sin claves repetidas
+            df = df.drop_duplicates(subset=NATURAL_KEY, keep='first')
+        rows = self._fact_frame(engine, df)
+        
+        _, width = PARTITION_GRANULARITIES[granularity]
+        staging = f"{FACT_TABLE}_swap_{os.getpid()}"
+        for start, part in rows.groupby(rows['year'].to_numpy() // width * width, sort=True):
+            _, low, high = schema.partition_bounds(start, granularity)
+            part_start = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+                    conn.execute(text(f"CREATE TABLE {staging} (LIKE {FACT_TABLE} INCLUDING DEFAULTS INCLUDING INDEXES)"))
+                    conn.execute(text(
+                        f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_bounds CHECK (year >= {low} AND year < {high})"
+                    ))
+                self._copy_chunks(engine, part, chunk_size, table=staging, verbose=False)
+                name = schema.swap_partition(staging, start)
+            finally:
+                with engine.begin() as conn:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+            print(f"  Partición {name} sustituida: {len(part):,} registros en {time.perf_counter() - part_start:.2f}s")
+        print(f"Datos cargados exitosamente: {len(rows)} registros en particiones sustituidas")
+
+    def _rebuild_rollups(self, engine):
+        """Recalcular las tablas de resumen tras sustituir particiones (sus filas anteriores ya no existen)"""
+        try:
+            SalesRollups(engine).rebuild()
+            print("Tablas de resumen recalculadas")
         except Exception as e:
-            print(f"Error al cargar datos a la base de datos: {e}")
-            return False
+            print(f"Error al recalcular las tablas de resumen (usar SalesRollups.rebuild()): {e}")
+
+    def _refresh_rollups(self, engine, new_rows, changed_rows, verbose=True):
+        """Actualizar las tablas de resumen con el lote recién cargado"""
+        try:
+            SalesRollups(engine).refresh(new_rows, changed_rows)
+            if verbose:
+                print("Tablas de resumen actualizadas")
+        except Exception as e:
+            # Los datos ya están cargados: avisar para reconstruir los rollups
+            print(f"Error al actualizar las tablas de resumen (usar SalesRollups.rebuild()): {e}")
+
+    def _refresh_sketches(self, engine, new_rows, changed_rows=None, rebuild=False, verbose=True):
+        """Agregar el lote a los sketches (o recalcularlos si hubo filas modificadas o sustituidas)"""
+        try:
+            sketches = SalesSketches(engine, self.config.APPROX_SAMPLE_ROWS)
+            if rebuild:
+                self.sketches = sketches.rebuild()
+            else:
+                self.sketches = sketches.refresh(new_rows, changed_rows, self.sketches)
+            if verbose:
+                print("Sketches del modo aproximado actualizados")
+        except Exception as e:
+            # Los datos ya están cargados: la vista calcula los informes exactos hasta el próximo recálculo
+            self.sketches = None
+            print(f"Error al actualizar los sketches (usar SalesSketches.rebuild()): {e}")
 
-    def clean_csv(self, output_path):
-        """Método original para guardar CSV (mantenido para compatibilidad)"""
+    def _publish_load(self, engine):
+        """Incrementar la generación de carga para que la vista invalide su caché"""
         try:
-            self.df.to_csv(output_path, index=False)
-            print(f"Datos guardados exitosamente en {output_path}")
+            SchemaManager(engine).bump_load_generation()
+        except Exception as e:
+            print(f"Error al actualizar la generación de carga: {e}")
+
+    def _copy_upsert(self, engine, df, chunk_size, on_conflict, verbose=True):
+        """Upsert en PostgreSQL: COPY a una tabla temporal y un único INSERT ... ON CONFLICT"""
+        columns = ', '.join(df.columns)
+        raw_conn = engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.execute(f"""
+                CREATE TEMP TABLE video_games_sales_stage
+                (LIKE {FACT_TABLE} INCLUDING DEFAULTS) ON COMMIT DROP
+            """)
+            self._copy_dataframe(cursor, df, chunk_size, 'video_games_sales_stage', verbose)
+            cursor.execute(
+                f"INSERT INTO {FACT_TABLE} ({columns}) "
+                f"SELECT {columns} FROM video_games_sales_stage" + on_conflict
+            )
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+    def _parallel_partitions(self, engine, rows, workers):
+        """Número de particiones para cargar en paralelo (1 = carga en una sola conexión)
+        
+        Solo PostgreSQL admite escrituras concurrentes; el número de conexiones
+        se limita al tamaño máximo del pool y a particiones de un mínimo de filas.
+        """
+        if workers <= 1 or engine.dialect.name != 'postgresql':
+            return 1
+        max_connections = self.config.DB_POOL_SIZE + self.config.DB_MAX_OVERFLOW
+        return max(1, min(workers, max_connections, rows // PARALLEL_MIN_PARTITION_ROWS))
+
+    def _parallel_copy(self, engine, df, partitions, chunk_size, on_conflict='', verbose=True):
+        """Cargar particiones en paralelo y publicarlas en una única transacción
+        
+        Cada hilo toma una conexión del pool y hace COPY de su partición a su
+        propia tabla de staging (UNLOGGED); al terminar todas, un solo
+        INSERT ... SELECT (con ON CONFLICT en modo incremental) pasa las filas
+        a la tabla de hechos, de modo que la carga es atómica.
+        """
+        columns = ', '.join(df.columns)
+        stages = [f"video_games_sales_stage_{os.getpid()}_{number}" for number in range(partitions)]
+        start = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                for stage in stages:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+                    conn.execute(text(
+                        f"CREATE UNLOGGED TABLE {stage} AS SELECT {columns} FROM {FACT_TABLE} WITH NO DATA"
+                    ))
+            
+            parts = [df.iloc[rows] for rows in np.array_split(np.arange(len(df)), partitions)]
+            with ThreadPoolExecutor(max_workers=partitions) as executor:
+                # list() propaga la primera excepción de cualquier partición
+                list(executor.map(
+                    lambda args: self._copy_chunks(engine, args[0], chunk_size, table=args[1], verbose=False),
+                    zip(parts, stages)
+                ))
+            staged = time.perf_counter() - start
+            
+            union = ' UNION ALL '.join(f"SELECT {columns} FROM {stage}" for stage in stages)
+            with engine.begin() as conn:
+                conn.execute(text(f"INSERT INTO {FACT_TABLE} ({columns}) {union}" + on_conflict))
+            
+            if verbose:
+                elapsed = time.perf_counter() - start
+                rate = len(df) / elapsed if elapsed > 0 else float('inf')
+                print(f"  Carga en paralelo: {len(df):,} registros en {partitions} particiones, "
+                      f"staging {staged:.2f}s, total {elapsed:.2f}s ({rate:,.0f} filas/s)")
+        finally:
+            with engine.begin() as conn:
+                for stage in stages:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+
+    def _copy_chunks(self, engine, df, chunk_size, table=FACT_TABLE, verbose=True):
+        """Cargar por bloques con COPY FROM STDIN en una sola transacción"""
+        raw_conn = engine.raw_connection()
+        try:
+            self._copy_dataframe(raw_conn.cursor(), df, chunk_size, table, verbose)
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+    def _copy_dataframe(self, cursor, df, chunk_size, table, verbose=True):
+        """Enviar el DataFrame por bloques con COPY FROM STDIN usando un buffer CSV en memoria"""
+        copy_sql = f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)"
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            chunk_start = time.perf_counter()
+            
+            buffer = io.StringIO()
+            chunk.to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+            
+            if verbose:
+                self._report_chunk(start, len(chunk), time.perf_counter() - chunk_start)
+
+    def _executemany_chunks(self, engine, df, chunk_size, table=FACT_TABLE, on_conflict='', verbose=True):
+        """Cargar por bloques con executemany (SQLite y otros dialectos)"""
+        columns = list(df.columns)
+        insert_sql = text(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + col for col in columns)})" + on_conflict
+        )
+        
+        with engine.begin() as conn:
+            for start in range(0, len(df), chunk_size):
+                chunk = df.iloc[start:start + chunk_size]
+                chunk_start = time.perf_counter()
+                
+                # Redondear como DECIMAL(10,2) para no arrastrar el ruido de float32
+                decimals = {col: 'float64' for col in DECIMAL_COLUMNS if col in chunk.columns}
+                chunk = chunk.astype(decimals).round(2)
+                # NaN -> None para que el driver inserte NULL
+                records = chunk.astype(object).where(chunk.notna(), None).to_dict('records')
+                conn.execute(insert_sql, records)
+                
+                if verbose:
+                    self._report_chunk(start, len(chunk), time.perf_counter() - chunk_start)
+
+    def _report_chunk(self, start, rows, elapsed):
+        """Mostrar el rendimiento de un bloque en filas por segundo"""
+        rate = rows / elapsed if elapsed > 0 else float('inf')
+        print(f"  Bloque {start:,}-{start + rows - 1:,}: {rows:,} registros en {elapsed:.2f}s ({rate:,.0f} filas/s)")
+
+    def clean_csv(self, output_path, df=None, append=False):
+        """Método original para guardar CSV (mantenido para compatibilidad)
+        
+        Con append=True el bloque se agrega al final del archivo sin cabecera.
+        """
+        try:
+            df = self.df if df is None else df
+            if append:
+                df.to_csv(output_path, index=False, mode='a', header=False)
+            else:
+                df.to_csv(output_path, index=False)
+                print(f"Datos guardados exitosamente en {output_path}")
         except Exception as e:
             print(f"Error al guardar los datos: {e}")
 
+    def load_quarantine(self, quarantine):
+        """Agregar las filas en cuarentena, con sus motivos, a video_games_sales_quarantine"""
+        try:
+            if quarantine is None or len(quarantine) == 0:
+                return True
+            engine = get_engine(self.config.DATABASE_URL)
+            SchemaManager(engine).migrate()
+            
+            df = quarantine.rename(columns={**COLUMN_MAPPING, REASONS_COLUMN: 'reasons'})
+            df['name'] = df['name'].str.slice(0, 255)
+            for col in DECIMAL_COLUMNS:
+                if col in df.columns:
+                    df[col] = df[col].astype('float64').round(2)
+            df.to_sql(QUARANTINE_TABLE, engine, if_exists='append', index=False, method='multi', chunksize=1000)
+            print(f"{len(df)} filas guardadas en la tabla {QUARANTINE_TABLE}")
+            return True
+            
+        except Exception as e:
+            print(f"Error al guardar la cuarentena: {e}")
+            return False
+
     def get_database_stats(self):
         """Obtener estadísticas de la base de datos"""
         try:
-            engine = create_engine(self.config.DATABASE_URL)
+            engine = get_engine(self.config.DATABASE_URL)
             
             with engine.connect() as conn:
                 # Contar registros totales
@@ -0,0 +1,130 @@
+from sqlalchemy import inspect, text
+
+# Tablas de resumen (rollups) y sus columnas de agrupación
+ROLLUPS = {
+    'video_games_sales_by_platform': ['platform'],
+    'video_games_sales_by_genre': ['genre'],
+    'video_games_sales_by_year': ['year'],
+    'video_games_sales_by_publisher': ['publisher'],
+    'video_games_sales_by_platform_genre': ['platform', 'genre'],
+    'video_games_sales_by_platform_year': ['platform', 'year'],
+    'video_games_sales_by_genre_year': ['genre', 'year'],
+}
+
+KEY_TYPES = {
+    'platform': 'VARCHAR(50)',
+    'genre': 'VARCHAR(50)',
+    'publisher': 'VARCHAR(255)',
+    'year': 'INTEGER',
+}
+
+# Columnas de la clave natural que no cambian al actualizar una fila
+IMMUTABLE_KEYS = {'platform', 'year'}
+
+
+class SalesRollups:
+    """Mantener tablas de resumen de video_games_sales actualizadas tras cada carga
+    
+    Cada rollup guarda por grupo el número de juegos, la suma y el máximo de
+    global_sales y la suma de años (para el año promedio), de modo que los
+    informes de SteamDBView no recorren la tabla de hechos.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def ensure_tables(self):
+        """Crear los rollups que falten y rellenarlos desde la tabla de hechos"""
+        existing = set(inspect(self.engine).get_table_names())
+        with self.engine.begin() as conn:
+            for table, keys in ROLLUPS.items():
+                if table in existing:
+                    continue
+                key_columns = ', '.join(f"{key} {KEY_TYPES[key]} NOT NULL" for key in keys)
+                conn.execute(text(f"""
+                    CREATE TABLE {table} (
+                        {key_columns},
+                        total_games BIGINT NOT NULL,
+                        total_sales DECIMAL(14,2) NOT NULL,
+                        max_sales DECIMAL(10,2),
+                        sum_year BIGINT NOT NULL,
+                        PRIMARY KEY ({', '.join(keys)})
+                    )
+                """))
+                self._recompute(conn, table, keys)
+                print(f"Rollup '{table}' creado")
+
+    def rebuild(self):
+        """Recalcular todos los rollups desde cero"""
+        with self.engine.begin() as conn:
+            for table, keys in ROLLUPS.items():
+                self._recompute(conn, table, keys)
+
+    def refresh(self, new_rows, changed_rows=None):
+        """Actualizar los rollups con las filas recién cargadas
+        
+        Las filas nuevas se suman a los grupos existentes. Si hubo filas
+        modificadas se recalculan sus grupos desde la tabla de hechos; en los
+        rollups por género o editor, que pueden cambiar de grupo, se recalcula
+        el rollup completo.
+        """
+        with self.engine.begin() as conn:
+            for table, keys in ROLLUPS.items():
+                if new_rows is not None and len(new_rows) > 0:
+                    self._apply_delta(conn, table, keys, new_rows)
+                if changed_rows is not None and len(changed_rows) > 0:
+                    if set(keys) <= IMMUTABLE_KEYS:
+                        groups = changed_rows[keys].drop_duplicates()
+                        self._recompute(conn, table, keys, groups)
+                    else:
+                        self._recompute(conn, table, keys)
+
+    def _apply_delta(self, conn, table, keys, df):
+        """Sumar los agregados del lote a los del rollup (upsert aditivo)"""
+        delta = (
+            df.assign(global_sales=df['global_sales'].astype('float64'), year=df['year'].astype('int64'))
+            .groupby(keys, observed=True, dropna=True)
+            .agg(total_games=('global_sales', 'size'),
+                 total_sales=('global_sales', 'sum'),
+                 max_sales=('global_sales', 'max'),
+                 sum_year=('year', 'sum'))
+            .reset_index()
+            .round({'total_sales': 2, 'max_sales': 2})
+        )
+        greatest = 'GREATEST' if self.engine.dialect.name == 'postgresql' else 'MAX'
+        columns = keys + ['total_games', 'total_sales', 'max_sales', 'sum_year']
+        conn.execute(text(f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES ({', '.join(':' + col for col in columns)})
+            ON CONFLICT ({', '.join(keys)}) DO UPDATE SET
+                total_games = {table}.total_games + EXCLUDED.total_games,
+                total_sales = {table}.total_sales + EXCLUDED.total_sales,
+                max_sales = {greatest}({table}.max_sales, EXCLUDED.max_sales),
+                sum_year = {table}.sum_year + EXCLUDED.sum_year
+        """), delta.astype(object).to_dict('records'))
+
+    def _recompute(self, conn, table, keys, groups=None):
+        """Recalcular el rollup (o solo los grupos indicados) desde la tabla de hechos"""
+        key_list = ', '.join(keys)
+        where = ' AND '.join(f"{key} IS NOT NULL" for key in keys)
+        params = {}
+        if groups is None:
+            conn.execute(text(f"DELETE FROM {table}"))
+        else:
+            # Filtro por tuplas: (platform, year) IN ((:g0_0, :g0_1), ...)
+            tuples = []
+            for i, row in enumerate(groups.astype(object).itertuples(index=False)):
+                names = [f"g{i}_{j}" for j in range(len(keys))]
+                params.update(zip(names, row))
+                tuples.append('(' + ', '.join(':' + name for name in names) + ')')
+            group_filter = f"({key_list}) IN ({', '.join(tuples)})"
+            conn.execute(text(f"DELETE FROM {table} WHERE {group_filter}"), params)
+            where += f" AND {group_filter}"
+        
+        conn.execute(text(f"""
+            INSERT INTO {table} ({key_list}, total_games, total_sales, max_sales, sum_year)
+            SELECT {key_list}, COUNT(*), COALESCE(SUM(global_sales), 0), MAX(global_sales), COALESCE(SUM(year), 0)
+            FROM video_games_sales
+            WHERE {where}
+            GROUP BY {key_list}
+        """), params)
@@ -0,0 +1,479 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS video_games_sales (
+    id SERIAL PRIMARY KEY,
+    rank INTEGER,
+    name VARCHAR(255) NOT NULL,
+    platform VARCHAR(50),
+    year INTEGER,
+    genre VARCHAR(50),
+    publisher VARCHAR(255),
+    na_sales DECIMAL(10,2),
+    eu_sales DECIMAL(10,2),
+    jp_sales DECIMAL(10,2),
+    other_sales DECIMAL(10,2),
+    global_sales DECIMAL(10,2),
+    decade INTEGER,
+    total_regional_sales DECIMAL(10,2),
+    sales_difference DECIMAL(10,2),
+    row_hash BIGINT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Tabla de hechos (migración 6): las columnas de DIMENSIONS se guardan como claves enteras
+# y video_games_sales pasa a ser una vista con los textos para las consultas existentes
+FACT_TABLE = 'video_games_sales_fact'
+
+# Dimensiones: columna -> (tabla, tipo del valor, tipo de la clave en la tabla de hechos)
+DIMENSIONS = {
+    'platform': ('video_games_platforms', 'VARCHAR(50)', 'SMALLINT'),
+    'genre': ('video_games_genres', 'VARCHAR(50)', 'SMALLINT'),
+    'publisher': ('video_games_publishers', 'VARCHAR(255)', 'INTEGER'),
+}
+
+# Columnas de video_games_sales en orden (las de DIMENSIONS son <columna>_id en la tabla de hechos)
+VIEW_COLUMNS = ['id', 'rank', 'name', 'platform', 'year', 'genre', 'publisher',
+                'na_sales', 'eu_sales', 'jp_sales', 'other_sales', 'global_sales',
+                'decade', 'total_regional_sales', 'sales_difference', 'row_hash', 'created_at']
+FACT_COLUMNS = [f"{col}_id" if col in DIMENSIONS else col for col in VIEW_COLUMNS]
+
+# Columnas de la tabla de hechos después de id (comunes a la tabla normal y a la particionada)
+FACT_COLUMNS_SQL = """
+    rank INTEGER,
+    name VARCHAR(255) NOT NULL,
+    platform_id SMALLINT,
+    year INTEGER,
+    genre_id SMALLINT,
+    publisher_id INTEGER,
+    na_sales DECIMAL(10,2),
+    eu_sales DECIMAL(10,2),
+    jp_sales DECIMAL(10,2),
+    other_sales DECIMAL(10,2),
+    global_sales DECIMAL(10,2),
+    decade INTEGER,
+    total_regional_sales DECIMAL(10,2),
+    sales_difference DECIMAL(10,2),
+    row_hash BIGINT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""
+
+CREATE_FACT_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {FACT_TABLE} (
+    id SERIAL PRIMARY KEY,{FACT_COLUMNS_SQL}
+);
+"""
+
+# Particionado nativo de PostgreSQL por rangos de year; la clave primaria debe incluir year
+CREATE_PARTITIONED_FACT_TABLE_SQL = f"""
+CREATE TABLE {FACT_TABLE} (
+    id SERIAL,{FACT_COLUMNS_SQL},
+    PRIMARY KEY (id, year)
+) PARTITION BY RANGE (year)
+"""
+
+# Granularidad del particionado -> (prefijo del sufijo de cada partición, años por partición);
+# las particiones se llaman <FACT_TABLE>_y2006 o <FACT_TABLE>_d2000
+PARTITION_GRANULARITIES = {
+    'year': ('y', 1),
+    'decade': ('d', 10),
+}
+
+# Comentario de la tabla particionada con su granularidad ('partition_by=decade')
+PARTITION_COMMENT_PREFIX = 'partition_by='
+
+# Clave natural única de la carga incremental, sobre la tabla de hechos
+NATURAL_KEY_INDEX = 'ux_video_games_sales_natural_key'
+FACT_NATURAL_KEY = ['name', 'platform_id', 'year']
+
+# Índices secundarios para las consultas de SteamDBView: (nombre, definición)
+SECONDARY_INDEXES = [
+    ('ix_video_games_sales_global_sales', '(global_sales DESC)'),
+    ('ix_video_games_sales_platform_sales', '(platform_id, global_sales DESC)'),
+    ('ix_video_games_sales_genre_sales', '(genre_id, global_sales DESC)'),
+    ('ix_video_games_sales_publisher_sales', '(publisher_id, global_sales DESC)'),
+    ('ix_video_games_sales_year', '(year) WHERE year > 0'),
+]
+NAME_SEARCH_INDEX = 'ix_video_games_sales_lower_name'
+
+# Índices de la migración 3, sobre la tabla original con columnas de texto
+LEGACY_SECONDARY_INDEXES = [
+    ('ix_video_games_sales_global_sales', '(global_sales DESC)'),
+    ('ix_video_games_sales_platform_sales', '(platform, global_sales DESC)'),
+    ('ix_video_games_sales_genre_sales', '(genre, global_sales DESC)'),
+    ('ix_video_games_sales_publisher_sales', '(publisher, global_sales DESC)'),
+    ('ix_video_games_sales_year', '(year) WHERE year > 0'),
+]
+
+
+def _serial(sql, dialect):
+    # SQLite no tiene SERIAL: usar la clave autoincremental nativa
+    if dialect == 'sqlite':
+        return sql.replace('SERIAL PRIMARY KEY', 'INTEGER PRIMARY KEY AUTOINCREMENT')
+    return sql
+
+
+def _create_base_table(conn, dialect):
+    conn.execute(text(_serial(CREATE_TABLE_SQL, dialect)))
+
+
+def _add_row_hash(conn, dialect):
+    # Tablas creadas por versiones anteriores no tienen row_hash
+    columns = [col['name'] for col in inspect(conn).get_columns('video_games_sales')]
+    if 'row_hash' not in columns:
+        conn.execute(text("ALTER TABLE video_games_sales ADD COLUMN row_hash BIGINT"))
+
+
+def _create_indexes(conn, dialect):
+    SchemaManager.create_secondary_indexes(conn, dialect, 'video_games_sales', LEGACY_SECONDARY_INDEXES)
+
+
+def _create_load_generation(conn, dialect):
+    # Contador que el loader incrementa en cada carga; la vista lo usa para invalidar cachés
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS etl_load_generation (
+            id INTEGER PRIMARY KEY,
+            generation BIGINT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    conn.execute(text("INSERT INTO etl_load_generation (id, generation) VALUES (1, 0)"))
+
+
+def _create_quarantine_table(conn, dialect):
+    # Filas rechazadas por la validación, con sus motivos; name admite nulos (nombres vacíos)
+    sql = """
+        CREATE TABLE IF NOT EXISTS video_games_sales_quarantine (
+            id SERIAL PRIMARY KEY,
+            rank INTEGER,
+            name VARCHAR(255),
+            platform VARCHAR(50),
+            year INTEGER,
+            genre VARCHAR(50),
+            publisher VARCHAR(255),
+            na_sales DECIMAL(10,2),
+            eu_sales DECIMAL(10,2),
+            jp_sales DECIMAL(10,2),
+            other_sales DECIMAL(10,2),
+            global_sales DECIMAL(10,2),
+            reasons VARCHAR(255) NOT NULL,
+            quarantined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    conn.execute(text(_serial(sql, dialect)))
+
+
+def _create_dimensions(conn, dialect):
+    # Dimensiones con los valores distintos de la tabla original y clave entera
+    for column, (table, value_type, _) in DIMENSIONS.items():
+        conn.execute(text(_serial(
+            f"CREATE TABLE {table} (id SERIAL PRIMARY KEY, {column} {value_type} NOT NULL UNIQUE)", dialect
+        )))
+        conn.execute(text(f"""
+            INSERT INTO {table} ({column})
+            SELECT DISTINCT {column} FROM video_games_sales WHERE {column} IS NOT NULL ORDER BY {column}
+        """))
+    
+    # La tabla de hechos se rellena con las claves; los ids de las filas se conservan
+    natural_key = _has_index(conn, dialect, NATURAL_KEY_INDEX, 'video_games_sales')
+    conn.execute(text("ALTER TABLE video_games_sales RENAME TO video_games_sales_legacy"))
+    conn.execute(text(_serial(CREATE_FACT_TABLE_SQL, dialect)))
+    values = [f"{col}.id" if col in DIMENSIONS else f"legacy.{col}" for col in VIEW_COLUMNS]
+    joins = ' '.join(f"LEFT JOIN {table} {column} ON {column}.{column} = legacy.{column}"
+                     for column, (table, _, _) in DIMENSIONS.items())
+    conn.execute(text(f"""
+        INSERT INTO {FACT_TABLE} ({', '.join(FACT_COLUMNS)})
+        SELECT {', '.join(values)} FROM video_games_sales_legacy legacy {joins}
+    """))
+    conn.execute(text("DROP TABLE video_games_sales_legacy"))
+    if dialect == 'postgresql':
+        _reset_id_sequence(conn)
+    
+    conn.execute(text(SchemaManager.compatibility_view_sql()))
+    SchemaManager.create_secondary_indexes(conn, dialect)
+    if natural_key:
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX {NATURAL_KEY_INDEX} ON {FACT_TABLE} ({', '.join(FACT_NATURAL_KEY)})"
+        ))
+
+
+def _reset_id_sequence(conn):
+    # Los ids se insertaron a mano: la secuencia debe continuar después del máximo
+    conn.execute(text(f"""
+        SELECT setval(pg_get_serial_sequence('{FACT_TABLE}', 'id'), COALESCE(MAX(id), 0) + 1, false)
+        FROM {FACT_TABLE}
+    """))
+
+
+def _has_index(conn, dialect, name, table=FACT_TABLE):
+    # Sin reflexión: SQLAlchemy no refleja índices de expresión
+    if dialect == 'postgresql':
+        query = "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    elif dialect == 'sqlite':
+        query = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"
+    else:
+        return name in [index['name'] for index in inspect(conn).get_indexes(table)]
+    return conn.execute(text(query), {'name': name}).scalar() is not None
+
+
+# Migraciones en orden: (versión, descripción, función(conn, dialecto))
+MIGRATIONS = [
+    (1, 'Tabla video_games_sales', _create_base_table),
+    (2, 'Columna row_hash para cargas incrementales', _add_row_hash),
+    (3, 'Índices secundarios para los informes y la búsqueda por nombre', _create_indexes),
+    (4, 'Contador de generación de carga para invalidar cachés', _create_load_generation),
+    (5, 'Tabla de cuarentena para las filas rechazadas por la validación', _create_quarantine_table),
+    (6, 'Dimensiones platform/genre/publisher con claves enteras y vista de compatibilidad', _create_dimensions),
+]
+
+
+class SchemaManager:
+    """Migraciones versionadas del esquema e índices de video_games_sales
+    
+    Desde la migración 6 los datos están en la tabla de hechos FACT_TABLE y
+    video_games_sales es una vista que une las dimensiones: las consultas de
+    lectura no cambian y las escrituras van a la tabla de hechos.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+
+    def migrate(self):
+        """Aplicar en orden las migraciones pendientes, cada una en su transacción"""
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    description VARCHAR(255),
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+            applied = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+        
+        for version, description, apply in MIGRATIONS:
+            if version in applied:
+                continue
+            with self.engine.begin() as conn:
+                apply(conn, self.dialect)
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, description) VALUES (:version, :description)"),
+                    {'version': version, 'description': description}
+                )
+            print(f"Migración {version} aplicada: {description}")
+
+    def current_version(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar()
+
+    def load_generation(self):
+        """Generación de carga actual, o None si la migración 4 no está aplicada"""
+        if 'etl_load_generation' not in inspect(self.engine).get_table_names():
+            return None
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT generation FROM etl_load_generation WHERE id = 1")).scalar()
+
+    def bump_load_generation(self):
+        """Incrementar la generación de carga tras escribir en video_games_sales"""
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE etl_load_generation
+                SET generation = generation + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = 1
+            """))
+
+    def has_index(self, name):
+        """Comprobar si existe un índice en la tabla de hechos"""
+        with self.engine.connect() as conn:
+            return _has_index(conn, self.dialect, name)
+
+    def drop_secondary_indexes(self):
+        """Eliminar los índices secundarios antes de una carga masiva"""
+        with self.engine.begin() as conn:
+            for name, _ in SECONDARY_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            conn.execute(text(f"DROP INDEX IF EXISTS {NAME_SEARCH_INDEX}"))
+        print("Índices secundarios eliminados para la carga masiva")
+
+    def rebuild_secondary_indexes(self):
+        """Volver a crear los índices secundarios después de una carga masiva"""
+        with self.engine.begin() as conn:
+            self.create_secondary_indexes(conn, self.dialect)
+        print("Índices secundarios reconstruidos")
+
+    def is_partitioned(self):
+        """Comprobar si la tabla de hechos es una tabla particionada de PostgreSQL"""
+        if self.dialect != 'postgresql':
+            return False
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+                {'table': FACT_TABLE}
+            ).scalar() is not None
+
+    def partitions(self):
+        """Particiones de la tabla de hechos: {nombre: primer año}"""
+        if self.dialect != 'postgresql':
+            return {}
+        with self.engine.connect() as conn:
+            names = conn.execute(text("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = to_regclass(:table)
+            """), {'table': FACT_TABLE}).scalars()
+            return {name: int(name[len(FACT_TABLE) + 2:]) for name in names}
+
+    def partition_granularity(self):
+        """Granularidad del particionado ('year' o 'decade'), o None si la tabla no está particionada
+        
+        Se guarda en el comentario de la tabla de hechos para conocerla aunque
+        todavía no haya particiones.
+        """
+        if self.dialect != 'postgresql':
+            return None
+        with self.engine.connect() as conn:
+            comment = conn.execute(text("SELECT obj_description(to_regclass(:table), 'pg_class')"),
+                                   {'table': FACT_TABLE}).scalar() or ''
+        granularity = comment.removeprefix(PARTITION_COMMENT_PREFIX)
+        return granularity if comment.startswith(PARTITION_COMMENT_PREFIX) and granularity in PARTITION_GRANULARITIES else None
+
+    @staticmethod
+    def partition_bounds(year, granularity):
+        """(nombre, desde, hasta) de la partición que contiene year; hasta es exclusivo"""
+        suffix, width = PARTITION_GRANULARITIES[granularity]
+        start = int(year) // width * width
+        return f"{FACT_TABLE}_{suffix}{start}", start, start + width
+
+    def partition_fact_table(self, granularity):
+        """Convertir la tabla de hechos en una tabla particionada por rangos de year
+        
+        Solo PostgreSQL. Los datos se copian a la nueva tabla en una
+        transacción, conservando los ids, la vista, los índices y la clave
+        natural. Si la tabla ya está particionada no se hace nada.
+        """
+        if granularity not in PARTITION_GRANULARITIES:
+            raise ValueError(f"Particionado no soportado: {granularity} (usa {', '.join(PARTITION_GRANULARITIES)})")
+        if self.dialect != 'postgresql':
+            print(f"Aviso: el particionado requiere PostgreSQL; {FACT_TABLE} se mantiene sin particionar")
+            return False
+        if self.is_partitioned():
+            current = self.partition_granularity()
+            if current != granularity:
+                print(f"Aviso: {FACT_TABLE} ya está particionada por {current}; se ignora PARTITION_BY={granularity}")
+            return True
+        
+        legacy = f"{FACT_TABLE}_unpartitioned"
+        with self.engine.begin() as conn:
+            natural_key = _has_index(conn, self.dialect, NATURAL_KEY_INDEX)
+            # La vista y los nombres de índices y de la clave primaria pasan a la tabla nueva
+            conn.execute(text("DROP VIEW video_games_sales"))
+            for name in [name for name, _ in SECONDARY_INDEXES] + [NAME_SEARCH_INDEX, NATURAL_KEY_INDEX]:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            conn.execute(text(f"ALTER TABLE {FACT_TABLE} RENAME TO {legacy}"))
+            conn.execute(text(f"ALTER TABLE {legacy} DROP CONSTRAINT {FACT_TABLE}_pkey"))
+            
+            conn.execute(text(CREATE_PARTITIONED_FACT_TABLE_SQL))
+            conn.execute(text(f"COMMENT ON TABLE {FACT_TABLE} IS '{PARTITION_COMMENT_PREFIX}{granularity}'"))
+            years = conn.execute(text(f"SELECT DISTINCT year FROM {legacy}")).scalars().all()
+            self._create_partitions(conn, years, granularity, existing=set())
+            columns = ', '.join(FACT_COLUMNS)
+            conn.execute(text(f"INSERT INTO {FACT_TABLE} ({columns}) SELECT {columns} FROM {legacy}"))
+            conn.execute(text(f"DROP TABLE {legacy}"))
+            _reset_id_sequence(conn)
+            
+            conn.execute(text(self.compatibility_view_sql()))
+            self.create_secondary_indexes(conn, self.dialect)
+            if natural_key:
+                conn.execute(text(
+                    f"CREATE UNIQUE INDEX {NATURAL_KEY_INDEX} ON {FACT_TABLE} ({', '.join(FACT_NATURAL_KEY)})"
+                ))
+        print(f"Tabla {FACT_TABLE} particionada por {granularity} ({len(self.partitions())} particiones)")
+        return True
+
+    def ensure_partitions(self, years):
+        """Crear las particiones que falten para los años indicados; devuelve sus nombres"""
+        granularity = self.partition_granularity()
+        if granularity is None:
+            return []
+        with self.engine.begin() as conn:
+            return self._create_partitions(conn, years, granularity, set(self.partitions()))
+
+    def _create_partitions(self, conn, years, granularity, existing):
+        created = []
+        for year in sorted(set(int(year) for year in years)):
+            name, start, end = self.partition_bounds(year, granularity)
+            if name in existing or name in created:
+                continue
+            conn.execute(text(f"CREATE TABLE {name} PARTITION OF {FACT_TABLE} FOR VALUES FROM ({start}) TO ({end})"))
+            created.append(name)
+        if created:
+            print(f"Particiones creadas: {', '.join(created)}")
+        return created
+
+    def swap_partition(self, staging, year):
+        """Sustituir en una transacción la partición que contiene year por la tabla staging ya cargada
+        
+        La partición anterior se separa (DETACH) y se elimina, y staging se
+        adjunta (ATTACH) con su nombre: las consultas ven los datos viejos o
+        los nuevos, nunca una mezcla, y el resto de particiones no se toca.
+        staging debe tener un CHECK con los límites de la partición para que
+        ATTACH no tenga que recorrerla.
+        """
+        name, start, end = self.partition_bounds(year, self.partition_granularity())
+        existing = name in self.partitions()
+        with self.engine.begin() as conn:
+            if existing:
+                conn.execute(text(f"ALTER TABLE {FACT_TABLE} DETACH PARTITION {name}"))
+                conn.execute(text(f"DROP TABLE {name}"))
+            conn.execute(text(f"ALTER TABLE {staging} RENAME TO {name}"))
+            # Los índices de staging toman el nombre de la partición (los de la anterior ya no existen)
+            indexes = conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = :name"),
+                                   {'name': name}).scalars().all()
+            for index in indexes:
+                if index.startswith(staging):
+                    conn.execute(text(f"ALTER INDEX {index} RENAME TO {(name + index[len(staging):])[:63]}"))
+            conn.execute(text(f"ALTER TABLE {FACT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ({start}) TO ({end})"))
+        return name
+
+    @staticmethod
+    def compatibility_view_sql():
+        """Vista video_games_sales: la tabla de hechos con los textos de las dimensiones
+        
+        Mismas columnas y en el mismo orden que la tabla original, así que
+        SELECT * y las consultas de SteamDBView y de los rollups no cambian.
+        """
+        columns = [f"{col}.{col}" if col in DIMENSIONS else f"fact.{col}" for col in VIEW_COLUMNS]
+        joins = '\n'.join(f"LEFT JOIN {table} {column} ON {column}.id = fact.{column}_id"
+                          for column, (table, _, _) in DIMENSIONS.items())
+        return f"CREATE VIEW video_games_sales AS\nSELECT {', '.join(columns)}\nFROM {FACT_TABLE} fact\n{joins}"
+
+    @staticmethod
+    def create_secondary_indexes(conn, dialect, table=FACT_TABLE, indexes=SECONDARY_INDEXES):
+        """Crear los índices secundarios que falten"""
+        for name, definition in indexes:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} {definition}"))
+        
+        if dialect != 'postgresql':
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {NAME_SEARCH_INDEX} ON {table} (lower(name))"
+            ))
+            return
+        
+        # LOWER(name) LIKE '%term%' solo puede usar un índice de trigramas (pg_trgm);
+        # sin permisos para la extensión se usa un índice de expresión para prefijos
+        try:
+            with conn.begin_nested():
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {NAME_SEARCH_INDEX} "
+                    f"ON {table} USING gin (lower(name) gin_trgm_ops)"
+                ))
+        except DBAPIError as e:
+            reason = str(e.orig).strip().splitlines()[0]
+            print(f"Aviso: pg_trgm no disponible ({reason}); se usa un índice de prefijos")
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {NAME_SEARCH_INDEX} "
+                f"ON {table} (lower(name) text_pattern_ops)"
+            ))
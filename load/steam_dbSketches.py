@@ -0,0 +1,345 @@
+import io
+import math
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect, text
+
+# Estado serializado de los sketches (una sola fila, id = 1)
+SKETCH_TABLE = 'video_games_sales_sketches'
+
+# Filas de la muestra reservoir que mantiene el loader (también objetivo de TABLESAMPLE en la vista)
+DEFAULT_SAMPLE_ROWS = 20000
+
+# Registros de HyperLogLog: 2^14 bytes por sketch, error típico 1.04 / sqrt(2^14) = 0.8 %
+HLL_PRECISION = 14
+
+# Compresión del t-digest: ~delta/2 centroides, más finos en las colas (error de rango < 0.05 % en p99)
+TDIGEST_COMPRESSION = 500
+
+# Columnas de la muestra reservoir: las de los informes por plataforma y género
+SAMPLE_CATEGORIES = ['platform', 'genre']
+SAMPLE_NUMBERS = {'year': 'int32', 'global_sales': 'float64'}
+
+# Filas por bloque al recalcular los sketches desde la tabla
+REBUILD_CHUNK_SIZE = 100000
+
+
+class HyperLogLog:
+    """Conteo aproximado de valores distintos con 2^precision registros de un byte
+
+    Los valores se hashean en bloque con pandas (64 bits, deterministas entre
+    ejecuciones): los primeros `precision` bits eligen el registro y el resto
+    aporta la posición del primer 1. Dos sketches se unen con el máximo
+    registro a registro.
+    """
+
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype='uint8')
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, values):
+        values = pd.Series(values).dropna()
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_array(values.astype(str).to_numpy(dtype=object))
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype('int64')
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # frexp da la longitud en bits exacta (rest < 2^53 es representable en float64)
+        _, bit_length = np.frexp(rest.astype('float64'))
+        rank = (bits - bit_length + 1).astype('uint8')
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype('int64')))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Rango bajo: conteo lineal sobre los registros vacíos
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class TDigest:
+    """Cuantiles aproximados de una columna numérica (t-digest con fusión vectorizada)
+
+    Los valores se acumulan en centroides (media, peso) cuyo tamaño máximo
+    depende del cuantil: pequeños en las colas y grandes en la mediana, así
+    que p99 es casi exacto con unos cientos de centroides. Mínimo, máximo,
+    conteo y suma se guardan exactos.
+    """
+
+    def __init__(self, compression=TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0, dtype='float64')
+        self.weights = np.empty(0, dtype='float64')
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        values = np.asarray(pd.Series(values, dtype='float64').dropna(), dtype='float64')
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._merge(np.concatenate([self.means, values]),
+                    np.concatenate([self.weights, np.ones(len(values))]))
+
+    def _merge(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # Cada centroide abarca una unidad de la función de escala k1(q) = delta/2pi * asin(2q - 1)
+        middle = (np.cumsum(weights) - weights / 2) / total
+        scale = self.compression / (2 * math.pi) * np.arcsin(2 * middle - 1)
+        cluster = np.floor(scale - scale[0]).astype('int64')
+        weight = np.bincount(cluster, weights=weights)
+        keep = weight > 0
+        self.means = np.bincount(cluster, weights=means * weights)[keep] / weight[keep]
+        self.weights = weight[keep]
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * self.count, np.concatenate([[0], centers, [self.count]]),
+                               np.concatenate([[self.min], self.means, [self.max]])))
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class Reservoir:
+    """Muestra aleatoria uniforme de tamaño fijo de todas las filas vistas (algoritmo R)
+
+    La fila i (contando desde 0) entra con probabilidad capacity / (i + 1)
+    sustituyendo a una posición al azar; por bloques, las sustituciones se
+    sortean a la vez con NumPy. En cualquier momento la muestra es uniforme
+    sobre todas las filas agregadas.
+    """
+
+    def __init__(self, capacity=DEFAULT_SAMPLE_ROWS, columns=None, seen=0):
+        self.capacity = capacity
+        self.columns = columns or {}
+        self.seen = seen
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def add(self, columns, rng=None):
+        """Agregar un bloque: columns es {nombre: array} con la misma longitud"""
+        rows = len(next(iter(columns.values())))
+        if rows == 0:
+            return
+        rng = rng or np.random.default_rng()
+        room = max(self.capacity - len(self), 0)
+        fill = min(room, rows)
+        if fill:
+            self.columns = {name: np.concatenate([self.columns[name], values[:fill]]) if self.columns
+                            else values[:fill].copy() for name, values in columns.items()}
+        if rows > fill:
+            position = self.seen + np.arange(fill, rows)
+            slot = rng.integers(0, position + 1)
+            chosen = np.flatnonzero(slot < self.capacity) + fill
+            # Si varias filas del bloque caen en la misma posición gana la última, como en el orden secuencial
+            slots, last = np.unique(slot[chosen - fill][::-1], return_index=True)
+            source = chosen[::-1][last]
+            for name, values in columns.items():
+                self.columns[name][slots] = values[source]
+        self.seen += rows
+
+    def frame(self):
+        return pd.DataFrame(self.columns)
+
+
+class SketchSet:
+    """Sketches de la tabla de hechos que mantiene el loader
+
+    - rows: filas de la tabla (exacto)
+    - names, publishers: HyperLogLog de juegos y editores distintos
+    - sales, years: t-digest de global_sales y year (mínimo, máximo y media exactos)
+    - sample: reservoir con platform, genre, year y global_sales
+    """
+
+    def __init__(self, sample_rows=DEFAULT_SAMPLE_ROWS):
+        self.rows = 0
+        self.names = HyperLogLog()
+        self.publishers = HyperLogLog()
+        self.sales = TDigest()
+        self.years = TDigest()
+        self.sample = Reservoir(sample_rows)
+        # Categorías de la muestra: las columnas de texto se guardan como códigos
+        self.categories = {column: np.empty(0, dtype=str) for column in SAMPLE_CATEGORIES}
+
+    def update(self, df):
+        """Agregar un lote de filas (columnas de la vista: name, platform, genre, publisher, year, global_sales)"""
+        if df is None or len(df) == 0:
+            return
+        self.rows += len(df)
+        self.names.add(df['name'])
+        self.publishers.add(df['publisher'])
+        self.sales.add(df['global_sales'])
+        self.years.add(df['year'])
+        columns = {column: self._codes(column, df[column]) for column in SAMPLE_CATEGORIES}
+        for column, dtype in SAMPLE_NUMBERS.items():
+            columns[column] = pd.to_numeric(df[column]).astype('float64').fillna(-1).to_numpy().astype(dtype)
+        self.sample.add(columns)
+
+    def _codes(self, column, values):
+        """Códigos (int32, -1 = nulo) de values sobre las categorías acumuladas de la columna"""
+        values = pd.Series(values, dtype=object)
+        known = pd.Index(self.categories[column])
+        new = pd.Index(values.dropna().astype(str).unique()).difference(known)
+        if len(new):
+            self.categories[column] = np.concatenate([self.categories[column], new.to_numpy(dtype=str)])
+            known = pd.Index(self.categories[column])
+        codes = known.get_indexer(values.where(values.isna(), values.astype(str)))
+        return codes.astype('int32')
+
+    def sample_frame(self):
+        """Muestra como DataFrame con platform y genre de nuevo como texto"""
+        df = self.sample.frame()
+        if len(df) == 0:
+            return pd.DataFrame(columns=SAMPLE_CATEGORIES + list(SAMPLE_NUMBERS))
+        for column in SAMPLE_CATEGORIES:
+            df[column] = pd.Categorical.from_codes(df[column], categories=self.categories[column])
+        return df
+
+    def to_bytes(self):
+        """Serializar con np.savez (solo arrays numéricos y de texto, sin pickle)"""
+        arrays = {
+            'rows': np.array([self.rows, self.sample.seen, self.sample.capacity], dtype='int64'),
+            'names': self.names.registers,
+            'publishers': self.publishers.registers,
+        }
+        for name, digest in (('sales', self.sales), ('years', self.years)):
+            arrays[f'{name}_means'] = digest.means
+            arrays[f'{name}_weights'] = digest.weights
+            arrays[f'{name}_stats'] = np.array([digest.count, digest.total, digest.min, digest.max], dtype='float64')
+        for column in SAMPLE_CATEGORIES:
+            arrays[f'categories_{column}'] = self.categories[column]
+        for column, values in self.sample.columns.items():
+            arrays[f'sample_{column}'] = values
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            rows, seen, capacity = (int(value) for value in arrays['rows'])
+            sketches = cls(capacity)
+            sketches.rows = rows
+            sketches.names = HyperLogLog(registers=arrays['names'].copy())
+            sketches.publishers = HyperLogLog(registers=arrays['publishers'].copy())
+            for name in ('sales', 'years'):
+                digest = getattr(sketches, name)
+                digest.means = arrays[f'{name}_means']
+                digest.weights = arrays[f'{name}_weights']
+                count, digest.total, digest.min, digest.max = (float(value) for value in arrays[f'{name}_stats'])
+                digest.count = int(count)
+            for column in SAMPLE_CATEGORIES:
+                sketches.categories[column] = arrays[f'categories_{column}']
+            columns = {column: arrays[f'sample_{column}'].copy() for column in SAMPLE_CATEGORIES + list(SAMPLE_NUMBERS)
+                       if f'sample_{column}' in arrays}
+            sketches.sample = Reservoir(capacity, columns, seen)
+        return sketches
+
+
+class SalesSketches:
+    """Mantener los sketches de video_games_sales en SKETCH_TABLE tras cada carga
+
+    Como las tablas de resumen: las filas nuevas se agregan a los sketches
+    existentes y, si hubo filas modificadas o particiones sustituidas, se
+    recalculan recorriendo la tabla (un HyperLogLog o un t-digest no admiten
+    borrados). Cada estado guarda la generación de carga que publicará el
+    loader, así la vista detecta sketches desactualizados.
+    """
+
+    def __init__(self, engine, sample_rows=DEFAULT_SAMPLE_ROWS):
+        self.engine = engine
+        self.sample_rows = sample_rows
+        self.dialect = engine.dialect.name
+
+    def ensure_table(self):
+        """Crear SKETCH_TABLE si falta y calcular los sketches desde la tabla de hechos"""
+        if SKETCH_TABLE in inspect(self.engine).get_table_names():
+            return
+        binary = 'BYTEA' if self.dialect == 'postgresql' else 'BLOB'
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE {SKETCH_TABLE} (
+                    id INTEGER PRIMARY KEY,
+                    generation BIGINT NOT NULL,
+                    rows_seen BIGINT NOT NULL,
+                    state {binary} NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+        self.rebuild(publish=False)
+        print(f"Sketches '{SKETCH_TABLE}' creados")
+
+    def load(self):
+        """(SketchSet, generación) guardados, o (None, None) si no hay"""
+        if SKETCH_TABLE not in inspect(self.engine).get_table_names():
+            return None, None
+        with self.engine.connect() as conn:
+            row = conn.execute(text(f"SELECT state, generation FROM {SKETCH_TABLE} WHERE id = 1")).fetchone()
+        if row is None:
+            return None, None
+        return SketchSet.from_bytes(bytes(row[0])), row[1]
+
+    def refresh(self, new_rows, changed_rows=None, sketches=None):
+        """Agregar las filas recién cargadas y devolver el SketchSet actualizado
+
+        sketches: estado ya cargado (la carga por bloques lo reutiliza entre
+        bloques para no leerlo de la base en cada uno).
+        """
+        if changed_rows is not None and len(changed_rows) > 0:
+            return self.rebuild()
+        if sketches is None:
+            sketches, _ = self.load()
+            if sketches is None:
+                return self.rebuild()
+        sketches.update(new_rows)
+        self.save(sketches)
+        return sketches
+
+    def rebuild(self, publish=True):
+        """Recalcular los sketches recorriendo video_games_sales por bloques"""
+        sketches = SketchSet(self.sample_rows)
+        query = "SELECT name, platform, genre, publisher, year, global_sales FROM video_games_sales"
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=REBUILD_CHUNK_SIZE)
+            for chunk in pd.read_sql(text(query), conn, chunksize=REBUILD_CHUNK_SIZE):
+                sketches.update(chunk)
+        self.save(sketches, next_generation=publish)
+        return sketches
+
+    def save(self, sketches, next_generation=True):
+        """Guardar el estado con la generación que tendrá la tabla al publicar la carga"""
+        with self.engine.begin() as conn:
+            generation = conn.execute(text("SELECT generation FROM etl_load_generation WHERE id = 1")).scalar() or 0
+            conn.execute(text(f"""
+                INSERT INTO {SKETCH_TABLE} (id, generation, rows_seen, state)
+                VALUES (1, :generation, :rows, :state)
+                ON CONFLICT (id) DO UPDATE SET
+                    generation = EXCLUDED.generation,
+                    rows_seen = EXCLUDED.rows_seen,
+                    state = EXCLUDED.state,
+                    updated_at = CURRENT_TIMESTAMP
+            """), {'generation': generation + (1 if next_generation else 0), 'rows': sketches.rows,
+                   'state': sketches.to_bytes()})
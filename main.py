@@ -1,7 +1,8 @@
 from config.configuraciones import configuracion
-from extract.steam_dbExtract import SteamDBExtractor
-from transform.steam_dbTransform import SteamDBTransform
-from load.steam_dbLoad import Load
+from monitor.steam_dbMonitor import RunMonitor, stage
+
+# Los módulos del ETL (pandas, NumPy, SQLAlchemy) se importan dentro de cada
+# fase: la configuración se lee y se muestra antes de pagar su coste de carga
 
 def main():
     print("=== INICIANDO PROCESO ETL PARA VIDEO GAMES SALES ===")
@@ -11,48 +12,289 @@ def main():
     print(f"Archivo de entrada: {config.INPUT_PATH}")
     print(f"Base de datos: {config.DB_NAME} en {config.DB_HOST}:{config.DB_PORT}")
     
+    # Métricas por fase (tiempo real, CPU, RSS, filas) y perfiles opcionales
+    monitor = RunMonitor(profile=config.PROFILE_MODE, profile_dir=config.PROFILE_DIR)
+    try:
+        with monitor.activate():
+            if config.CHUNK_SIZE > 0:
+                main_streaming(config)
+            else:
+                run_etl(config)
+    finally:
+        write_metrics(config, monitor)
+
+def run_etl(config):
+    """Fases del ETL sobre el dataset completo en memoria"""
+    from extract.steam_dbCache import SteamDBCache
+    from load.steam_dbLoad import Load
+    
+    # Caché columnar: si el CSV no cambió se omiten extracción y transformación
+    with stage('cache.load') as step:
+        cache = SteamDBCache(config.INPUT_PATH, config.CACHE_PATH)
+        df_transformed = cache.load()
+        step.rows_out = len(df_transformed) if df_transformed is not None else 0
+    if df_transformed is not None:
+        print("✅ Caché vigente: se omiten extracción y transformación")
+    else:
+        df_transformed, complete = extract_and_transform(config)
+        if df_transformed is None:
+            return
+        if complete:
+            with stage('cache.save', rows_in=len(df_transformed)):
+                cache.save(df_transformed)
+        else:
+            # Con archivos omitidos la huella del origen coincidiría y la próxima ejecución no los reintentaría
+            print("⚠️  Caché columnar no actualizada: hay archivos de entrada con errores")
+
+    loader = Load(df_transformed)
+    if config.PIPELINE_QUEUE_SIZE > 0:
+        # 3-4. CARGA Y BACKUP a la vez: las dos fases solo leen el DataFrame limpio
+        print("\n--- FASE 3-4: CARGA A BASE DE DATOS Y BACKUP EN PARALELO ---")
+        with stage('load_backup', rows_in=len(df_transformed)):
+            loaded = load_and_backup(config, loader)
+    else:
+        # 3. CARGA A BASE DE DATOS
+        print("\n--- FASE 3: CARGA A BASE DE DATOS ---")
+        with stage('load', rows_in=len(df_transformed)):
+            loaded = loader.load_to_database()
+    if loaded:
+        print("✅ Carga a base de datos exitosa")
+        
+        # Mostrar estadísticas de la base de datos
+        print("\n--- ESTADÍSTICAS DE LA BASE DE DATOS ---")
+        with stage('stats'):
+            loader.get_database_stats()
+    else:
+        print("❌ Error al cargar datos a la base de datos")
+        return
+
+    if config.PIPELINE_QUEUE_SIZE == 0:
+        # 4. BACKUP CSV (opcional)
+        print("\n--- FASE 4: BACKUP CSV ---")
+        with stage('backup', rows_in=len(df_transformed)):
+            loader.clean_csv(config.OUTPUT_PATH)
+    
+    print("\n=== PROCESO ETL COMPLETADO EXITOSAMENTE ===")
+    print("Los datos de video games sales han sido procesados y cargados a la base de datos.")
+
+def extract_and_transform(config):
+    """Fases 1 y 2: leer el CSV de origen y limpiarlo
+    
+    Devuelve (DataFrame limpio o None, si se leyeron todos los archivos de entrada).
+    """
+    from extract.steam_dbExtract import SteamDBExtractor
+    from transform.steam_dbTransform import SteamDBTransform
+    
+    extractor = SteamDBExtractor(config.INPUT_PATH)
+    if extractor.multi_file:
+        return extract_and_transform_parallel(config, extractor)
+    
     # 1. EXTRACCIÓN
     print("\n--- FASE 1: EXTRACCIÓN ---")
-    extractor = SteamDBExtractor(config.INPUT_PATH)
-    df = extractor.extract()
+    with stage('extract') as step:
+        df = extractor.extract()
+        step.rows_out = len(df) if df is not None else 0
     if df is None:
         print("❌ No se pudo extraer datos. Terminando proceso ETL.")
-        return
+        return None, False
     
     print(f"✅ Extracción exitosa: {len(df)} registros extraídos")
 
     # 2. TRANSFORMACIÓN
     print("\n--- FASE 2: TRANSFORMACIÓN ---")
     transformer = SteamDBTransform(df)
-    df_transformed = transformer.clean()
+    with stage('transform', rows_in=len(df)) as step:
+        df_transformed = transformer.clean()
+        step.rows_out = len(df_transformed) if df_transformed is not None else 0
+    save_quarantine(config, transformer.quarantine)
     
     if df_transformed is None or len(df_transformed) == 0:
         print("❌ Error en la transformación. Terminando proceso ETL.")
-        return
+        return None, False
     
     print(f"✅ Transformación exitosa: {len(df_transformed)} registros transformados")
+    return df_transformed, True
 
-    # 3. CARGA A BASE DE DATOS
-    print("\n--- FASE 3: CARGA A BASE DE DATOS ---")
-    loader = Load(df_transformed)
+def extract_and_transform_parallel(config, extractor):
+    """Fases 1 y 2 para varios archivos: cada proceso del pool lee y limpia un archivo"""
+    from transform.steam_dbValidate import SteamDBValidator
+    
+    print("\n--- FASE 1-2: EXTRACCIÓN Y TRANSFORMACIÓN EN PARALELO ---")
+    with stage('extract_transform_parallel') as step:
+        df_transformed = extractor.extract_transform_parallel(config.EXTRACT_WORKERS or None)
+        step.rows_out = len(df_transformed) if df_transformed is not None else 0
+    
+    if extractor.errors:
+        print(f"⚠️  {len(extractor.errors)} archivos con errores se omitieron")
+    if extractor.quarantine is not None:
+        print(f"Validación: {len(extractor.quarantine)} filas en cuarentena")
+        print('\n'.join(SteamDBValidator().summary(extractor.validation)))
+        save_quarantine(config, extractor.quarantine)
     
-    # Cargar datos a la base de datos
-    if loader.load_to_database():
+    if df_transformed is None or len(df_transformed) == 0:
+        print("❌ No se pudo extraer datos. Terminando proceso ETL.")
+        return None, False
+    
+    print(f"✅ Extracción y transformación exitosas: {len(df_transformed)} registros")
+    return df_transformed, not extractor.errors
+
+def load_and_backup(config, loader):
+    """Cargar el DataFrame completo y escribir su backup en dos hilos a la vez
+    
+    La carga no lee bloques del pipeline y no puede cancelarse a medias, así que
+    un backup fallido no cancela nada: se informa aparte, como con clean_csv.
+    """
+    from load.steam_dbBackup import BackupWriter
+    from pipeline.steam_dbPipeline import Pipeline
+    
+    pipeline = Pipeline(queue_size=1, name='etl')
+    data = pipeline.source('data', [loader.df])
+    pipeline.sink('load', lambda frames: require(loader.load_to_database(), "la carga a la base de datos falló"), data)
+    if config.OUTPUT_PATH:
+        pipeline.sink('backup', lambda frames: write_backup(BackupWriter(config.OUTPUT_PATH), frames), data)
+    return run_pipeline(pipeline)
+
+def write_backup(writer, frames):
+    """Escribir el backup informando del error en lugar de propagarlo"""
+    try:
+        return writer.write_all(frames)
+    except Exception as e:
+        print(f"❌ Error al guardar el backup en {writer.path}: {e}")
+        return None
+
+def main_streaming(config):
+    """ETL por bloques: la memoria máxima depende de CHUNK_SIZE y no del tamaño del archivo"""
+    from extract.steam_dbExtract import SteamDBExtractor
+    from transform.steam_dbValidate import SteamDBValidator
+    from load.steam_dbLoad import Load
+    
+    print(f"Modo streaming: bloques de {config.CHUNK_SIZE:,} registros")
+    
+    # 1. EXTRACCIÓN (perezosa: los bloques se leen a medida que se consumen)
+    print("\n--- FASE 1-3: EXTRACCIÓN, TRANSFORMACIÓN Y CARGA POR BLOQUES ---")
+    extractor = SteamDBExtractor(config.INPUT_PATH)
+    chunks = extractor.extract(chunk_size=config.CHUNK_SIZE)
+    if chunks is None:
+        print("❌ No se pudo extraer datos. Terminando proceso ETL.")
+        return
+    
+    # 2. TRANSFORMACIÓN y validación de cada bloque
+    validation = {}
+    loader = Load()
+    with stage('stream') as step:
+        if config.PIPELINE_QUEUE_SIZE > 0:
+            # Cada fase en su hilo: el bloque N se carga mientras el N+1 se limpia y el N+2 se lee
+            loaded = stream_pipeline(config, chunks, validation, loader, step)
+        else:
+            # 3. CARGA de cada bloque + 4. BACKUP CSV incremental, en secuencia
+            transformed = clean_chunks(config, chunks, validation)
+            loaded = loader.load_stream(count_rows(transformed, step), backup_path=config.OUTPUT_PATH)
+    if validation:
+        print("Validación (filas por regla, sumando todos los bloques):")
+        print('\n'.join(SteamDBValidator().summary(validation)))
+    if loaded:
         print("✅ Carga a base de datos exitosa")
+        if config.OUTPUT_PATH:
+            print(f"✅ Backup generado en {config.OUTPUT_PATH}")
         
-        # Mostrar estadísticas de la base de datos
         print("\n--- ESTADÍSTICAS DE LA BASE DE DATOS ---")
-        loader.get_database_stats()
+        with stage('stats'):
+            loader.get_database_stats()
     else:
         print("❌ Error al cargar datos a la base de datos")
         return
-
-    # 4. BACKUP CSV (opcional)
-    print("\n--- FASE 4: BACKUP CSV ---")
-    loader.clean_csv(config.OUTPUT_PATH)
     
     print("\n=== PROCESO ETL COMPLETADO EXITOSAMENTE ===")
     print("Los datos de video games sales han sido procesados y cargados a la base de datos.")
 
+def stream_pipeline(config, chunks, validation, loader, step):
+    """Extracción, transformación, carga y backup por bloques con una fase por hilo
+    
+    Las fases se conectan con colas de PIPELINE_QUEUE_SIZE bloques; la carga y
+    el backup reciben los mismos bloques limpios y se ejecutan a la vez.
+    """
+    from load.steam_dbBackup import BackupWriter
+    from pipeline.steam_dbPipeline import Pipeline
+    
+    pipeline = Pipeline(queue_size=config.PIPELINE_QUEUE_SIZE, name='stream')
+    parsed = pipeline.source('extract', chunks)
+    cleaned = pipeline.stage('transform', lambda items: clean_chunks(config, items, validation), parsed)
+    pipeline.sink('load', lambda items: require(loader.load_stream(count_rows(items, step)),
+                                                "la carga a la base de datos falló"), cleaned)
+    if config.OUTPUT_PATH:
+        pipeline.sink('backup', BackupWriter(config.OUTPUT_PATH).write_all, cleaned)
+    return run_pipeline(pipeline)
+
+def run_pipeline(pipeline):
+    """Ejecutar el pipeline y mostrar sus tiempos por etapa; False si alguna etapa falló"""
+    from pipeline.steam_dbPipeline import PipelineError
+    
+    try:
+        pipeline.run()
+        return True
+    except PipelineError as e:
+        print(f"❌ Pipeline cancelado: {e}")
+        return False
+    finally:
+        print('\n'.join(pipeline.summary()))
+
+def require(ok, message):
+    """Convertir el False de una fase en excepción para que el pipeline cancele las demás"""
+    if not ok:
+        raise RuntimeError(message)
+    return ok
+
+def clean_chunks(config, chunks, validation):
+    """Limpiar y validar cada bloque guardando su cuarentena
+    
+    Los duplicados de la clave natural se detectan también entre bloques (el
+    validador guarda un hash de cada clave vista); los conteos por regla se
+    acumulan en validation.
+    """
+    from transform.steam_dbTransform import SteamDBTransform
+    from transform.steam_dbValidate import SteamDBValidator
+    
+    validator = SteamDBValidator(seen_keys=set())
+    for number, chunk in enumerate(chunks):
+        transformer = SteamDBTransform(chunk, verbose=False, validator=validator)
+        df = transformer.clean()
+        for rule, count in transformer.validation.items():
+            validation[rule] = validation.get(rule, 0) + count
+        save_quarantine(config, transformer.quarantine, append=number > 0, verbose=False)
+        yield df
+
+def save_quarantine(config, quarantine, append=False, verbose=True):
+    """Guardar las filas en cuarentena en QUARANTINE_PATH y en la tabla de cuarentena"""
+    from transform.steam_dbValidate import write_quarantine
+    from load.steam_dbLoad import Load
+    
+    try:
+        if config.QUARANTINE_PATH:
+            # El CSV refleja la última ejecución: el primer bloque lo reescribe aunque no haya filas
+            write_quarantine(quarantine, config.QUARANTINE_PATH, append=append)
+            if verbose and len(quarantine):
+                print(f"⚠️  {len(quarantine)} filas en cuarentena guardadas en {config.QUARANTINE_PATH}")
+        if config.QUARANTINE_TO_DB and len(quarantine):
+            Load().load_quarantine(quarantine)
+    except Exception as e:
+        print(f"❌ Error al guardar la cuarentena: {e}")
+
+def count_rows(chunks, step):
+    """Contar en la fase las filas de los bloques a medida que se consumen"""
+    for chunk in chunks:
+        step.rows_out = (step.rows_out or 0) + len(chunk)
+        yield chunk
+
+def write_metrics(config, monitor):
+    """Mostrar el resumen por fase y guardar el informe JSON y, opcionalmente, el de Prometheus"""
+    try:
+        monitor.print_summary()
+        if config.METRICS_PATH:
+            print(f"📈 Informe de métricas guardado en {monitor.write_json(config.METRICS_PATH)}")
+        if config.PROMETHEUS_PATH:
+            print(f"📈 Métricas Prometheus guardadas en {monitor.write_prometheus(config.PROMETHEUS_PATH)}")
+    except Exception as e:
+        print(f"❌ Error al guardar las métricas: {e}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
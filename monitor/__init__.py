@@ -0,0 +1 @@
+# Instrumentación y métricas del ETL
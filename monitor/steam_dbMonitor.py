@@ -0,0 +1,293 @@
+"""Instrumentación por fases del ETL: tiempo real, CPU, pico de RSS y filas de cada fase"""
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+# resource solo existe en Unix: sin él ni /proc (Windows) no se registra el pico de RSS
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Monitor activo del proceso (None = instrumentación desactivada)
+_active = None
+
+# Formatos de perfilado admitidos en PROFILE_MODE (separados por comas)
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+
+def current_rss():
+    """RSS actual del proceso en bytes (pico histórico si no hay /proc; None si tampoco hay resource)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        if not RESOURCE_AVAILABLE:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageMetrics:
+    """Métricas acumuladas de una fase (una fase puede ejecutarse varias veces)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_rss = 0
+        self.rows_in = None
+        self.rows_out = None
+
+    def add_rows(self, attribute, rows):
+        if rows is not None:
+            setattr(self, attribute, (getattr(self, attribute) or 0) + int(rows))
+
+    def as_dict(self):
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        return {
+            'stage': self.name,
+            'calls': self.calls,
+            'wall_seconds': round(self.wall, 6),
+            'cpu_seconds': round(self.cpu, 6),
+            'peak_rss_mb': round(self.peak_rss / 1024 ** 2, 2),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'rows_per_second': round(rows / self.wall, 1) if rows and self.wall > 0 else None,
+        }
+
+
+class _StageRun:
+    """Ejecución en curso de una fase; el código instrumentado fija rows_in/rows_out"""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.peak_rss = 0
+
+
+class _NullStage:
+    rows_in = None
+    rows_out = None
+
+
+class RunMonitor:
+    """Registro de métricas por fase de una ejecución del ETL
+
+    profile: None o combinación de 'cprofile' y 'tracemalloc'; en ese caso se
+    guarda un perfil por fase de primer nivel en profile_dir.
+    """
+
+    def __init__(self, profile=None, profile_dir='profiles', sample_interval=0.05):
+        self.stages = {}
+        self.profile = {mode.strip() for mode in (profile or '').split(',') if mode.strip()}
+        unknown = self.profile - set(PROFILE_MODES)
+        if unknown:
+            raise ValueError(f"Modos de perfilado desconocidos: {', '.join(sorted(unknown))}")
+        self.profile_dir = profile_dir
+        self.sample_interval = sample_interval
+        self.started_at = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        self._running = []
+        self._lock = threading.Lock()
+        # Fases abiertas por hilo: el perfil se toma en la más externa de cada hilo
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Activar el monitor para el proceso y muestrear el RSS en segundo plano"""
+        global _active
+        previous = _active
+        _active = self
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_rss, name='rss-sampler', daemon=True)
+        self._sampler.start()
+        try:
+            yield self
+        finally:
+            self._stop.set()
+            self._sampler.join()
+            self.wall += time.perf_counter() - start_wall
+            self.cpu += time.process_time() - start_cpu
+            _active = previous
+
+    @contextlib.contextmanager
+    def stage(self, name, rows_in=None):
+        run = _StageRun(name, rows_in)
+        stack = self._thread_stack()
+        top_level = not stack
+        with self._lock:
+            # Registrar la fase al entrar para que el informe siga el orden de ejecución
+            metrics = self.stages.setdefault(name, StageMetrics(name))
+            self._running.append(run)
+        stack.append(run)
+        profiler = self._start_profile() if top_level else None
+        self._record_rss()
+        # En los hilos del pipeline se mide la CPU del hilo: la del proceso incluiría las demás etapas
+        cpu_clock = time.process_time if threading.current_thread() is threading.main_thread() else time.thread_time
+        start_wall, start_cpu = time.perf_counter(), cpu_clock()
+        try:
+            yield run
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = cpu_clock() - start_cpu
+            self._record_rss()
+            stack.pop()
+            if profiler is not None:
+                self._stop_profile(name, profiler)
+            # Varios hilos del pipeline pueden acumular en la misma fase a la vez
+            with self._lock:
+                self._running.remove(run)
+                metrics.calls += 1
+                metrics.wall += wall
+                metrics.cpu += cpu
+                metrics.peak_rss = max(metrics.peak_rss, run.peak_rss)
+                metrics.add_rows('rows_in', run.rows_in)
+                metrics.add_rows('rows_out', run.rows_out)
+
+    def report(self):
+        """Informe de la ejecución como diccionario serializable"""
+        return {
+            'started_at': self.started_at,
+            'wall_seconds': round(self.wall, 6),
+            'cpu_seconds': round(self.cpu, 6),
+            'peak_rss_mb': round(max((m.peak_rss for m in self.stages.values()), default=0) / 1024 ** 2, 2),
+            'stages': [metrics.as_dict() for metrics in self.stages.values()],
+        }
+
+    def write_json(self, path):
+        """Guardar el informe en JSON"""
+        _ensure_parent(path)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def write_prometheus(self, path):
+        """Guardar las métricas en formato de texto de Prometheus (node_exporter textfile)"""
+        lines = []
+        metrics = [
+            ('wall_seconds', 'Tiempo real por fase', 'wall'),
+            ('cpu_seconds', 'Tiempo de CPU por fase', 'cpu'),
+            ('peak_rss_bytes', 'Pico de RSS durante la fase', 'peak_rss'),
+            ('rows_in', 'Filas de entrada por fase', 'rows_in'),
+            ('rows_out', 'Filas de salida por fase', 'rows_out'),
+            ('calls', 'Ejecuciones de la fase', 'calls'),
+        ]
+        for suffix, description, attribute in metrics:
+            name = f"steam_db_etl_stage_{suffix}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+            for stage_metrics in self.stages.values():
+                value = getattr(stage_metrics, attribute)
+                if value is not None:
+                    lines.append(f'{name}{{stage="{stage_metrics.name}"}} {value}')
+        lines.append("# HELP steam_db_etl_run_wall_seconds Tiempo real de la ejecución")
+        lines.append("# TYPE steam_db_etl_run_wall_seconds gauge")
+        lines.append(f"steam_db_etl_run_wall_seconds {self.wall}")
+
+        _ensure_parent(path)
+        # Escritura atómica: el textfile collector puede leer en cualquier momento
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+        return path
+
+    def print_summary(self):
+        """Tabla resumen de las fases"""
+        print(f"\n{'Fase':<32} {'Real (s)':>9} {'CPU (s)':>9} {'RSS (MB)':>9} {'Filas':>10} {'Filas/s':>12}")
+        print("-" * 86)
+        for metrics in self.stages.values():
+            row = metrics.as_dict()
+            rows = row['rows_out'] if row['rows_out'] is not None else row['rows_in']
+            rate = row['rows_per_second']
+            print(f"{metrics.name:<32} {metrics.wall:>9.3f} {metrics.cpu:>9.3f} {row['peak_rss_mb']:>9.1f} "
+                  f"{rows if rows is not None else '-':>10} {f'{rate:,.0f}' if rate else '-':>12}")
+        print(f"{'TOTAL':<32} {self.wall:>9.3f} {self.cpu:>9.3f}")
+
+    def _thread_stack(self):
+        """Fases abiertas en el hilo actual, de la más externa a la más interna"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _sample_rss(self):
+        while not self._stop.wait(self.sample_interval):
+            self._record_rss()
+
+    def _record_rss(self):
+        rss = current_rss()
+        if rss is None:
+            return
+        with self._lock:
+            for run in self._running:
+                run.peak_rss = max(run.peak_rss, rss)
+
+    def _start_profile(self):
+        if not self.profile:
+            return None
+        profiler = {}
+        if 'cprofile' in self.profile:
+            try:
+                profile = cProfile.Profile()
+                profile.enable()
+                profiler['cprofile'] = profile
+            except ValueError:
+                # Python 3.12+ admite un solo perfilador activo: la fase de otro hilo ya lo tiene
+                pass
+        if 'tracemalloc' in self.profile and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            profiler['tracemalloc'] = True
+        return profiler
+
+    def _stop_profile(self, name, profiler):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if 'cprofile' in profiler:
+            profiler['cprofile'].disable()
+            path = os.path.join(self.profile_dir, f"{name}.prof")
+            profiler['cprofile'].dump_stats(path)
+            print(f"Perfil cProfile de '{name}' guardado en {path}")
+        if 'tracemalloc' in profiler:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            path = os.path.join(self.profile_dir, f"{name}.tracemalloc.txt")
+            with open(path, 'w') as f:
+                f.write(f"Pico de memoria Python: {peak / 1024 ** 2:.2f} MB\n\n")
+                for statistic in snapshot.statistics('lineno')[:25]:
+                    f.write(f"{statistic}\n")
+            print(f"Perfil tracemalloc de '{name}' guardado en {path}")
+
+
+def _ensure_parent(path):
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+
+def stage(name, rows_in=None):
+    """Medir un bloque en el monitor activo (no hace nada si no hay ninguno)"""
+    if _active is None:
+        return contextlib.nullcontext(_NullStage())
+    return _active.stage(name, rows_in)
+
+
+def get_monitor():
+    """Monitor activo del proceso, o None"""
+    return _active
@@ -0,0 +1 @@
+# Ejecución de las etapas del ETL en paralelo
@@ -0,0 +1,216 @@
+"""Etapas del ETL en hilos conectados por colas acotadas, con backpressure y cancelación"""
+import queue
+import threading
+import time
+from monitor.steam_dbMonitor import stage as monitor_stage
+
+# Marca de fin de flujo en las colas
+_END = object()
+
+# Cada cuánto (s) se comprueba la cancelación mientras se espera en una cola
+POLL_INTERVAL = 0.1
+
+
+class PipelineCancelled(Exception):
+    """Una etapa se detuvo porque otra falló"""
+
+
+class PipelineError(Exception):
+    """Primer error de una etapa; la excepción original queda en error y en __cause__"""
+
+    def __init__(self, stage, error):
+        super().__init__(f"la etapa '{stage}' falló: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class _Node:
+    """Etapa del pipeline: su función, su cola de entrada y las colas de las siguientes"""
+
+    def __init__(self, name, fn, upstream, is_sink=False):
+        self.name = name
+        self.fn = fn
+        self.upstream = upstream
+        self.is_sink = is_sink
+        self.inbox = None
+        self.outputs = []
+        self.result = None
+        # Estadísticas: bloques y filas recibidos/entregados, tiempo total y esperas en las colas
+        self.items_in = 0
+        self.items_out = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.wall = 0.0
+        self.wait_in = 0.0
+        self.wait_out = 0.0
+
+
+class Pipeline:
+    """Planificador de etapas en hilos con colas acotadas, backpressure y cancelación
+
+    source(): etapa inicial a partir de un iterable de bloques.
+    stage(): fn(iterador de entrada) devuelve un iterable de bloques de salida.
+    sink(): fn(iterador de entrada) consume los bloques; su valor de retorno
+    queda en el diccionario que devuelve run().
+
+    Una etapa con varias siguientes entrega cada bloque a todas; con una cola
+    llena la anterior espera, así que hay como mucho queue_size bloques por
+    cola. Se usan hilos y no procesos: la lectura del CSV, pandas y los
+    drivers liberan el GIL en sus partes costosas y los bloques no se serializan.
+    """
+
+    def __init__(self, queue_size=2, name='pipeline'):
+        if queue_size < 1:
+            raise ValueError("queue_size debe ser al menos 1")
+        self.queue_size = queue_size
+        self.name = name
+        self.nodes = []
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._error = None
+
+    def source(self, name, iterable):
+        return self._add(_Node(name, lambda _: iterable, None))
+
+    def stage(self, name, fn, upstream):
+        return self._add(_Node(name, fn, upstream))
+
+    def sink(self, name, fn, upstream):
+        return self._add(_Node(name, fn, upstream, is_sink=True))
+
+    def _add(self, node):
+        if any(other.name == node.name for other in self.nodes):
+            raise ValueError(f"Etapa duplicada: {node.name}")
+        if node.upstream is not None:
+            if node.upstream not in self.nodes or node.upstream.is_sink:
+                raise ValueError(f"La etapa '{node.name}' debe seguir a una etapa no final de este pipeline")
+            node.inbox = queue.Queue(self.queue_size)
+            node.upstream.outputs.append(node.inbox)
+        self.nodes.append(node)
+        return node
+
+    def cancel(self):
+        """Pedir a todas las etapas que se detengan (en el siguiente bloque)"""
+        self._cancel.set()
+
+    def run(self):
+        """Ejecutar todas las etapas, esperar a que terminen y devolver {sink: resultado}
+
+        Si alguna etapa falla se cancelan las demás y se lanza PipelineError
+        con el primer error.
+        """
+        idle = [node.name for node in self.nodes if not node.is_sink and not node.outputs]
+        if idle:
+            raise ValueError(f"Etapas sin etapas siguientes: {', '.join(idle)}")
+        threads = [threading.Thread(target=self._run_node, args=(node,), name=f"{self.name}-{node.name}", daemon=True)
+                   for node in self.nodes]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            # Ctrl+C en el hilo principal: detener las etapas antes de salir
+            self.cancel()
+            for thread in threads:
+                thread.join()
+            raise
+        if self._error is not None:
+            stage, error = self._error
+            raise PipelineError(stage, error) from error
+        return {node.name: node.result for node in self.nodes if node.is_sink}
+
+    def summary(self):
+        """Líneas con bloques, filas y tiempos por etapa
+
+        La espera de entrada indica que la etapa anterior no da abasto; la de
+        salida, que alguna siguiente va más lenta (backpressure). La etapa con
+        más tiempo ocupado es el cuello de botella.
+        """
+        lines = [f"{'Etapa':<14} {'Bloques':>8} {'Filas':>10} {'Total (s)':>10} {'Ocupada (s)':>12} "
+                 f"{'Esp. entrada':>13} {'Esp. salida':>12}"]
+        for node in self.nodes:
+            items = node.items_out if node.upstream is None else node.items_in
+            rows = node.rows_out if node.upstream is None else node.rows_in
+            busy = max(node.wall - node.wait_in - node.wait_out, 0.0)
+            lines.append(f"{node.name:<14} {items:>8} {rows:>10,} {node.wall:>10.3f} {busy:>12.3f} "
+                         f"{node.wait_in:>13.3f} {node.wait_out:>12.3f}")
+        return lines
+
+    def _run_node(self, node):
+        start = time.perf_counter()
+        with monitor_stage(f"{self.name}.{node.name}") as step:
+            output = None
+            inputs = self._receive(node) if node.inbox is not None else None
+            try:
+                output = node.fn(inputs)
+                if node.is_sink:
+                    node.result = output
+                    # Una etapa final que no consumió todo deja pasar el resto para no bloquear a las anteriores
+                    for _ in inputs:
+                        pass
+                else:
+                    for item in output:
+                        self._send(node, item)
+                    self._send(node, _END)
+            except PipelineCancelled:
+                pass
+            except BaseException as e:
+                self._fail(node, e)
+            finally:
+                # Cerrar los generadores (lectores del CSV) si la etapa se detuvo a medias
+                for generator in (inputs, None if node.is_sink else output):
+                    close = getattr(generator, 'close', None)
+                    if close is not None:
+                        close()
+                node.wall = time.perf_counter() - start
+                step.rows_in = node.rows_in if node.inbox is not None else None
+                step.rows_out = node.rows_out if not node.is_sink else None
+
+    def _fail(self, node, error):
+        with self._lock:
+            # Tras la cancelación los errores de las demás etapas son consecuencia del primero
+            if self._error is None and not self._cancel.is_set():
+                self._error = (node.name, error)
+                print(f"❌ Etapa '{node.name}' falló: {error}; cancelando el pipeline")
+        self._cancel.set()
+
+    def _receive(self, node):
+        """Bloques de la cola de entrada hasta el fin de flujo; PipelineCancelled si se cancela"""
+        while True:
+            start = time.perf_counter()
+            try:
+                item = self._wait(node.inbox.get)
+            finally:
+                node.wait_in += time.perf_counter() - start
+            if item is _END:
+                return
+            node.items_in += 1
+            node.rows_in += _rows(item)
+            yield item
+
+    def _send(self, node, item):
+        """Entregar item a todas las etapas siguientes, esperando si alguna cola está llena"""
+        start = time.perf_counter()
+        try:
+            for inbox in node.outputs:
+                self._wait(lambda **kwargs: inbox.put(item, **kwargs))
+        finally:
+            node.wait_out += time.perf_counter() - start
+        if item is not _END:
+            node.items_out += 1
+            node.rows_out += _rows(item)
+
+    def _wait(self, operation):
+        """Operación bloqueante sobre una cola que se interrumpe al cancelar el pipeline"""
+        while True:
+            if self._cancel.is_set():
+                raise PipelineCancelled(f"pipeline '{self.name}' cancelado")
+            try:
+                return operation(timeout=POLL_INTERVAL)
+            except (queue.Empty, queue.Full):
+                continue
+
+
+def _rows(item):
+    return len(item) if hasattr(item, '__len__') else 0
@@ -1,63 +1,93 @@
-
 import pandas as pd
+from config.esquema import (CATEGORY_COLUMNS, CLEAN_DTYPES, REGIONAL_SALES_COLUMNS,
+                            SALES_COLUMNS, UNKNOWN_VALUE)
+from monitor.steam_dbMonitor import stage
+from transform.steam_dbValidate import (EMPTY_NAME_RULE, SteamDBValidator, merge_quarantine,
+                                        quarantine_frame)
 
 class SteamDBTransform:
-    def __init__(self, df):
+    def __init__(self, df, verbose=True, validate=True, validator=None):
         self.df = df
+        self.verbose = verbose
+        self.validate = validate
+        # Validador compartido entre bloques (claves ya vistas en modo streaming); None = uno nuevo
+        self.validator = validator
+        # Filas descartadas o rechazadas por la validación, con sus motivos, y conteo por regla
+        self.quarantine = merge_quarantine([])
+        self.validation = {}
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
 
     def clean(self):
-        df = self.df.copy()
-        print("Iniciando transformación de datos...")
-        
-        # Asegurar que las columnas de ventas sean numéricas y rellenar nulos con 0
-        sales_cols = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales', 'Global_Sales']
-        for col in sales_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                print(f"Columna {col} convertida a numérico")
-        
-        # Eliminar filas donde el nombre del juego esté vacío o nulo
-        initial_count = len(df)
-        df = df.dropna(subset=['Name'])
-        df = df[df['Name'].str.strip() != '']  # Eliminar nombres vacíos
-        print(f"Eliminadas {initial_count - len(df)} filas con nombres vacíos")
-        
-        # Rellenar valores nulos en texto con 'Unknown'
-        text_cols = ['Platform', 'Genre', 'Publisher']
-        for col in text_cols:
-            if col in df.columns:
-                df[col] = df[col].fillna('Unknown')
-                print(f"Columna {col} rellenada con 'Unknown'")
-        
-        # Asegurar que el año sea numérico y rellenar nulos con 0
-        if 'Year' in df.columns:
-            df['Year'] = pd.to_numeric(df['Year'], errors='coerce').fillna(0).astype(int)
-            print("Columna Year convertida a entero")
-        
-        # Asegurar que Rank sea numérico
-        if 'Rank' in df.columns:
-            df['Rank'] = pd.to_numeric(df['Rank'], errors='coerce').fillna(0).astype(int)
-            print("Columna Rank convertida a entero")
+        """Limpiar el DataFrame aplicando el esquema CLEAN_DTYPES en pocas pasadas vectorizadas"""
+        df = self.df
+        self.log("Iniciando transformación de datos...")
         
-        # Limpiar nombres de juegos (eliminar espacios extra)
-        if 'Name' in df.columns:
-            df['Name'] = df['Name'].str.strip()
-            print("Nombres de juegos limpiados")
+        # Limpiar nombres una sola vez y filtrar nulos/vacíos con una única máscara
+        with stage('transform.names', rows_in=len(df)) as step:
+            names = df['Name'].str.strip()
+            valid = names.notna() & (names != '')
+            dropped = None
+            if not valid.all():
+                # Las filas sin nombre no se pierden: pasan a la cuarentena
+                dropped = quarantine_frame(df[~valid], EMPTY_NAME_RULE)
+                df = df[valid]
+                names = names[valid]
+            step.rows_out = len(df)
+        self.log(f"Eliminadas {len(valid) - len(df)} filas con nombres vacíos")
         
-        # Crear columna de década para análisis
-        if 'Year' in df.columns:
-            df['Decade'] = (df['Year'] // 10) * 10
-            print("Columna Decade creada")
+        with stage('transform.types', rows_in=len(df)) as step:
+            columns = {}
+            for col in df.columns:
+                if col == 'Name':
+                    columns[col] = names
+                elif col in SALES_COLUMNS or col in ('Year', 'Rank'):
+                    # Ventas, año y ranking: numéricos con nulos en 0
+                    values = pd.to_numeric(df[col], errors='coerce').fillna(0)
+                    columns[col] = values.astype(CLEAN_DTYPES[col])
+                elif col in CATEGORY_COLUMNS:
+                    # Texto repetitivo como categoría, con nulos en 'Unknown'
+                    values = df[col].astype('category')
+                    if values.hasnans:
+                        if UNKNOWN_VALUE not in values.cat.categories:
+                            values = values.cat.add_categories(UNKNOWN_VALUE)
+                        values = values.fillna(UNKNOWN_VALUE)
+                    columns[col] = values
+                else:
+                    columns[col] = df[col]
+            step.rows_out = len(df)
+        self.log(f"Columnas convertidas al esquema: {', '.join(c for c in columns if c in CLEAN_DTYPES)}")
         
-        # Crear columna de total de ventas regionales
-        regional_sales = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']
-        df['Total_Regional_Sales'] = df[regional_sales].sum(axis=1)
-        print("Columna Total_Regional_Sales creada")
+        # Columnas derivadas
+        with stage('transform.derived', rows_in=len(df)) as step:
+            if 'Year' in columns:
+                columns['Decade'] = ((columns['Year'] // 10) * 10).astype(CLEAN_DTYPES['Decade'])
+            total_regional = sum(columns[col] for col in REGIONAL_SALES_COLUMNS).astype('float32')
+            columns['Total_Regional_Sales'] = total_regional
+            # Validar que Global_Sales sea consistente con las ventas regionales
+            columns['Sales_Difference'] = (columns['Global_Sales'] - total_regional).abs()
+            
+            df = pd.DataFrame(columns, index=df.index)
+            step.rows_out = len(df)
+        self.log(f"Columnas derivadas creadas: Decade, Total_Regional_Sales, Sales_Difference "
+                 f"(diferencia max: {df['Sales_Difference'].max():.2f})")
         
-        # Validar que Global_Sales sea consistente con las ventas regionales
-        df['Sales_Difference'] = abs(df['Global_Sales'] - df['Total_Regional_Sales'])
-        print(f"Diferencias de ventas calculadas (max: {df['Sales_Difference'].max():.2f})")
+        self.validation = {EMPTY_NAME_RULE: len(valid) - len(df)}
+        rejected = None
+        if self.validate:
+            with stage('transform.validate', rows_in=len(df)) as step:
+                validator = self.validator or SteamDBValidator()
+                df, rejected = validator.validate(df)
+                self.validation.update(validator.counts)
+                step.rows_out = len(df)
+        self.quarantine = merge_quarantine([dropped, rejected])
+        if self.validate:
+            self.log(f"Validación: {len(self.quarantine)} filas en cuarentena")
+            for line in validator.summary(self.validation):
+                self.log(line)
         
         self.df = df
-        print(f"Transformación completada. Registros finales: {len(df)}")
+        self.log(f"Transformación completada. Registros finales: {len(df)}")
         return self.df
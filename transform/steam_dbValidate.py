@@ -0,0 +1,135 @@
+import os
+import numpy as np
+import pandas as pd
+from config.configuraciones import configuracion
+from config.esquema import READ_COLUMNS, REGIONAL_SALES_COLUMNS, SALES_COLUMNS
+
+# Columna con las reglas incumplidas por cada fila en cuarentena (separadas por ';')
+REASONS_COLUMN = 'Reasons'
+
+# Motivo de las filas que SteamDBTransform.clean descarta por no tener nombre
+EMPTY_NAME_RULE = 'empty_name'
+
+# Columnas que se guardan en la cuarentena: las del CSV de origen más los motivos
+QUARANTINE_COLUMNS = READ_COLUMNS + [REASONS_COLUMN]
+
+# Clave natural del dataset: una fila por juego, plataforma y año
+NATURAL_KEY_COLUMNS = ['Name', 'Platform', 'Year']
+
+# Margen para comparar ventas float32 con la tolerancia
+_FLOAT_EPSILON = 1e-6
+
+
+def _sales_sum(df, validator):
+    regional = sum(df[col].to_numpy(dtype='float64') for col in REGIONAL_SALES_COLUMNS)
+    difference = np.abs(df['Global_Sales'].to_numpy(dtype='float64') - regional)
+    return difference > validator.sales_tolerance + _FLOAT_EPSILON
+
+
+def _year_range(df, validator):
+    # Year = 0 es el valor de la limpieza para años desconocidos y se admite
+    year = df['Year'].to_numpy()
+    return (year != 0) & ((year < validator.year_min) | (year > validator.year_max))
+
+
+def _negative_sales(df, validator):
+    return (df[SALES_COLUMNS].to_numpy() < 0).any(axis=1)
+
+
+def _duplicate_key(df, validator):
+    # La primera aparición de la clave se conserva; las siguientes van a cuarentena
+    duplicated = df.duplicated(subset=NATURAL_KEY_COLUMNS, keep='first').to_numpy()
+    if validator.seen_keys is None:
+        return duplicated
+    # Por bloques: también se repiten las claves de bloques anteriores (se guarda un hash de 64 bits por clave)
+    hashes = pd.util.hash_pandas_object(df[NATURAL_KEY_COLUMNS], index=False).to_numpy().tolist()
+    seen = validator.seen_keys
+    repeated = np.fromiter((key in seen for key in hashes), dtype=bool, count=len(hashes))
+    seen.update(hashes)
+    return duplicated | repeated
+
+
+# Reglas de calidad: nombre -> (descripción, función(df, validador) -> máscara de filas que la incumplen)
+VALIDATION_RULES = {
+    'sales_sum': ('Global_Sales difiere de la suma regional más que la tolerancia', _sales_sum),
+    'year_range': ('Año fuera del rango válido', _year_range),
+    'negative_sales': ('Ventas negativas', _negative_sales),
+    'duplicate_key': ('Clave (Name, Platform, Year) repetida', _duplicate_key),
+}
+
+
+class SteamDBValidator:
+    """Validación del DataFrame limpio con reglas declarativas
+
+    Cada regla produce una máscara booleana sobre todo el DataFrame; las
+    máscaras se combinan en una matriz (filas x reglas) de la que salen a la
+    vez las filas válidas, las filas en cuarentena con sus motivos y el conteo
+    por regla, sin recorrer las filas en Python.
+    """
+
+    def __init__(self, rules=None, sales_tolerance=None, year_min=None, year_max=None, seen_keys=None):
+        config = configuracion()
+        self.rules = VALIDATION_RULES if rules is None else rules
+        self.sales_tolerance = config.VALIDATION_SALES_TOLERANCE if sales_tolerance is None else sales_tolerance
+        self.year_min = config.VALIDATION_YEAR_MIN if year_min is None else year_min
+        self.year_max = config.VALIDATION_YEAR_MAX if year_max is None else year_max
+        # Hashes de las claves de validaciones anteriores: pasar un set() para validar por bloques
+        self.seen_keys = seen_keys
+        # Filas que incumplen cada regla en la última validación (una fila puede contar en varias)
+        self.counts = {}
+
+    def validate(self, df):
+        """Separar df en (filas válidas, filas en cuarentena con la columna Reasons)"""
+        names = list(self.rules)
+        if not names or len(df) == 0:
+            self.counts = dict.fromkeys(names, 0)
+            return df, df.iloc[:0].assign(**{REASONS_COLUMN: pd.Series(dtype=object)})
+
+        masks = np.column_stack([self.rules[name][1](df, self) for name in names])
+        self.counts = dict(zip(names, masks.sum(axis=0).tolist()))
+        failing = masks.any(axis=1)
+        if not failing.any():
+            return df, df.iloc[:0].assign(**{REASONS_COLUMN: pd.Series(dtype=object)})
+
+        # Motivos solo de las filas que fallan: una concatenación vectorizada por regla
+        failed = masks[failing]
+        reasons = np.full(len(failed), '', dtype=object)
+        for position, name in enumerate(names):
+            reasons = np.where(failed[:, position], reasons + f"{name};", reasons)
+        quarantine = df[failing].assign(**{REASONS_COLUMN: pd.Series(reasons, index=df.index[failing]).str.rstrip(';')})
+        return df[~failing], quarantine
+
+    def summary(self, counts=None):
+        """Líneas con el conteo de filas por regla"""
+        counts = self.counts if counts is None else counts
+        descriptions = {name: description for name, (description, _) in self.rules.items()}
+        descriptions[EMPTY_NAME_RULE] = 'Nombre vacío o nulo'
+        return [f"  {name:<16} {count:>8,}  {descriptions.get(name, '')}" for name, count in counts.items()]
+
+
+def quarantine_frame(df, reason):
+    """Filas descartadas con un mismo motivo, con las columnas de la cuarentena"""
+    df = df.assign(**{REASONS_COLUMN: reason})
+    return df[[col for col in QUARANTINE_COLUMNS if col in df.columns]]
+
+
+def merge_quarantine(frames):
+    """Unir cuarentenas parciales (bloques, archivos o fases) en un único DataFrame"""
+    frames = [frame[[col for col in QUARANTINE_COLUMNS if col in frame.columns]] for frame in frames if frame is not None]
+    if not frames:
+        return pd.DataFrame(columns=QUARANTINE_COLUMNS)
+    non_empty = [frame for frame in frames if len(frame)]
+    # Categorías distintas entre partes: se unen como texto
+    return pd.concat(non_empty or frames[:1], ignore_index=True).astype({
+        col: object for col in ('Platform', 'Genre', 'Publisher') if col in frames[0].columns
+    })
+
+
+def write_quarantine(df, path, append=False):
+    """Guardar las filas en cuarentena en CSV (append: añadir sin repetir la cabecera)"""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    append = append and os.path.exists(path)
+    df.to_csv(path, mode='a' if append else 'w', header=not append, index=False, na_rep='N/A')
+    return path
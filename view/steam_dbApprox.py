@@ -0,0 +1,197 @@
+"""Informes aproximados de SteamDBView: muestras con márgenes de error y sketches del loader"""
+from statistics import NormalDist
+from sqlalchemy import inspect, text
+from config.importaciones import lazy_import
+from load.steam_dbSchema import DIMENSIONS, FACT_TABLE, SchemaManager
+from load.steam_dbSketches import SalesSketches
+
+pd = lazy_import('pandas')
+
+# Métodos de TABLESAMPLE admitidos en APPROX_SAMPLE_METHOD
+SAMPLE_METHODS = ('system', 'bernoulli')
+
+# Cuantiles de global_sales que se muestran desde el t-digest
+SALES_QUANTILES = [0.25, 0.5, 0.9, 0.99]
+
+# Unidades de muestreo de cada método: páginas enteras (SYSTEM) o filas (BERNOULLI). La varianza se
+# calcula sobre esas unidades porque las filas de una página (cargadas juntas) se parecen entre sí
+SAMPLE_UNITS = {
+    'system': """
+        SELECT {column}_id, COUNT(*) AS n, SUM(global_sales) AS sales,
+               MAX(global_sales) AS max_sales, SUM(year) AS sum_year
+        FROM {fact} TABLESAMPLE SYSTEM (:percent)
+        WHERE {column}_id IS NOT NULL
+        GROUP BY {column}_id, tableoid, (ctid::text::point)[0]
+    """,
+    'bernoulli': """
+        SELECT {column}_id, 1 AS n, global_sales AS sales, global_sales AS max_sales, year AS sum_year
+        FROM {fact} TABLESAMPLE BERNOULLI (:percent)
+        WHERE {column}_id IS NOT NULL
+    """,
+}
+
+# Estadísticos suficientes por grupo sobre las unidades muestreadas
+GROUP_SAMPLE_QUERY = """
+SELECT d.{column} AS {column}, s.n, s.sum_sales, s.sum_n2, s.sum_sales2, s.sum_cross, s.max_sales, s.sum_year
+FROM (
+    SELECT {column}_id,
+           SUM(n) AS n,
+           SUM(sales) AS sum_sales,
+           SUM(n * n) AS sum_n2,
+           SUM(sales * sales) AS sum_sales2,
+           SUM(sales * n) AS sum_cross,
+           MAX(max_sales) AS max_sales,
+           SUM(sum_year) AS sum_year
+    FROM ({units}) units
+    GROUP BY {column}_id
+) s
+JOIN {dimension} d ON d.id = s.{column}_id
+"""
+
+# Filas estimadas de la tabla de hechos (y de sus particiones) según las estadísticas de PostgreSQL
+ESTIMATED_ROWS_QUERY = f"""
+SELECT COALESCE(SUM(reltuples), 0)
+FROM pg_class
+WHERE reltuples > 0
+  AND (oid = '{FACT_TABLE}'::regclass
+       OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = '{FACT_TABLE}'::regclass))
+"""
+
+
+def estimate_groups(stats, fraction, key, confidence=0.95):
+    """Estimaciones por grupo con el margen de error de cada una
+
+    stats: DataFrame con key y los estadísticos de la muestra sobre sus
+    unidades j (filas o páginas): n = Σn_j, sum_sales = Σs_j, sum_n2 = Σn_j²,
+    sum_sales2 = Σs_j², sum_cross = Σs_j·n_j, max_sales y sum_year; fraction:
+    probabilidad de que una unidad esté en la muestra. Para un total,
+    var = (1 - f) / f² · Σs_j²; para la media R se linealiza sobre
+    s_j - R·n_j. max_sales es el máximo de la muestra (cota inferior).
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    n = stats['n'].astype('float64')
+    sales = stats['sum_sales'].astype('float64')
+    squares = stats['sum_sales2'].astype('float64')
+    mean = sales / n
+    residuals = (squares - 2 * mean * stats['sum_cross'].astype('float64')
+                 + mean ** 2 * stats['sum_n2'].astype('float64')).clip(lower=0)
+    df = pd.DataFrame({
+        key: stats[key].astype(object),
+        'total_games': n / fraction,
+        'total_games_err': z * ((1 - fraction) * stats['sum_n2'].astype('float64')) ** 0.5 / fraction,
+        'avg_sales': mean,
+        # Con una sola fila en el grupo no hay dispersión que estimar: sin margen
+        'avg_sales_err': (z * ((1 - fraction) * residuals) ** 0.5 / n).where(n > 1),
+        'max_sales': stats['max_sales'].astype('float64'),
+        'total_sales': sales / fraction,
+        'total_sales_err': z * ((1 - fraction) * squares) ** 0.5 / fraction,
+        'avg_year': stats['sum_year'].astype('float64') / n,
+    })
+    return df.sort_values('total_sales', ascending=False, kind='stable', ignore_index=True)
+
+
+class ApproximateAnalytics:
+    """Versiones aproximadas de los informes que recorren la tabla de hechos
+
+    Cada método devuelve None cuando no tiene sentido aproximar (la muestra
+    sería toda la tabla) o no hay muestra vigente; la vista calcula entonces
+    el informe exacto. Los DataFrames llevan en attrs la fuente, las filas
+    muestreadas y el nivel de confianza.
+    """
+
+    def __init__(self, engine, sample_rows=20000, method='system', confidence=0.95):
+        if method not in SAMPLE_METHODS:
+            raise ValueError(f"Método de muestreo no soportado: {method} (usa {', '.join(SAMPLE_METHODS)})")
+        self.engine = engine
+        self.sample_rows = sample_rows
+        self.method = method
+        self.confidence = confidence
+        # TABLESAMPLE solo en PostgreSQL y sobre la tabla de hechos (migración 6)
+        self.tablesample = (engine.dialect.name == 'postgresql'
+                            and FACT_TABLE in inspect(engine).get_table_names())
+        self._sketches = None
+        self._sketches_generation = None
+
+    def sketches(self):
+        """Sketches del loader si corresponden a la última carga publicada, o None"""
+        generation = SchemaManager(self.engine).load_generation()
+        if self._sketches_generation != generation or generation is None:
+            sketches, stamped = SalesSketches(self.engine).load()
+            # Sketches de otra generación: una carga los dejó a medias o no los actualizó
+            self._sketches = sketches if sketches is not None and stamped == generation else None
+            self._sketches_generation = generation
+        return self._sketches
+
+    def platform_analysis(self):
+        return self._group_analysis('platform')
+
+    def genre_analysis(self):
+        df = self._group_analysis('genre')
+        return df.drop(columns='avg_year') if df is not None else None
+
+    def database_info(self):
+        """Información general desde los sketches: dict con las claves de DATABASE_INFO_QUERY y aproximaciones"""
+        sketches = self.sketches()
+        if sketches is None or sketches.rows == 0:
+            return None
+        return {
+            'total_records': sketches.rows,
+            'min_year': int(sketches.years.min),
+            'max_year': int(sketches.years.max),
+            'min_sales': sketches.sales.min,
+            'max_sales': sketches.sales.max,
+            'avg_sales': sketches.sales.mean,
+            'distinct_games': sketches.names.count(),
+            'distinct_publishers': sketches.publishers.count(),
+            'distinct_relative_error': round(sketches.names.relative_error, 4),
+            'sales_quantiles': {f"p{round(q * 100)}": sketches.sales.quantile(q) for q in SALES_QUANTILES},
+        }
+
+    def _group_analysis(self, column):
+        if self.tablesample:
+            return self._tablesample_groups(column)
+        return self._reservoir_groups(column)
+
+    def _tablesample_groups(self, column):
+        """Agregar en PostgreSQL una muestra de unas sample_rows filas de la tabla de hechos"""
+        sketches = self.sketches()
+        rows = sketches.rows if sketches is not None else self._estimated_rows()
+        if not rows:
+            return None
+        percent = 100.0 * self.sample_rows / rows
+        if percent >= 100:
+            return None
+        units = SAMPLE_UNITS[self.method].format(column=column, fact=FACT_TABLE)
+        query = GROUP_SAMPLE_QUERY.format(column=column, units=units, dimension=DIMENSIONS[column][0])
+        stats = pd.read_sql(text(query), self.engine, params={'percent': percent})
+        df = estimate_groups(stats, percent / 100, column, self.confidence)
+        df.attrs.update(source=f"TABLESAMPLE {self.method.upper()} ({percent:.2f} %)",
+                        sample_rows=int(stats['n'].sum()), confidence=self.confidence)
+        return df
+
+    def _reservoir_groups(self, column):
+        """Agregar la muestra reservoir del loader (cualquier dialecto)"""
+        sketches = self.sketches()
+        if sketches is None or len(sketches.sample) >= sketches.rows:
+            return None
+        sample = sketches.sample_frame()
+        sample = sample[sample[column].notna()]
+        stats = (
+            sample.assign(squares=sample['global_sales'] ** 2)
+            .groupby(column, observed=True)
+            .agg(n=('global_sales', 'size'), sum_sales=('global_sales', 'sum'), sum_sales2=('squares', 'sum'),
+                 max_sales=('global_sales', 'max'), sum_year=('year', 'sum'))
+            .reset_index()
+        )
+        # Cada fila es una unidad de muestreo: Σn_j² = n y Σs_j·n_j = Σs_j
+        stats['sum_n2'] = stats['n']
+        stats['sum_cross'] = stats['sum_sales']
+        fraction = len(sketches.sample) / sketches.rows
+        df = estimate_groups(stats, fraction, column, self.confidence)
+        df.attrs.update(source=f"muestra reservoir del loader ({fraction:.2%})",
+                        sample_rows=len(sketches.sample), confidence=self.confidence)
+        return df
+
+    def _estimated_rows(self):
+        with self.engine.connect() as conn:
+            return int(conn.execute(text(ESTIMATED_ROWS_QUERY)).scalar() or 0)
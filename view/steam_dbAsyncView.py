@@ -0,0 +1,389 @@
+import asyncio
+import sys
+import os
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import InvalidRequestError
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.conexiones import async_url, dispose_async_engines, get_async_engine
+from config.importaciones import lazy_import
+from view.steam_dbView import (SteamDBView, SEARCH_QUERY, DATABASE_INFO_QUERY, GENRE_APPROX_COLUMNS,
+                               PLATFORM_APPROX_COLUMNS)
+
+pd = lazy_import('pandas')
+
+
+class AsyncSteamDBView(SteamDBView):
+    """Variante asyncio de SteamDBView
+
+    Las consultas van por el engine asíncrono de SQLAlchemy (asyncpg en
+    PostgreSQL, aiosqlite en SQLite), cada una con su conexión del pool, de
+    modo que las consultas independientes de un informe se lanzan a la vez con
+    asyncio.gather. Los métodos de informe tienen los mismos nombres que en
+    SteamDBView pero son corrutinas; la caché de resultados se comparte.
+    """
+
+    def __init__(self):
+        self.async_engine = None
+        super().__init__()
+
+    def connect_to_database(self):
+        """Conectar el engine síncrono (esquema, índice de búsqueda) y crear el asíncrono"""
+        if not super().connect_to_database():
+            return False
+        scheme = async_url(self.config.DATABASE_URL).split('://')[0]
+        try:
+            self.async_engine = get_async_engine(self.config.DATABASE_URL)
+        except ImportError:
+            # Sin asyncpg/aiosqlite las consultas se ejecutan en hilos con el engine síncrono
+            driver = scheme.split('+')[-1]
+            print(f"⚠️  Driver asíncrono '{driver}' no instalado (pip install {driver}); "
+                  f"las consultas de la vista asíncrona se ejecutan en hilos")
+        except InvalidRequestError:
+            print(f"⚠️  {scheme} no tiene driver asíncrono configurado; "
+                  f"las consultas de la vista asíncrona se ejecutan en hilos")
+        return True
+
+    async def close(self):
+        """Cerrar las conexiones del engine asíncrono"""
+        await dispose_async_engines()
+        self.async_engine = None
+
+    async def _read_sql_async(self, query, params=None):
+        """pd.read_sql asíncrono a través de la caché de resultados"""
+        async def run():
+            if self.async_engine is None:
+                return await asyncio.to_thread(pd.read_sql, text(query), self.engine, params=params)
+            async with self.async_engine.connect() as conn:
+                return await conn.run_sync(
+                    lambda sync_conn: pd.read_sql(text(query), sync_conn, params=params)
+                )
+        return await self._cached_async(query, params, run)
+
+    async def _execute_async(self, query, params=None, mode='all'):
+        """Versión asíncrona de _execute (modos 'all', 'one' y 'scalar')"""
+        async def run():
+            if self.async_engine is None:
+                return await asyncio.to_thread(self._execute_uncached, query, params, mode)
+            async with self.async_engine.connect() as conn:
+                result = await conn.execute(text(query), params or {})
+                if mode == 'scalar':
+                    return result.scalar()
+                if mode == 'one':
+                    row = result.fetchone()
+                    return tuple(row) if row is not None else None
+                return [tuple(row) for row in result]
+        return await self._cached_async((mode, query), params, run)
+
+    async def _cached_async(self, query, params, run):
+        """Equivalente asíncrono de _cached"""
+        if not self.query_cache.enabled:
+            return await run()
+        
+        now = time.monotonic()
+        if self._cache_checked is None or now - self._cache_checked >= self.config.QUERY_CACHE_TTL:
+            # La generación se marca antes de consultarla para que gather no la pida varias veces
+            self._cache_checked = now
+            self.query_cache.set_generation(await asyncio.to_thread(self._data_generation))
+        
+        key = self.query_cache.make_key(query, params)
+        found, result = self.query_cache.get(key)
+        if not found:
+            result = await run()
+            self.query_cache.put(key, result)
+        return result.copy() if hasattr(result, 'copy') else result
+
+    async def get_all_data(self, limit=None):
+        """Obtener todos los datos de la tabla (o de la caché columnar si no hay conexión)"""
+        try:
+            if not self.engine:
+                return await asyncio.to_thread(super().get_all_data, limit)
+            
+            df = await self._read_sql_async(self._all_data_query(limit))
+            print(f"✅ Datos obtenidos: {len(df)} registros")
+            return df
+        
+        except Exception as e:
+            print(f"❌ Error al obtener datos: {e}")
+            return None
+
+    async def _fetch_basic_stats(self):
+        queries = self._basic_stats_queries()
+        results = await asyncio.gather(*(
+            self._execute_async(query, mode=mode) for query, mode in queries.values()
+        ))
+        return dict(zip(queries, results))
+
+    async def get_basic_stats(self):
+        """Obtener estadísticas básicas de la base de datos (consultas concurrentes)"""
+        try:
+            if not self.engine:
+                return await asyncio.to_thread(super().get_basic_stats)
+            
+            self._print_basic_stats(await self._fetch_basic_stats())
+        
+        except Exception as e:
+            print(f"❌ Error al obtener estadísticas: {e}")
+
+    async def get_platform_analysis(self, approximate=None):
+        """Análisis detallado por plataforma (approximate=None sigue el modo de la vista)"""
+        try:
+            if not self.engine:
+                # Sin base de datos: motor de análisis local en un hilo
+                return await asyncio.to_thread(super().get_platform_analysis, approximate)
+            
+            self.last_approximate = False
+            df = await self._approximate_async(approximate, 'platform_analysis', self.rollups_available)
+            if df is not None:
+                self.last_approximate = True
+                self._print_approximate(df, PLATFORM_APPROX_COLUMNS, "🎮 ANÁLISIS POR PLATAFORMA", 100)
+                return df
+            df = await self._read_sql_async(self._platform_analysis_query())
+            self._print_platform_analysis(df)
+            return df
+        
+        except Exception as e:
+            print(f"❌ Error en análisis de plataformas: {e}")
+            return None
+
+    async def get_genre_analysis(self, approximate=None):
+        """Análisis detallado por género (approximate=None sigue el modo de la vista)"""
+        try:
+            if not self.engine:
+                # Sin base de datos: motor de análisis local en un hilo
+                return await asyncio.to_thread(super().get_genre_analysis, approximate)
+            
+            self.last_approximate = False
+            df = await self._approximate_async(approximate, 'genre_analysis', self.rollups_available)
+            if df is not None:
+                self.last_approximate = True
+                self._print_approximate(df, GENRE_APPROX_COLUMNS, "🎯 ANÁLISIS POR GÉNERO", 90)
+                return df
+            df = await self._read_sql_async(self._genre_analysis_query())
+            self._print_genre_analysis(df)
+            return df
+        
+        except Exception as e:
+            print(f"❌ Error en análisis de géneros: {e}")
+            return None
+
+    async def get_yearly_analysis(self):
+        """Análisis por año"""
+        try:
+            if not self.engine:
+                # Sin base de datos: motor de análisis local en un hilo
+                return await asyncio.to_thread(super().get_yearly_analysis)
+            
+            df = await self._read_sql_async(self._yearly_analysis_query())
+            self._print_yearly_analysis(df)
+            return df
+        
+        except Exception as e:
+            print(f"❌ Error en análisis por año: {e}")
+            return None
+
+    async def search_games(self, search_term, limit=10, fuzzy=True):
+        """Buscar juegos por nombre (índice en memoria o SQL asíncrono si está desactualizado)"""
+        try:
+            index = await asyncio.to_thread(self._get_search_index)
+            if index is not None:
+                df, source, suggestions = self._search_index_lookup(index, search_term, limit, fuzzy)
+            elif self.engine:
+                df = await self._read_sql_async(SEARCH_QUERY, self._search_params(search_term, limit))
+                source, suggestions = "SQL", False
+            else:
+                return None
+            
+            self._print_search_results(df, search_term, source, suggestions)
+            
+            # El índice estaba desactualizado: reconstruirlo para las próximas búsquedas
+            if index is None:
+                await asyncio.to_thread(self._rebuild_search_index)
+            
+            return df
+        
+        except Exception as e:
+            print(f"❌ Error en búsqueda: {e}")
+            return None
+
+    async def get_top_publishers(self, limit=15):
+        """Obtener top publishers por ventas"""
+        try:
+            if not self.engine:
+                return await asyncio.to_thread(super().get_top_publishers, limit)
+            
+            df = await self._read_sql_async(self._top_publishers_query(), {'limit': limit})
+            self._print_top_publishers(df, limit)
+            return df
+        
+        except Exception as e:
+            print(f"❌ Error al obtener publishers: {e}")
+            return None
+
+    async def get_database_info(self, approximate=None):
+        """Obtener información general de la base de datos (approximate=None sigue el modo de la vista)"""
+        try:
+            if not self.engine:
+                return await asyncio.to_thread(super().get_database_info, approximate)
+            
+            self.last_approximate = False
+            info = await self._approximate_async(approximate, 'database_info')
+            if info is not None:
+                self.last_approximate = True
+                self._print_approximate_database_info(info)
+                return
+            self._print_database_info(await self._execute_async(DATABASE_INFO_QUERY, mode='one'))
+        
+        except Exception as e:
+            print(f"❌ Error al obtener información: {e}")
+
+    async def _approximate_async(self, approximate, report, exact_cheap=False):
+        """Informe del motor aproximado en un hilo (usa el engine síncrono), o None si no se aproxima"""
+        def run():
+            backend = self._approximate_backend(approximate, exact_cheap=exact_cheap)
+            return getattr(backend, report)() if backend else None
+        return await asyncio.to_thread(run)
+
+    async def get_overview(self):
+        """Información general y estadísticas básicas, consultadas a la vez"""
+        try:
+            if not self.engine:
+                await self.get_database_info()
+                await self.get_basic_stats()
+                return
+            
+            info, stats = await asyncio.gather(
+                self._execute_async(DATABASE_INFO_QUERY, mode='one'),
+                self._fetch_basic_stats(),
+            )
+            self._print_database_info(info)
+            self._print_basic_stats(stats)
+        
+        except Exception as e:
+            print(f"❌ Error al obtener información: {e}")
+
+    async def get_dashboard(self, publishers_limit=15):
+        """Lanzar todas las consultas de los informes a la vez y mostrarlos en orden
+        
+        El tiempo total es aproximadamente el de la consulta más lenta en lugar
+        de la suma de todas.
+        """
+        try:
+            if not self.engine:
+                # Motor local: los informes son cálculos en memoria, no hay esperas que solapar
+                await self.get_overview()
+                return {
+                    'platforms': await self.get_platform_analysis(),
+                    'genres': await self.get_genre_analysis(),
+                    'years': await self.get_yearly_analysis(),
+                    'publishers': await self.get_top_publishers(publishers_limit),
+                }
+            
+            start = time.perf_counter()
+            info, stats, platforms, genres, years, publishers = await asyncio.gather(
+                self._execute_async(DATABASE_INFO_QUERY, mode='one'),
+                self._fetch_basic_stats(),
+                self._read_sql_async(self._platform_analysis_query()),
+                self._read_sql_async(self._genre_analysis_query()),
+                self._read_sql_async(self._yearly_analysis_query()),
+                self._read_sql_async(self._top_publishers_query(), {'limit': publishers_limit}),
+            )
+            elapsed = time.perf_counter() - start
+            
+            self._print_database_info(info)
+            self._print_basic_stats(stats)
+            self._print_platform_analysis(platforms)
+            self._print_genre_analysis(genres)
+            self._print_yearly_analysis(years)
+            self._print_top_publishers(publishers, publishers_limit)
+            print(f"\n⏱️  Panel completo obtenido en {elapsed * 1000:.1f} ms")
+            return {
+                'platforms': platforms,
+                'genres': genres,
+                'years': years,
+                'publishers': publishers,
+            }
+        
+        except Exception as e:
+            print(f"❌ Error al obtener el panel: {e}")
+            return None
+
+    async def export_to_csv(self, filename=None, fmt=None, compression=None):
+        """Exportar por bloques en un hilo (COPY TO STDOUT o cursor del lado del servidor)"""
+        return await asyncio.to_thread(super().export_to_csv, filename, fmt, compression)
+
+    async def interactive_menu(self):
+        """Menú interactivo para explorar los datos"""
+        while True:
+            choice = self._prompt_menu()
+            
+            if choice == "0":
+                self.get_cache_stats()
+                self.get_pool_metrics()
+                print("👋 ¡Hasta luego!")
+                break
+            elif choice == "1":
+                await self.get_basic_stats()
+            elif choice == "2":
+                await self.get_platform_analysis()
+                if self._offer_exact():
+                    await self.get_platform_analysis(approximate=False)
+            elif choice == "3":
+                await self.get_genre_analysis()
+                if self._offer_exact():
+                    await self.get_genre_analysis(approximate=False)
+            elif choice == "4":
+                await self.get_yearly_analysis()
+            elif choice == "5":
+                search_term = input("Ingresa el término de búsqueda: ").strip()
+                if search_term:
+                    await self.search_games(search_term)
+            elif choice == "6":
+                await self.get_top_publishers()
+            elif choice == "7":
+                limit = input("¿Cuántos registros quieres ver? (Enter para todos, por páginas): ").strip()
+                # Paginación interactiva: cada página espera al usuario, no hay consultas que solapar
+                self.show_data(int(limit) if limit.isdigit() else None)
+            elif choice == "8":
+                await self.get_database_info()
+                if self._offer_exact():
+                    await self.get_database_info(approximate=False)
+            elif choice == "9":
+                filename = input("Nombre del archivo (.csv, .csv.gz, .csv.zst o .parquet; Enter para auto): ").strip()
+                filename = filename if filename else None
+                await self.export_to_csv(filename)
+            elif choice == "a":
+                self._toggle_approximate()
+            else:
+                print("❌ Opción inválida. Intenta de nuevo.")
+            
+            input("\nPresiona Enter para continuar...")
+
+
+async def main_async():
+    """Mostrar el panel con consultas concurrentes y abrir el menú interactivo"""
+    print("🎮 INICIANDO VISTA ASÍNCRONA DE BASE DE DATOS VIDEO GAMES SALES")
+    print("=" * 60)
+
+    view = AsyncSteamDBView()
+    if not view.engine:
+        print("⚠️  No se pudo conectar a la base de datos: se usa el motor de análisis local")
+        if await asyncio.to_thread(view._local_backend) is None:
+            return
+
+    try:
+        await view.get_overview()
+        await view.interactive_menu()
+    finally:
+        await view.close()
+
+
+def main():
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Consultas rápidas desde la línea de comandos: python -m view.steam_dbCli stats|search|top-publishers"""
+import argparse
+import contextlib
+import sys
+import os
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.configuraciones import configuracion
+from view.steam_dbQueryCache import QueryCache
+from view.steam_dbRender import OUTPUT_FORMATS, TableRenderer
+from view.steam_dbView import PUBLISHER_COLUMNS, SEARCH_COLUMNS_TABLE, SEARCH_QUERY, SteamDBView
+
+# Columnas de SEARCH_QUERY en el orden del SELECT (las filas llegan como tuplas)
+SEARCH_QUERY_COLUMNS = ['name', 'platform', 'year', 'genre', 'publisher', 'global_sales']
+
+
+def open_view(fmt):
+    """Vista conectada (o con el motor local) que escribe en el formato pedido"""
+    with contextlib.redirect_stdout(sys.stderr):
+        view = SteamDBView()
+        if not view.engine and view._local_backend() is None:
+            return None
+    # Una sola consulta por llamada: la caché de resultados solo añadiría la comprobación de generación
+    view.query_cache = QueryCache(0)
+    view.renderer = TableRenderer(fmt)
+    return view
+
+
+def stats(view, args):
+    view.get_basic_stats()
+
+
+def search(view, args):
+    if not view.engine:
+        # Sin base de datos: índice de trigramas sobre el dataset local
+        return view.search_games(args.term, args.limit)
+
+    rows = view._execute(SEARCH_QUERY, view._search_params(args.term, args.limit))
+    positions = [SEARCH_QUERY_COLUMNS.index(name) for name, _, _ in SEARCH_COLUMNS_TABLE]
+    rows = [tuple(row[i] for i in positions) for row in rows]
+    if not view.renderer.is_table or rows:
+        view.renderer.table(rows, SEARCH_COLUMNS_TABLE,
+                            banner=["", f"🔍 RESULTADOS DE BÚSQUEDA PARA: '{args.term}' (SQL)", "=" * 80],
+                            rule="-" * 80)
+    else:
+        print(f"❌ No se encontraron juegos con el término: '{args.term}'")
+
+
+def top_publishers(view, args):
+    if not view.engine:
+        return view.get_top_publishers(args.limit)
+
+    rows = view._execute(view._top_publishers_query(), {'limit': args.limit})
+    view.renderer.table(rows, PUBLISHER_COLUMNS,
+                        banner=["", f"🏢 TOP {args.limit} PUBLISHERS POR VENTAS", "=" * 70],
+                        rule="-" * 70)
+
+
+def build_parser():
+    # --format se acepta después del subcomando: `search mario --format json`
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--format', choices=OUTPUT_FORMATS, default=configuracion.VIEW_OUTPUT_FORMAT,
+                        help="Formato de salida (por defecto VIEW_OUTPUT_FORMAT)")
+    parser = argparse.ArgumentParser(prog='steam_dbCli', description="Consultas rápidas sobre video games sales")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('stats', parents=[common],
+                        help="Totales, top plataformas, géneros y juegos").set_defaults(run=stats)
+
+    command = commands.add_parser('search', parents=[common], help="Buscar juegos por nombre")
+    command.add_argument('term')
+    command.add_argument('--limit', type=int, default=10)
+    command.set_defaults(run=search)
+
+    command = commands.add_parser('top-publishers', parents=[common], help="Publishers con más ventas")
+    command.add_argument('--limit', type=int, default=15)
+    command.set_defaults(run=top_publishers)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    view = open_view(args.format)
+    if view is None:
+        print("❌ Sin base de datos ni datos locales para responder la consulta", file=sys.stderr)
+        return 1
+    try:
+        args.run(view, args)
+    except Exception as e:
+        print(f"❌ Error en la consulta: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
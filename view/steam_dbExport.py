@@ -0,0 +1,115 @@
+import gzip
+import os
+import time
+import pandas as pd
+from sqlalchemy import text
+from config.importaciones import lazy_import, module_available
+from load.steam_dbBackup import PYARROW_AVAILABLE, pa, write_parquet_chunks
+
+# Dependencia opcional: la compresión zstd requiere zstandard (Parquet, pyarrow)
+ZSTD_AVAILABLE = module_available('zstandard')
+zstandard = lazy_import('zstandard') if ZSTD_AVAILABLE else None
+
+EXPORT_QUERY = "SELECT * FROM video_games_sales ORDER BY id"
+
+# Extensión del archivo -> compresión
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+
+class SteamDBExporter:
+    """Exportación de video_games_sales por bloques con memoria constante
+
+    En PostgreSQL el CSV se escribe con COPY ... TO STDOUT directamente al
+    archivo; en el resto de casos (Parquet, otros dialectos) se recorre la
+    tabla con un cursor del lado del servidor y se escribe bloque a bloque.
+    """
+
+    def __init__(self, engine, chunk_size=50000):
+        self.engine = engine
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def detect_format(filename, fmt=None, compression=None):
+        """Deducir (formato, compresión) de la extensión del archivo si no se indican"""
+        root, extension = os.path.splitext(filename.lower())
+        if compression is None and extension in COMPRESSION_EXTENSIONS:
+            compression = COMPRESSION_EXTENSIONS[extension]
+            root, extension = os.path.splitext(root)
+        if fmt is None:
+            fmt = 'parquet' if extension == '.parquet' else 'csv'
+        return fmt, compression
+
+    def export(self, filename, fmt=None, compression=None):
+        """Escribir la tabla en filename y devolver el número de registros exportados
+
+        fmt: 'csv' o 'parquet'; compression: None, 'gzip' o 'zstd' (solo CSV;
+        Parquet usa compresión zstd interna por columna).
+        """
+        fmt, compression = self.detect_format(filename, fmt, compression)
+        start = time.perf_counter()
+        if fmt == 'parquet':
+            rows = self._write_parquet(filename)
+        else:
+            with self._open_output(filename, compression) as output:
+                if self.engine.dialect.name == 'postgresql':
+                    rows = self._copy_to(output)
+                else:
+                    rows = self._write_csv(output)
+        elapsed = time.perf_counter() - start
+        rate = rows / elapsed if elapsed > 0 else float('inf')
+        print(f"Exportados {rows:,} registros a {filename} ({fmt}"
+              f"{', ' + compression if compression else ''}) en {elapsed:.2f}s ({rate:,.0f} filas/s)")
+        return rows
+
+    def iter_chunks(self, query=EXPORT_QUERY):
+        """Recorrer el resultado por bloques con un cursor del lado del servidor"""
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=self.chunk_size)
+            yield from pd.read_sql(text(query), conn, chunksize=self.chunk_size)
+
+    def _open_output(self, filename, compression):
+        """Abrir el archivo de salida en binario con la compresión indicada"""
+        if compression is None:
+            return open(filename, 'wb')
+        if compression == 'gzip':
+            return gzip.open(filename, 'wb')
+        if compression == 'zstd':
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("La compresión zstd requiere el paquete 'zstandard'")
+            return zstandard.ZstdCompressor().stream_writer(open(filename, 'wb'), closefd=True)
+        raise ValueError(f"Compresión no soportada: {compression}")
+
+    def _copy_to(self, output):
+        """COPY ... TO STDOUT de PostgreSQL escrito directamente en output"""
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.copy_expert(f"COPY ({EXPORT_QUERY}) TO STDOUT WITH (FORMAT csv, HEADER)", output)
+            rows = cursor.rowcount
+            raw_conn.commit()
+            return rows
+        finally:
+            raw_conn.close()
+
+    def _write_csv(self, output):
+        rows = 0
+        for chunk in self.iter_chunks():
+            output.write(chunk.to_csv(index=False, header=rows == 0).encode('utf-8'))
+            rows += len(chunk)
+        if rows == 0:
+            # Tabla vacía: dejar al menos la cabecera
+            header = pd.read_sql(text(f"{EXPORT_QUERY} LIMIT 0"), self.engine)
+            output.write(header.to_csv(index=False).encode('utf-8'))
+        return rows
+
+    def _write_parquet(self, filename):
+        """Escribir cada bloque como un row group de Parquet"""
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("La exportación a Parquet requiere pyarrow")
+        rows = write_parquet_chunks(filename, self.iter_chunks())
+        if rows == 0:
+            # Tabla vacía: dejar un archivo con el esquema de la consulta
+            import pyarrow.parquet as pq
+            header = pd.read_sql(text(f"{EXPORT_QUERY} LIMIT 0"), self.engine)
+            pq.write_table(pa.Table.from_pandas(header, preserve_index=False), filename)
+        return rows
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from config.esquema import COLUMN_MAPPING, UNKNOWN_VALUE
+
+
+class LocalAnalytics:
+    """Informes de SteamDBView calculados en memoria, sin base de datos
+
+    Trabaja sobre el DataFrame limpio (caché columnar o CSV transformado) con
+    group-bys de pandas sobre las columnas categóricas. Cada método devuelve
+    lo mismo que la consulta SQL equivalente de la vista (mismas columnas y
+    orden), de modo que los informes se imprimen con el mismo código.
+    """
+
+    def __init__(self, df):
+        df = df.rename(columns=COLUMN_MAPPING)
+        # Las agregaciones se hacen en float64, como SUM/AVG en la base de datos
+        self.sales = df['global_sales'].to_numpy(dtype='float64')
+        self.df = df
+
+    def __len__(self):
+        return len(self.df)
+
+    def database_info(self):
+        """Fila de DATABASE_INFO_QUERY: (total, año min, año max, ventas min, max y media)"""
+        if len(self.df) == 0:
+            return (0, None, None, None, None, None)
+        year = self.df['year']
+        return (len(self.df), int(year.min()), int(year.max()),
+                float(self.sales.min()), float(self.sales.max()), float(self.sales.mean()))
+
+    def basic_stats(self):
+        """Resultados de get_basic_stats con la misma forma que _basic_stats_queries"""
+        top = np.argsort(-self.sales, kind='stable')[:10]
+        top_games = self.df.iloc[top]
+        return {
+            'total_records': len(self.df),
+            'platform_stats': self._value_counts('platform'),
+            'genre_stats': self._value_counts('genre'),
+            'top_games': list(zip(top_games['name'], top_games['platform'],
+                                  self.sales[top], top_games['year'])),
+        }
+
+    def platform_analysis(self):
+        df = self._aggregate('platform', with_year=True)
+        return df[['platform', 'total_games', 'avg_sales', 'max_sales', 'total_sales', 'avg_year']]
+
+    def genre_analysis(self):
+        df = self._aggregate('genre')
+        return df[['genre', 'total_games', 'avg_sales', 'max_sales', 'total_sales']]
+
+    def yearly_analysis(self, limit=20):
+        df = self._aggregate('year', mask=self.df['year'].to_numpy() > 0)
+        df = df.sort_values('year', ascending=False).head(limit).reset_index(drop=True)
+        return df[['year', 'total_games', 'avg_sales', 'total_sales']]
+
+    def top_publishers(self, limit=15):
+        publisher = self.df['publisher']
+        df = self._aggregate('publisher', mask=(publisher.notna() & (publisher != UNKNOWN_VALUE)).to_numpy())
+        return df.head(limit)[['publisher', 'total_games', 'total_sales', 'avg_sales']]
+
+    def _value_counts(self, column):
+        """Top 10 (valor, conteo) de una columna, como GROUP BY ... ORDER BY count DESC LIMIT 10"""
+        counts = self.df[column].value_counts(sort=True)
+        return [(value, int(count)) for value, count in counts.head(10).items() if count > 0]
+
+    def _aggregate(self, column, mask=None, with_year=False):
+        """COUNT/AVG/MAX/SUM de global_sales agrupado por column, ordenado por ventas totales"""
+        keys = self.df[column]
+        sales = pd.Series(self.sales, index=self.df.index)
+        if mask is not None:
+            keys, sales = keys[mask], sales[mask]
+        grouped = sales.groupby(keys, observed=True, sort=False)
+        df = pd.DataFrame({
+            'total_games': grouped.size(),
+            'avg_sales': grouped.mean(),
+            'max_sales': grouped.max(),
+            'total_sales': grouped.sum(),
+        })
+        if with_year:
+            years = self.df['year'].astype('float64')
+            df['avg_year'] = (years[mask] if mask is not None else years).groupby(keys, observed=True).mean()
+        df.index = df.index.astype(object)
+        return df.rename_axis(column).reset_index().sort_values('total_sales', ascending=False, kind='stable',
+                                                               ignore_index=True)
@@ -0,0 +1,88 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+class QueryCache:
+    """Caché LRU de resultados de consultas con límite de memoria
+    
+    La clave es el texto SQL más los parámetros. Las entradas se invalidan en
+    bloque cuando cambia la generación de carga que publica el loader.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(query, params=None):
+        return (' '.join(str(query).split()), tuple(sorted((params or {}).items())))
+
+    def get(self, key):
+        """Devolver (True, resultado) si la clave está en caché, o (False, None)"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        """Guardar un resultado expulsando los menos usados si se supera el límite"""
+        size = self._estimate_size(value)
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def set_generation(self, generation):
+        """Vaciar la caché si la generación de carga cambió"""
+        with self._lock:
+            if generation != self.generation:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.bytes = 0
+                self.generation = generation
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'generation': self.generation,
+            }
+
+    @staticmethod
+    def _estimate_size(value):
+        """Tamaño aproximado en bytes de un DataFrame o de una lista de filas"""
+        if hasattr(value, 'memory_usage'):
+            return int(value.memory_usage(deep=True).sum())
+        if isinstance(value, (list, tuple)):
+            return sys.getsizeof(value) + sum(sys.getsizeof(row) for row in value)
+        return sys.getsizeof(value)
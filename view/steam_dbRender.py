@@ -0,0 +1,203 @@
+import csv
+import io
+import json
+import re
+import sys
+from decimal import Decimal
+from config.importaciones import lazy_import
+
+# pandas solo se carga al formatear un DataFrame: las filas de la CLI son tuplas
+pd = lazy_import('pandas')
+
+# Formatos de salida de la vista: tabla para personas, JSON/CSV para scripts
+OUTPUT_FORMATS = ('table', 'json', 'csv')
+
+# Alineación y ancho al principio de un format spec ('<12.2f' -> '<', '12')
+_ALIGN_WIDTH = re.compile(r'([<>^]?)(\d*)')
+
+
+def format_column(values, spec):
+    """Formatear una columna entera con un format spec de Python ('<12.2f', '<8,', ...)
+
+    values puede ser una Serie o una lista (filas de una consulta, sin pandas).
+    Los nulos se rellenan con espacios hasta el ancho del spec.
+    """
+    if isinstance(values, (list, tuple)):
+        template = '{:' + spec + '}'
+        align, width = _ALIGN_WIDTH.match(spec).groups()
+        blank = format('', f"{align}{width}")
+        return [blank if value is None else template.format(value) for value in values]
+    values = pd.Series(values)
+    template = '{:' + spec + '}'
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        # Texto, categorías y fechas se formatean como cadenas (Timestamp interpreta el spec como strftime)
+        texts = values.astype(object).where(values.notna(), '').astype(str)
+        return list(map(template.format, texts.tolist()))
+    nulls = values.isna().to_numpy()
+    if not nulls.any():
+        return list(map(template.format, values.tolist()))
+    align, width = _ALIGN_WIDTH.match(spec).groups()
+    blank = format('', f"{align}{width}")
+    return [blank if null else template.format(value) for value, null in zip(values.tolist(), nulls)]
+
+
+def header_spec(spec):
+    """Spec de la cabecera: solo la alineación y el ancho de la columna"""
+    align, width = _ALIGN_WIDTH.match(spec).groups()
+    return f"{align or '<'}{width}"
+
+
+def auto_columns(df, float_precision=2):
+    """Columnas (nombre, cabecera, spec) para un DataFrame cualquiera, con el ancho de su contenido"""
+    columns = []
+    for name in df.columns:
+        values = df[name]
+        width = len(str(name))
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            # El texto más ancho de una columna numérica es el de su mínimo o su máximo
+            spec = f".{float_precision}f" if pd.api.types.is_float_dtype(values) else ''
+            extremes = values.dropna()
+            if len(extremes):
+                width = max(width, *(len(format(value, spec)) for value in (extremes.min(), extremes.max())))
+            columns.append((name, str(name), f">{width}{spec}"))
+        else:
+            lengths = values.astype(object).where(values.notna(), '').astype(str).str.len()
+            if len(lengths):
+                width = max(width, int(lengths.max()))
+            columns.append((name, str(name), f"<{width}"))
+    return columns
+
+
+class TableRenderer:
+    """Salida de los informes de la vista
+
+    En formato 'table' cada columna se formatea de una vez (sin iterrows) y el
+    informe completo se escribe con una sola llamada a write; en 'json' y
+    'csv' se escriben los datos sin adornos para consumirlos desde scripts.
+    """
+
+    def __init__(self, fmt='table', out=None):
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Formato de salida no soportado: {fmt} (usa {', '.join(OUTPUT_FORMATS)})")
+        self.fmt = fmt
+        self._out = out
+
+    @property
+    def out(self):
+        # sys.stdout se resuelve al escribir para respetar redirect_stdout
+        return self._out or sys.stdout
+
+    @property
+    def is_table(self):
+        return self.fmt == 'table'
+
+    def write(self, lines):
+        """Escribir varias líneas con una sola llamada"""
+        self.out.write('\n'.join(lines) + '\n')
+
+    def table_lines(self, df, columns, separator=' '):
+        """Cabecera y filas ya formateadas; columns: [(columna, cabecera, spec)]
+
+        df es un DataFrame o una lista de tuplas con los valores en el orden de columns.
+        """
+        header = separator.join(format(title, header_spec(spec)) for _, title, spec in columns)
+        if len(df) == 0:
+            return header, []
+        if _is_frame(df):
+            formatted = [format_column(df[name], spec) for name, _, spec in columns]
+        else:
+            formatted = [format_column(list(values), spec) for values, (_, _, spec) in zip(zip(*df), columns)]
+        return header, [separator.join(parts) for parts in zip(*formatted)]
+
+    def table(self, df, columns, banner=(), rule=None, name=None):
+        """Escribir df como tabla precedida de banner (o como JSON/CSV según el formato)"""
+        if not self.is_table:
+            if not _is_frame(df):
+                # Tuplas de una consulta: registros con los nombres de columns
+                names = [column for column, _, _ in columns]
+                df = [dict(zip(names, row)) for row in df]
+            self.data(df, name)
+            return
+        header, rows = self.table_lines(df, columns)
+        self.write(list(banner) + [header] + ([rule] if rule else []) + rows)
+
+    def data(self, value, name=None):
+        """Escribir un resultado en JSON o CSV
+
+        value puede ser un DataFrame, un diccionario (secciones con DataFrames o
+        escalares) o un escalar.
+        """
+        if self.fmt == 'csv':
+            self.out.write(self._to_csv(value, name))
+        else:
+            self.out.write(json.dumps(self._to_json(value), ensure_ascii=False, default=_json_default) + '\n')
+
+    def pages(self, chunks, columns=None, prompt=None):
+        """Escribir un resultado por páginas a medida que se leen los bloques
+
+        chunks: iterable de DataFrames (se consume de forma perezosa). En modo
+        tabla, prompt() se llama entre páginas y, si devuelve False, se deja de
+        leer. En JSON se escribe un registro por línea (JSON Lines) y en CSV la
+        cabecera solo con la primera página. Devuelve las filas escritas.
+        """
+        rows = 0
+        for page in chunks:
+            if rows and self.is_table and prompt is not None and not prompt():
+                break
+            if self.is_table:
+                # Los anchos se fijan con la primera página para que todas queden alineadas
+                columns = columns or auto_columns(page)
+                header, lines = self.table_lines(page, columns)
+                self.write([header, '-' * len(header)] + lines)
+            elif self.fmt == 'csv':
+                self.out.write(page.to_csv(index=False, header=rows == 0))
+            else:
+                if len(page):
+                    self.out.write(page.to_json(orient='records', lines=True, force_ascii=False,
+                                                date_format='iso').rstrip('\n') + '\n')
+            rows += len(page)
+        return rows
+
+    def _to_json(self, value):
+        if _is_frame(value):
+            return json.loads(value.to_json(orient='records', force_ascii=False, date_format='iso'))
+        if isinstance(value, dict):
+            return {key: self._to_json(item) for key, item in value.items()}
+        return value.item() if hasattr(value, 'item') else value
+
+    def _to_csv(self, value, name=None):
+        if _is_frame(value):
+            return value.to_csv(index=False)
+        if isinstance(value, list):
+            # Registros (diccionarios) sin pasar por pandas
+            buffer = io.StringIO()
+            if value:
+                writer = csv.DictWriter(buffer, fieldnames=list(value[0]), lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(value)
+            return buffer.getvalue()
+        if isinstance(value, dict):
+            # Una sección por clave: los escalares se agrupan en una tabla clave,valor
+            scalars = {key: item for key, item in value.items() if not (_is_frame(item) or isinstance(item, (list, dict)))}
+            parts = []
+            if scalars:
+                parts.append(self._to_csv([{'key': key, 'value': item} for key, item in scalars.items()]))
+            for key, item in value.items():
+                if key not in scalars:
+                    parts.append(f"# {key}\n{self._to_csv(item, key)}")
+            return '\n'.join(parts)
+        return f"{name or 'value'}\n{value}\n"
+
+
+def _is_frame(value):
+    # Comprobación sin isinstance para no importar pandas al formatear tuplas
+    return hasattr(value, 'columns') and hasattr(value, 'to_csv')
+
+
+def _json_default(value):
+    # DECIMAL de PostgreSQL y escalares de NumPy
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
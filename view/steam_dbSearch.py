@@ -0,0 +1,119 @@
+import os
+import pickle
+from functools import reduce
+import numpy as np
+
+SEARCH_COLUMNS = ['name', 'platform', 'year', 'genre', 'publisher', 'global_sales']
+INDEX_VERSION = 1
+
+
+def trigrams(text):
+    """Trigramas de un texto en minúsculas"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class GameSearchIndex:
+    """Índice invertido de trigramas sobre los nombres de los juegos
+    
+    Las filas se guardan ordenadas por global_sales descendente, así que las
+    posiciones de cada lista de trigramas ya vienen ordenadas por ventas y una
+    búsqueda puede parar en cuanto tiene `limit` resultados.
+    """
+
+    def __init__(self, df, signature=None):
+        data = df[SEARCH_COLUMNS].copy()
+        data['global_sales'] = data['global_sales'].astype('float64')
+        self.data = data.sort_values('global_sales', ascending=False, kind='stable').reset_index(drop=True)
+        self.names = self.data['name'].astype(str).str.lower().to_numpy(dtype=object)
+        self.signature = signature
+        self.postings, self.gram_counts = self._build_postings()
+
+    def _build_postings(self):
+        postings = {}
+        gram_counts = np.zeros(len(self.names), dtype=np.int32)
+        for position, name in enumerate(self.names):
+            grams = trigrams(name)
+            gram_counts[position] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        return {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}, gram_counts
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, term, limit=10):
+        """Juegos cuyo nombre contiene `term` (sin distinguir mayúsculas), ordenados por ventas"""
+        term = term.strip().lower()
+        if not term:
+            return self.data.iloc[[]]
+        
+        if len(term) < 3:
+            # Términos cortos: recorrido en orden de ventas con salida temprana
+            candidates = range(len(self.names))
+        else:
+            lists = [self.postings.get(gram) for gram in trigrams(term)]
+            if any(positions is None for positions in lists):
+                return self.data.iloc[[]]
+            lists.sort(key=len)
+            candidates = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), lists)
+        
+        # Los trigramas no garantizan el orden de los caracteres: verificar la subcadena
+        matches = []
+        for position in candidates:
+            if term in self.names[position]:
+                matches.append(position)
+                if len(matches) == limit:
+                    break
+        return self.data.iloc[matches]
+
+    def fuzzy_search(self, term, limit=10, min_similarity=0.3):
+        """Juegos con nombre parecido a `term`
+        
+        La puntuación es la fracción de trigramas de `term` presentes en el
+        nombre (contención), así que una errata en parte de un título largo
+        también encuentra el título; a igual contención se prefiere la mayor
+        similitud de Jaccard (nombres más parecidos en longitud) y luego las ventas.
+        """
+        grams = trigrams(term.strip().lower())
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return self.data.iloc[[]]
+        
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.names))
+        candidates = np.flatnonzero(shared)
+        containment = shared[candidates] / len(grams)
+        keep = containment >= min_similarity
+        candidates, containment = candidates[keep], containment[keep]
+        common = shared[candidates]
+        jaccard = common / (len(grams) + self.gram_counts[candidates] - common)
+        
+        # Mayor contención primero; después Jaccard y, a igualdad, más ventas (menor posición)
+        order = np.lexsort((candidates, -jaccard, -containment))[:limit]
+        return self.data.iloc[candidates[order]]
+
+    def save(self, path):
+        """Serializar el índice para no reconstruirlo en cada arranque"""
+        with open(path, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'index': self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, signature=None):
+        """Leer un índice serializado; None si no existe, es de otra versión o está desactualizado
+        
+        El archivo se lee con pickle, que puede ejecutar código al deserializar:
+        SEARCH_INDEX_PATH debe apuntar a un archivo escrito por save() en un
+        directorio de confianza.
+        """
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+        if not isinstance(payload, dict) or payload.get('version') != INDEX_VERSION:
+            return None
+        index = payload['index']
+        if not isinstance(index, cls):
+            return None
+        if signature is not None and index.signature != signature:
+            return None
+        return index
+
@@ -1,33 +1,128 @@
-import pandas as pd
 import sys
 import os
-from sqlalchemy import create_engine, text
+import time
+from sqlalchemy import inspect, text
 from datetime import datetime
 
 # Agregar el directorio raíz al path para importaciones
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.configuraciones import configuracion
+from config.conexiones import get_engine, get_pool_metrics
+from config.esquema import COLUMN_MAPPING
+from config.importaciones import lazy_import, module_available
+from load.steam_dbRollups import ROLLUPS
+from load.steam_dbSchema import SchemaManager
+from view.steam_dbQueryCache import QueryCache
+from view.steam_dbRender import TableRenderer
 
-# Importaciones opcionales para visualización
-try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    VISUALIZATION_AVAILABLE = True
-except ImportError:
-    VISUALIZATION_AVAILABLE = False
-    print("⚠️  Matplotlib/Seaborn no disponibles. Funcionalidad básica disponible.")
+# pandas se carga en la primera consulta que lo necesita; la exportación, la
+# caché columnar, el motor local y el índice de búsqueda se importan al usarse
+pd = lazy_import('pandas')
+
+# Visualización opcional: solo se comprueba si está instalada; matplotlib y
+# seaborn se importarían al dibujar un gráfico, no al abrir la vista
+VISUALIZATION_AVAILABLE = module_available('matplotlib') and module_available('seaborn')
+
+SEARCH_QUERY = """
+SELECT name, platform, year, genre, publisher, global_sales
+FROM video_games_sales 
+WHERE LOWER(name) LIKE LOWER(:search_term)
+ORDER BY global_sales DESC
+LIMIT :limit
+"""
+
+DATABASE_INFO_QUERY = """
+SELECT 
+    COUNT(*) as total_records,
+    MIN(year) as min_year,
+    MAX(year) as max_year,
+    MIN(global_sales) as min_sales,
+    MAX(global_sales) as max_sales,
+    AVG(global_sales) as avg_sales
+FROM video_games_sales
+"""
+DATABASE_INFO_COLUMNS = ['total_records', 'min_year', 'max_year', 'min_sales', 'max_sales', 'avg_sales']
+
+# Columnas de cada informe en formato tabla: (columna, cabecera, format spec)
+PLATFORM_COLUMNS = [
+    ('platform', 'Plataforma', '<15'),
+    ('total_games', 'Juegos', '<8,'),
+    ('avg_sales', 'Ventas Avg', '<12.2f'),
+    ('max_sales', 'Ventas Max', '<12.2f'),
+    ('total_sales', 'Ventas Total', '<15.2f'),
+    ('avg_year', 'Año Avg', '<8.0f'),
+]
+GENRE_COLUMNS = [
+    ('genre', 'Género', '<15'),
+    ('total_games', 'Juegos', '<8,'),
+    ('avg_sales', 'Ventas Avg', '<12.2f'),
+    ('max_sales', 'Ventas Max', '<12.2f'),
+    ('total_sales', 'Ventas Total', '<15.2f'),
+]
+YEARLY_COLUMNS = [
+    ('year', 'Año', '<6'),
+    ('total_games', 'Juegos', '<8,'),
+    ('avg_sales', 'Ventas Avg', '<12.2f'),
+    ('total_sales', 'Ventas Total', '<15.2f'),
+]
+SEARCH_COLUMNS_TABLE = [
+    ('name', 'Nombre', '<30'),
+    ('platform', 'Plataforma', '<12'),
+    ('year', 'Año', '<6'),
+    ('genre', 'Género', '<12'),
+    ('global_sales', 'Ventas', '<8.2f'),
+]
+# Informes aproximados: cada estimación con su margen (± al nivel APPROX_CONFIDENCE)
+PLATFORM_APPROX_COLUMNS = [
+    ('platform', 'Plataforma', '<15'),
+    ('total_games', 'Juegos', '<9,.0f'),
+    ('total_games_err', '±', '<8,.0f'),
+    ('avg_sales', 'Ventas Avg', '<11.2f'),
+    ('avg_sales_err', '±', '<7.2f'),
+    ('max_sales', 'Máx (≥)', '<9.2f'),
+    ('total_sales', 'Ventas Total', '<13.2f'),
+    ('total_sales_err', '±', '<10.2f'),
+    ('avg_year', 'Año Avg', '<8.0f'),
+]
+GENRE_APPROX_COLUMNS = [
+    ('genre', 'Género', '<15'),
+    ('total_games', 'Juegos', '<9,.0f'),
+    ('total_games_err', '±', '<8,.0f'),
+    ('avg_sales', 'Ventas Avg', '<11.2f'),
+    ('avg_sales_err', '±', '<7.2f'),
+    ('max_sales', 'Máx (≥)', '<9.2f'),
+    ('total_sales', 'Ventas Total', '<13.2f'),
+    ('total_sales_err', '±', '<10.2f'),
+]
+PUBLISHER_COLUMNS = [
+    ('publisher', 'Publisher', '<25'),
+    ('total_games', 'Juegos', '<8,'),
+    ('total_sales', 'Ventas Total', '<15.2f'),
+    ('avg_sales', 'Ventas Avg', '<12.2f'),
+]
 
 class SteamDBView:
     def __init__(self):
         self.config = configuracion()
         self.engine = None
+        self.rollups_available = False
+        self.local = None
+        self._search_index = None
+        self._search_checked = 0.0
+        self.query_cache = QueryCache(int(self.config.QUERY_CACHE_MAX_MB * 1024 * 1024))
+        self._cache_checked = None
+        self.renderer = TableRenderer(self.config.VIEW_OUTPUT_FORMAT)
+        # Modo aproximado: respuestas por muestreo y sketches; last_approximate indica si el último informe lo fue
+        self.approximate = self.config.VIEW_APPROXIMATE
+        self.approx = None
+        self.last_approximate = False
         self.connect_to_database()
 
     def connect_to_database(self):
         """Conectar a la base de datos"""
         try:
-            if not all([self.config.DB_HOST, self.config.DB_PORT, self.config.DB_NAME, 
+            if not self.config.DB_URL and not all([self.config.DB_HOST, self.config.DB_PORT, self.config.DB_NAME, 
                        self.config.DB_USER, self.config.DB_PASSWORD]):
                 print("❌ Error: Faltan credenciales de base de datos en el archivo .env")
                 print("Asegúrate de tener configurado:")
@@ -38,31 +133,91 @@ class SteamDBView:
                 print("- DB_PASSWORD")
                 return False
             
-            self.engine = create_engine(self.config.DATABASE_URL)
+            self.engine = get_engine(self.config.DATABASE_URL)
             
             # Probar la conexión
             with self.engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
             
             print("✅ Conexión a la base de datos establecida")
+            
+            # Las tablas de resumen las mantiene el loader; sin ellas se agrega la tabla de hechos
+            tables = set(inspect(self.engine).get_table_names())
+            self.rollups_available = all(table in tables for table in ROLLUPS)
             return True
             
         except Exception as e:
             print(f"❌ Error al conectar a la base de datos: {e}")
+            # Sin servidor no se deja un engine a medias: los informes pasan al motor local
+            self.engine = None
             return False
 
+    def load_offline_data(self):
+        """Leer el dataset limpio desde la caché columnar o, si no está vigente, limpiando el CSV de origen
+        
+        Una caché desactualizada solo se usa si el CSV de origen ya no se puede leer.
+        """
+        from extract.steam_dbCache import SteamDBCache
+        
+        try:
+            cache = SteamDBCache(self.config.INPUT_PATH, self.config.CACHE_PATH)
+            cached = cache.enabled and os.path.exists(cache.cache_path)
+            if cache.enabled and cache.is_valid():
+                df = cache.read()
+                source = cache.cache_path
+            else:
+                df = self._clean_input()
+                if df is not None:
+                    source = self.config.INPUT_PATH
+                    # Guardar la caché para que la próxima sesión offline no repita la limpieza
+                    cache.save(df)
+                elif cached:
+                    print(f"⚠️  CSV de origen no legible: se usa la caché desactualizada {cache.cache_path}")
+                    df = cache.read()
+                    source = cache.cache_path
+                else:
+                    print("❌ No hay caché columnar ni CSV de origen legible")
+                    return None
+            
+            df = df.rename(columns=COLUMN_MAPPING)
+            print(f"✅ Datos offline cargados desde {source}: {len(df)} registros")
+            return df
+            
+        except Exception as e:
+            print(f"❌ Error al leer los datos offline: {e}")
+            return None
+
+    def _clean_input(self):
+        """Extraer y limpiar INPUT_PATH con las mismas fases que el ETL"""
+        from extract.steam_dbExtract import SteamDBExtractor
+        from transform.steam_dbTransform import SteamDBTransform
+        
+        df = SteamDBExtractor(self.config.INPUT_PATH).extract()
+        if df is None:
+            return None
+        return SteamDBTransform(df, verbose=False).clean()
+
+    def _local_backend(self):
+        """Motor de análisis en memoria (se crea la primera vez que se usa sin base de datos)"""
+        from view.steam_dbLocal import LocalAnalytics
+        
+        if self.local is None:
+            df = self.load_offline_data()
+            if df is None:
+                return None
+            self.local = LocalAnalytics(df)
+        return self.local
+
     def get_all_data(self, limit=None):
-        """Obtener todos los datos de la tabla"""
+        """Obtener todos los datos de la tabla (o de la caché columnar si no hay conexión)"""
         try:
             if not self.engine:
-                print("❌ No hay conexión a la base de datos")
-                return None
+                local = self._local_backend()
+                if local is None:
+                    return None
+                return local.df.head(limit).copy() if limit else local.df.copy()
             
-            query = "SELECT * FROM video_games_sales"
-            if limit:
-                query += f" LIMIT {limit}"
-            
-            df = pd.read_sql(query, self.engine)
+            df = self._read_sql(self._all_data_query(limit))
             print(f"✅ Datos obtenidos: {len(df)} registros")
             return df
             
@@ -70,71 +225,183 @@ class SteamDBView:
             print(f"❌ Error al obtener datos: {e}")
             return None
 
+    def iter_data(self, limit=None, page_size=None):
+        """Recorrer los registros por páginas sin leer el resultado completo"""
+        from view.steam_dbExport import SteamDBExporter
+        
+        page_size = page_size or self.config.VIEW_PAGE_SIZE
+        if self.engine:
+            yield from SteamDBExporter(self.engine, page_size).iter_chunks(self._all_data_query(limit))
+            return
+        local = self._local_backend()
+        if local is None:
+            return
+        df = local.df if limit is None else local.df.head(limit)
+        for start in range(0, len(df), page_size):
+            yield df.iloc[start:start + page_size]
+
+    def show_data(self, limit=None, page_size=None, interactive=True):
+        """Mostrar los registros página a página (en modo tabla pregunta antes de cada página)"""
+        chunks = self.iter_data(limit, page_size)
+        try:
+            rows = self.renderer.pages(chunks, prompt=self._next_page if interactive else None)
+            if self.renderer.is_table:
+                print(f"\n📋 {rows:,} registros mostrados")
+            return rows
+            
+        except Exception as e:
+            print(f"❌ Error al obtener datos: {e}")
+            return None
+        finally:
+            chunks.close()
+
+    def _next_page(self):
+        return input("Enter para la siguiente página, q para terminar: ").strip().lower() != 'q'
+
+    def _all_data_query(self, limit=None):
+        query = "SELECT * FROM video_games_sales"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return query
+
     def get_basic_stats(self):
         """Obtener estadísticas básicas de la base de datos"""
         try:
-            if not self.engine:
-                print("❌ No hay conexión a la base de datos")
+            if self.engine:
+                results = {
+                    name: self._execute(query, mode=mode)
+                    for name, (query, mode) in self._basic_stats_queries().items()
+                }
+            elif self._local_backend() is not None:
+                results = self.local.basic_stats()
+            else:
                 return
+            self._print_basic_stats(results)
             
-            with self.engine.connect() as conn:
+        except Exception as e:
+            print(f"❌ Error al obtener estadísticas: {e}")
+
+    def _basic_stats_queries(self):
+        """Consultas independientes de get_basic_stats: nombre -> (sql, modo)"""
+        if self.rollups_available:
+            # Conteos desde las tablas de resumen (year nunca es nulo tras la limpieza)
+            queries = {
+                'total_records': (
+                    "SELECT COALESCE(SUM(total_games), 0) FROM video_games_sales_by_year", 'scalar'
+                ),
+                'platform_stats': ("""
+                    SELECT platform, total_games as count 
+                    FROM video_games_sales_by_platform 
+                    ORDER BY count DESC 
+                    LIMIT 10
+                """, 'all'),
+                'genre_stats': ("""
+                    SELECT genre, total_games as count 
+                    FROM video_games_sales_by_genre 
+                    ORDER BY count DESC 
+                    LIMIT 10
+                """, 'all'),
+            }
+        else:
+            queries = {
                 # Total de registros
-                total_result = conn.execute(text("SELECT COUNT(*) FROM video_games_sales"))
-                total_records = total_result.scalar()
-                
+                'total_records': ("SELECT COUNT(*) FROM video_games_sales", 'scalar'),
                 # Estadísticas por plataforma
-                platform_stats = conn.execute(text("""
+                'platform_stats': ("""
                     SELECT platform, COUNT(*) as count 
                     FROM video_games_sales 
                     GROUP BY platform 
                     ORDER BY count DESC 
                     LIMIT 10
-                """)).fetchall()
-                
+                """, 'all'),
                 # Estadísticas por género
-                genre_stats = conn.execute(text("""
+                'genre_stats': ("""
                     SELECT genre, COUNT(*) as count 
                     FROM video_games_sales 
                     GROUP BY genre 
                     ORDER BY count DESC 
                     LIMIT 10
-                """)).fetchall()
-                
-                # Top juegos por ventas globales
-                top_games = conn.execute(text("""
-                    SELECT name, platform, global_sales, year
-                    FROM video_games_sales 
-                    ORDER BY global_sales DESC 
-                    LIMIT 10
-                """)).fetchall()
-                
-                print("=" * 60)
-                print("📊 ESTADÍSTICAS DE LA BASE DE DATOS")
-                print("=" * 60)
-                print(f"📈 Total de registros: {total_records:,}")
-                
-                print(f"\n🎮 TOP 10 PLATAFORMAS:")
-                for i, (platform, count) in enumerate(platform_stats, 1):
-                    print(f"  {i:2d}. {platform:<15} {count:>6,} juegos")
-                
-                print(f"\n🎯 TOP 10 GÉNEROS:")
-                for i, (genre, count) in enumerate(genre_stats, 1):
-                    print(f"  {i:2d}. {genre:<15} {count:>6,} juegos")
-                
-                print(f"\n🏆 TOP 10 JUEGOS POR VENTAS GLOBALES:")
-                for i, (name, platform, sales, year) in enumerate(top_games, 1):
-                    print(f"  {i:2d}. {name:<30} ({platform}) - {sales:>6.2f}M - {year}")
-                
-        except Exception as e:
-            print(f"❌ Error al obtener estadísticas: {e}")
+                """, 'all'),
+            }
+        
+        # Top juegos por ventas globales
+        queries['top_games'] = ("""
+            SELECT name, platform, global_sales, year
+            FROM video_games_sales 
+            ORDER BY global_sales DESC 
+            LIMIT 10
+        """, 'all')
+        return queries
+
+    def _print_basic_stats(self, results):
+        if not self.renderer.is_table:
+            # Registros sin pasar por pandas: la CLI no llega a importarlo
+            sections = {
+                'platform_stats': ['platform', 'count'],
+                'genre_stats': ['genre', 'count'],
+                'top_games': ['name', 'platform', 'global_sales', 'year'],
+            }
+            self.renderer.data({
+                'total_records': results['total_records'],
+                **{key: [dict(zip(names, row)) for row in results[key]] for key, names in sections.items()},
+            })
+            return
+        
+        lines = [
+            "=" * 60,
+            "📊 ESTADÍSTICAS DE LA BASE DE DATOS",
+            "=" * 60,
+            f"📈 Total de registros: {results['total_records']:,}",
+            "",
+            "🎮 TOP 10 PLATAFORMAS:",
+        ]
+        lines += [f"  {i:2d}. {platform:<15} {count:>6,} juegos"
+                  for i, (platform, count) in enumerate(results['platform_stats'], 1)]
+        lines += ["", "🎯 TOP 10 GÉNEROS:"]
+        lines += [f"  {i:2d}. {genre:<15} {count:>6,} juegos"
+                  for i, (genre, count) in enumerate(results['genre_stats'], 1)]
+        lines += ["", "🏆 TOP 10 JUEGOS POR VENTAS GLOBALES:"]
+        lines += [f"  {i:2d}. {name:<30} ({platform}) - {sales:>6.2f}M - {year}"
+                  for i, (name, platform, sales, year) in enumerate(results['top_games'], 1)]
+        self.renderer.write(lines)
 
-    def get_platform_analysis(self):
-        """Análisis detallado por plataforma"""
+    def get_platform_analysis(self, approximate=None):
+        """Análisis detallado por plataforma (approximate=None sigue el modo de la vista)"""
         try:
-            if not self.engine:
+            self.last_approximate = False
+            backend = self._approximate_backend(approximate, exact_cheap=self.rollups_available)
+            df = backend.platform_analysis() if backend else None
+            if df is not None:
+                self.last_approximate = True
+                self._print_approximate(df, PLATFORM_APPROX_COLUMNS, "🎮 ANÁLISIS POR PLATAFORMA", 100)
+                return df
+            if self.engine:
+                df = self._read_sql(self._platform_analysis_query())
+            elif self._local_backend() is not None:
+                df = self.local.platform_analysis()
+            else:
                 return None
+            self._print_platform_analysis(df)
+            return df
             
-            query = """
+        except Exception as e:
+            print(f"❌ Error en análisis de plataformas: {e}")
+            return None
+
+    def _platform_analysis_query(self):
+        if self.rollups_available:
+            return """
+            SELECT 
+                platform,
+                total_games,
+                total_sales * 1.0 / total_games as avg_sales,
+                max_sales,
+                total_sales,
+                sum_year * 1.0 / total_games as avg_year
+            FROM video_games_sales_by_platform 
+            ORDER BY total_sales DESC
+            """
+        return """
             SELECT 
                 platform,
                 COUNT(*) as total_games,
@@ -147,31 +414,47 @@ class SteamDBView:
             GROUP BY platform 
             ORDER BY total_sales DESC
             """
-            
-            df = pd.read_sql(query, self.engine)
-            
-            print("\n" + "=" * 80)
-            print("🎮 ANÁLISIS POR PLATAFORMA")
-            print("=" * 80)
-            print(f"{'Plataforma':<15} {'Juegos':<8} {'Ventas Avg':<12} {'Ventas Max':<12} {'Ventas Total':<15} {'Año Avg':<8}")
-            print("-" * 80)
-            
-            for _, row in df.iterrows():
-                print(f"{row['platform']:<15} {row['total_games']:<8,} {row['avg_sales']:<12.2f} {row['max_sales']:<12.2f} {row['total_sales']:<15.2f} {row['avg_year']:<8.0f}")
-            
+
+    def _print_platform_analysis(self, df):
+        self.renderer.table(df, PLATFORM_COLUMNS, banner=["", "=" * 80, "🎮 ANÁLISIS POR PLATAFORMA", "=" * 80],
+                            rule="-" * 80)
+
+    def get_genre_analysis(self, approximate=None):
+        """Análisis detallado por género (approximate=None sigue el modo de la vista)"""
+        try:
+            self.last_approximate = False
+            backend = self._approximate_backend(approximate, exact_cheap=self.rollups_available)
+            df = backend.genre_analysis() if backend else None
+            if df is not None:
+                self.last_approximate = True
+                self._print_approximate(df, GENRE_APPROX_COLUMNS, "🎯 ANÁLISIS POR GÉNERO", 90)
+                return df
+            if self.engine:
+                df = self._read_sql(self._genre_analysis_query())
+            elif self._local_backend() is not None:
+                df = self.local.genre_analysis()
+            else:
+                return None
+            self._print_genre_analysis(df)
             return df
             
         except Exception as e:
-            print(f"❌ Error en análisis de plataformas: {e}")
+            print(f"❌ Error en análisis de géneros: {e}")
             return None
 
-    def get_genre_analysis(self):
-        """Análisis detallado por género"""
-        try:
-            if not self.engine:
-                return None
-            
-            query = """
+    def _genre_analysis_query(self):
+        if self.rollups_available:
+            return """
+            SELECT 
+                genre,
+                total_games,
+                total_sales * 1.0 / total_games as avg_sales,
+                max_sales,
+                total_sales
+            FROM video_games_sales_by_genre 
+            ORDER BY total_sales DESC
+            """
+        return """
             SELECT 
                 genre,
                 COUNT(*) as total_games,
@@ -183,31 +466,41 @@ class SteamDBView:
             GROUP BY genre 
             ORDER BY total_sales DESC
             """
-            
-            df = pd.read_sql(query, self.engine)
-            
-            print("\n" + "=" * 70)
-            print("🎯 ANÁLISIS POR GÉNERO")
-            print("=" * 70)
-            print(f"{'Género':<15} {'Juegos':<8} {'Ventas Avg':<12} {'Ventas Max':<12} {'Ventas Total':<15}")
-            print("-" * 70)
-            
-            for _, row in df.iterrows():
-                print(f"{row['genre']:<15} {row['total_games']:<8,} {row['avg_sales']:<12.2f} {row['max_sales']:<12.2f} {row['total_sales']:<15.2f}")
-            
-            return df
-            
-        except Exception as e:
-            print(f"❌ Error en análisis de géneros: {e}")
-            return None
+
+    def _print_genre_analysis(self, df):
+        self.renderer.table(df, GENRE_COLUMNS, banner=["", "=" * 70, "🎯 ANÁLISIS POR GÉNERO", "=" * 70],
+                            rule="-" * 70)
 
     def get_yearly_analysis(self):
         """Análisis por año"""
         try:
-            if not self.engine:
+            if self.engine:
+                df = self._read_sql(self._yearly_analysis_query())
+            elif self._local_backend() is not None:
+                df = self.local.yearly_analysis()
+            else:
                 return None
+            self._print_yearly_analysis(df)
+            return df
             
-            query = """
+        except Exception as e:
+            print(f"❌ Error en análisis por año: {e}")
+            return None
+
+    def _yearly_analysis_query(self):
+        if self.rollups_available:
+            return """
+            SELECT 
+                year,
+                total_games,
+                total_sales * 1.0 / total_games as avg_sales,
+                total_sales
+            FROM video_games_sales_by_year 
+            WHERE year > 0
+            ORDER BY year DESC
+            LIMIT 20
+            """
+        return """
             SELECT 
                 year,
                 COUNT(*) as total_games,
@@ -219,53 +512,33 @@ class SteamDBView:
             ORDER BY year DESC
             LIMIT 20
             """
-            
-            df = pd.read_sql(query, self.engine)
-            
-            print("\n" + "=" * 60)
-            print("📅 ANÁLISIS POR AÑO (ÚLTIMOS 20 AÑOS)")
-            print("=" * 60)
-            print(f"{'Año':<6} {'Juegos':<8} {'Ventas Avg':<12} {'Ventas Total':<15}")
-            print("-" * 60)
-            
-            for _, row in df.iterrows():
-                print(f"{row['year']:<6} {row['total_games']:<8,} {row['avg_sales']:<12.2f} {row['total_sales']:<15.2f}")
-            
-            return df
-            
-        except Exception as e:
-            print(f"❌ Error en análisis por año: {e}")
-            return None
 
-    def search_games(self, search_term, limit=10):
-        """Buscar juegos por nombre"""
+    def _print_yearly_analysis(self, df):
+        self.renderer.table(df, YEARLY_COLUMNS, banner=["", "=" * 60, "📅 ANÁLISIS POR AÑO (ÚLTIMOS 20 AÑOS)", "=" * 60],
+                            rule="-" * 60)
+
+    def search_games(self, search_term, limit=10, fuzzy=True):
+        """Buscar juegos por nombre
+        
+        Usa el índice de trigramas en memoria; solo consulta la base de datos si
+        el índice está desactualizado. Sin coincidencias exactas y con fuzzy=True
+        devuelve los nombres más parecidos.
+        """
         try:
-            if not self.engine:
+            index = self._get_search_index()
+            if index is not None:
+                df, source, suggestions = self._search_index_lookup(index, search_term, limit, fuzzy)
+            elif self.engine:
+                df = self._read_sql(SEARCH_QUERY, self._search_params(search_term, limit))
+                source, suggestions = "SQL", False
+            else:
                 return None
             
-            query = """
-            SELECT name, platform, year, genre, publisher, global_sales
-            FROM video_games_sales 
-            WHERE LOWER(name) LIKE LOWER(:search_term)
-            ORDER BY global_sales DESC
-            LIMIT :limit
-            """
-            
-            df = pd.read_sql(query, self.engine, params={
-                'search_term': f'%{search_term}%',
-                'limit': limit
-            })
+            self._print_search_results(df, search_term, source, suggestions)
             
-            if len(df) > 0:
-                print(f"\n🔍 RESULTADOS DE BÚSQUEDA PARA: '{search_term}'")
-                print("=" * 80)
-                print(f"{'Nombre':<30} {'Plataforma':<12} {'Año':<6} {'Género':<12} {'Ventas':<8}")
-                print("-" * 80)
-                
-                for _, row in df.iterrows():
-                    print(f"{row['name']:<30} {row['platform']:<12} {row['year']:<6} {row['genre']:<12} {row['global_sales']:<8.2f}")
-            else:
-                print(f"❌ No se encontraron juegos con el término: '{search_term}'")
+            # El índice estaba desactualizado: reconstruirlo para las próximas búsquedas
+            if index is None:
+                self._rebuild_search_index()
             
             return df
             
@@ -273,13 +546,166 @@ class SteamDBView:
             print(f"❌ Error en búsqueda: {e}")
             return None
 
+    def _search_index_lookup(self, index, search_term, limit, fuzzy):
+        """Buscar en el índice en memoria: (resultados, origen, son_sugerencias)"""
+        start = time.perf_counter()
+        df = index.search(search_term, limit)
+        suggestions = False
+        if len(df) == 0 and fuzzy:
+            df = index.fuzzy_search(search_term, limit)
+            suggestions = len(df) > 0
+        source = f"índice en memoria, {(time.perf_counter() - start) * 1000:.2f} ms"
+        return df, source, suggestions
+
+    def _search_params(self, search_term, limit):
+        return {'search_term': f'%{search_term}%', 'limit': limit}
+
+    def _print_search_results(self, df, search_term, source, suggestions):
+        if not self.renderer.is_table:
+            self.renderer.data(df[[name for name, _, _ in SEARCH_COLUMNS_TABLE]])
+        elif len(df) > 0:
+            title = "SUGERENCIAS PARECIDAS A" if suggestions else "RESULTADOS DE BÚSQUEDA PARA:"
+            self.renderer.table(df, SEARCH_COLUMNS_TABLE, banner=["", f"🔍 {title} '{search_term}' ({source})", "=" * 80],
+                                rule="-" * 80)
+        else:
+            print(f"❌ No se encontraron juegos con el término: '{search_term}'")
+
+    def _get_search_index(self):
+        """Índice de búsqueda vigente, o None si la tabla cambió desde que se construyó
+        
+        La vigencia se comprueba como mucho cada SEARCH_INDEX_TTL segundos.
+        """
+        from view.steam_dbSearch import GameSearchIndex
+        
+        if not self.engine:
+            # Sin base de datos el índice se construye desde los datos del motor local
+            if self._search_index is None:
+                local = self._local_backend()
+                if local is None:
+                    return None
+                self._search_index = GameSearchIndex(local.df, signature='offline')
+            return self._search_index
+        
+        now = time.monotonic()
+        if self._search_index is not None and now - self._search_checked < self.config.SEARCH_INDEX_TTL:
+            return self._search_index
+        
+        signature = self._data_generation()
+        self._search_checked = now
+        if self._search_index is None:
+            # Primer uso: índice serializado si sigue vigente, si no construirlo
+            self._search_index = GameSearchIndex.load(self.config.SEARCH_INDEX_PATH, signature)
+            if self._search_index is None:
+                self._rebuild_search_index(signature)
+            return self._search_index
+        
+        if self._search_index.signature != signature:
+            self._search_index = None
+            return None
+        return self._search_index
+
+    def _data_generation(self):
+        """Versión de los datos para detectar cargas nuevas
+        
+        Usa la generación de carga que publica el loader (también cambia con
+        upserts); en esquemas sin la migración 4, una huella de la tabla.
+        """
+        generation = SchemaManager(self.engine).load_generation()
+        if generation is not None:
+            return ('generation', generation)
+        with self.engine.connect() as conn:
+            count, max_id = conn.execute(text("SELECT COUNT(*), MAX(id) FROM video_games_sales")).fetchone()
+        return (count, max_id)
+
+    def _read_sql(self, query, params=None):
+        """pd.read_sql a través de la caché de resultados"""
+        return self._cached(query, params, lambda: pd.read_sql(text(query), self.engine, params=params))
+
+    def _execute(self, query, params=None, mode='all'):
+        """Ejecutar una consulta a través de la caché de resultados
+        
+        mode: 'all' devuelve la lista de filas, 'one' la primera fila y
+        'scalar' el primer valor.
+        """
+        return self._cached((mode, query), params, lambda: self._execute_uncached(query, params, mode))
+
+    def _execute_uncached(self, query, params=None, mode='all'):
+        with self.engine.connect() as conn:
+            result = conn.execute(text(query), params or {})
+            if mode == 'scalar':
+                return result.scalar()
+            if mode == 'one':
+                row = result.fetchone()
+                return tuple(row) if row is not None else None
+            return [tuple(row) for row in result]
+
+    def _cached(self, query, params, run):
+        """Devolver el resultado en caché o ejecutar run() y guardarlo
+        
+        La generación de carga se consulta como mucho cada QUERY_CACHE_TTL
+        segundos; si cambió, la caché se vacía antes de buscar.
+        """
+        if not self.query_cache.enabled:
+            return run()
+        
+        now = time.monotonic()
+        if self._cache_checked is None or now - self._cache_checked >= self.config.QUERY_CACHE_TTL:
+            self.query_cache.set_generation(self._data_generation())
+            self._cache_checked = now
+        
+        key = self.query_cache.make_key(query, params)
+        found, result = self.query_cache.get(key)
+        if not found:
+            result = run()
+            self.query_cache.put(key, result)
+        # Se devuelve una copia para que el llamador no altere la entrada en caché
+        return result.copy() if hasattr(result, 'copy') else result
+
+    def _rebuild_search_index(self, signature=None):
+        """Construir el índice desde la tabla y guardarlo en SEARCH_INDEX_PATH"""
+        from view.steam_dbSearch import SEARCH_COLUMNS, GameSearchIndex
+        
+        signature = signature or self._data_generation()
+        df = pd.read_sql(f"SELECT {', '.join(SEARCH_COLUMNS)} FROM video_games_sales", self.engine)
+        self._search_index = GameSearchIndex(df, signature)
+        self._search_checked = time.monotonic()
+        if self.config.SEARCH_INDEX_PATH:
+            try:
+                self._search_index.save(self.config.SEARCH_INDEX_PATH)
+            except OSError as e:
+                print(f"⚠️  No se pudo guardar el índice de búsqueda: {e}")
+        return self._search_index
+
     def get_top_publishers(self, limit=15):
         """Obtener top publishers por ventas"""
         try:
-            if not self.engine:
+            if self.engine:
+                df = self._read_sql(self._top_publishers_query(), {'limit': limit})
+            elif self._local_backend() is not None:
+                df = self.local.top_publishers(limit)
+            else:
                 return None
+            self._print_top_publishers(df, limit)
+            return df
             
-            query = """
+        except Exception as e:
+            print(f"❌ Error al obtener publishers: {e}")
+            return None
+
+    def _top_publishers_query(self):
+        if self.rollups_available:
+            return """
+            SELECT 
+                publisher,
+                total_games,
+                total_sales,
+                total_sales * 1.0 / total_games as avg_sales
+            FROM video_games_sales_by_publisher 
+            WHERE publisher != 'Unknown'
+            ORDER BY total_sales DESC
+            LIMIT :limit
+            """
+        return """
             SELECT 
                 publisher,
                 COUNT(*) as total_games,
@@ -291,104 +717,226 @@ class SteamDBView:
             ORDER BY total_sales DESC
             LIMIT :limit
             """
-            
-            df = pd.read_sql(query, self.engine, params={'limit': limit})
-            
-            print(f"\n🏢 TOP {limit} PUBLISHERS POR VENTAS")
-            print("=" * 70)
-            print(f"{'Publisher':<25} {'Juegos':<8} {'Ventas Total':<15} {'Ventas Avg':<12}")
-            print("-" * 70)
-            
-            for _, row in df.iterrows():
-                print(f"{row['publisher']:<25} {row['total_games']:<8,} {row['total_sales']:<15.2f} {row['avg_sales']:<12.2f}")
-            
-            return df
-            
-        except Exception as e:
-            print(f"❌ Error al obtener publishers: {e}")
-            return None
 
-    def get_database_info(self):
-        """Obtener información general de la base de datos"""
+    def _print_top_publishers(self, df, limit):
+        self.renderer.table(df, PUBLISHER_COLUMNS, banner=["", f"🏢 TOP {limit} PUBLISHERS POR VENTAS", "=" * 70],
+                            rule="-" * 70)
+
+    def get_database_info(self, approximate=None):
+        """Obtener información general de la base de datos (approximate=None sigue el modo de la vista)"""
         try:
-            if not self.engine:
+            self.last_approximate = False
+            backend = self._approximate_backend(approximate)
+            info = backend.database_info() if backend else None
+            if info is not None:
+                self.last_approximate = True
+                self._print_approximate_database_info(info)
+                return
+            if self.engine:
+                table_info = self._execute(DATABASE_INFO_QUERY, mode='one')
+            elif self._local_backend() is not None:
+                table_info = self.local.database_info()
+            else:
                 return
+            self._print_database_info(table_info)
             
-            with self.engine.connect() as conn:
-                # Información de la tabla
-                table_info = conn.execute(text("""
-                    SELECT 
-                        COUNT(*) as total_records,
-                        MIN(year) as min_year,
-                        MAX(year) as max_year,
-                        MIN(global_sales) as min_sales,
-                        MAX(global_sales) as max_sales,
-                        AVG(global_sales) as avg_sales
-                    FROM video_games_sales
-                """)).fetchone()
-                
-                print("\n" + "=" * 50)
-                print("📊 INFORMACIÓN GENERAL DE LA BASE DE DATOS")
-                print("=" * 50)
-                print(f"📈 Total de registros: {table_info[0]:,}")
-                print(f"📅 Rango de años: {table_info[1]} - {table_info[2]}")
-                print(f"💰 Ventas mínimas: {table_info[3]:.2f}M")
-                print(f"💰 Ventas máximas: {table_info[4]:.2f}M")
-                print(f"💰 Ventas promedio: {table_info[5]:.2f}M")
-                
         except Exception as e:
             print(f"❌ Error al obtener información: {e}")
 
-    def export_to_csv(self, filename=None):
-        """Exportar datos a CSV"""
+    def _print_database_info(self, table_info):
+        if not self.renderer.is_table:
+            self.renderer.data(dict(zip(DATABASE_INFO_COLUMNS, table_info)))
+            return
+        
+        self.renderer.write([
+            "",
+            "=" * 50,
+            "📊 INFORMACIÓN GENERAL DE LA BASE DE DATOS",
+            "=" * 50,
+            f"📈 Total de registros: {table_info[0]:,}",
+            f"📅 Rango de años: {table_info[1]} - {table_info[2]}",
+            f"💰 Ventas mínimas: {table_info[3]:.2f}M",
+            f"💰 Ventas máximas: {table_info[4]:.2f}M",
+            f"💰 Ventas promedio: {table_info[5]:.2f}M",
+        ])
+
+    def _print_approximate_database_info(self, info):
+        if not self.renderer.is_table:
+            self.renderer.data(info)
+            return
+        
+        error = info['distinct_relative_error']
+        quantiles = "  ".join(f"{name} {value:.2f}M" for name, value in info['sales_quantiles'].items())
+        self.renderer.write([
+            "",
+            "=" * 50,
+            "📊 INFORMACIÓN GENERAL DE LA BASE DE DATOS",
+            "Fuente: sketches de la última carga (conteo, rangos y media exactos)",
+            "=" * 50,
+            f"📈 Total de registros: {info['total_records']:,}",
+            f"📅 Rango de años: {info['min_year']} - {info['max_year']}",
+            f"💰 Ventas mínimas: {info['min_sales']:.2f}M",
+            f"💰 Ventas máximas: {info['max_sales']:.2f}M",
+            f"💰 Ventas promedio: {info['avg_sales']:.2f}M",
+            f"🎮 Juegos distintos: ~{info['distinct_games']:,} (±{error:.1%}, HyperLogLog)",
+            f"🏢 Publishers distintos: ~{info['distinct_publishers']:,} (±{error:.1%}, HyperLogLog)",
+            f"📐 Cuantiles de ventas (t-digest): {quantiles}",
+        ])
+
+    def _approximate_backend(self, approximate=None, exact_cheap=False):
+        """Motor aproximado si el modo está activo y el informe exacto recorrería la tabla de hechos
+        
+        Con exact_cheap (el informe sale de las tablas de resumen) el resultado
+        exacto cuesta lo mismo que una muestra y no se aproxima.
+        """
+        approximate = self.approximate if approximate is None else approximate
+        if not approximate or not self.engine:
+            return None
+        if exact_cheap:
+            if self.renderer.is_table:
+                print("ℹ️  Modo aproximado: informe exacto desde las tablas de resumen (igual de rápido que una muestra)")
+            return None
+        if self.approx is None:
+            from view.steam_dbApprox import ApproximateAnalytics
+            self.approx = ApproximateAnalytics(self.engine, self.config.APPROX_SAMPLE_ROWS,
+                                               self.config.APPROX_SAMPLE_METHOD, self.config.APPROX_CONFIDENCE)
+        return self.approx
+
+    def _print_approximate(self, df, columns, title, width):
+        """Tabla de estimaciones con la fuente de la muestra y el nivel de confianza"""
+        self.renderer.table(df, columns, banner=[
+            "", "=" * width, f"{title} (APROXIMADO)",
+            f"Fuente: {df.attrs['source']}, {df.attrs['sample_rows']:,} filas muestreadas; "
+            f"± = intervalo de confianza del {df.attrs['confidence']:.0%}", "=" * width,
+        ], rule="-" * width)
+
+    def _toggle_approximate(self):
+        """Activar o desactivar el modo aproximado (opción 'a' del menú)"""
+        # Primero la respuesta rápida (muestra y sketches) y la exacta a petición
+        self.approximate = not self.approximate
+        print(f"Modo aproximado {'activado' if self.approximate else 'desactivado'}")
+
+    def _offer_exact(self):
+        """Tras una respuesta aproximada, preguntar si se calcula la exacta"""
+        if not self.last_approximate:
+            return False
+        return input("¿Calcular el resultado exacto? (s/N): ").strip().lower() in ('s', 'si', 'sí', 'y', 'yes')
+
+    def export_to_csv(self, filename=None, fmt=None, compression=None):
+        """Exportar datos a CSV (o Parquet) por bloques, sin cargar la tabla entera
+        
+        El formato y la compresión se deducen de la extensión si no se indican:
+        .csv, .csv.gz, .csv.zst o .parquet.
+        """
+        from view.steam_dbExport import SteamDBExporter
+        
         try:
-            if not self.engine:
-                return False
-            
             if not filename:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 filename = f"video_games_export_{timestamp}.csv"
             
-            df = self.get_all_data()
-            if df is not None:
-                df.to_csv(filename, index=False)
-                print(f"✅ Datos exportados exitosamente a: {filename}")
-                return True
-            return False
+            if not self.engine:
+                # Sin conexión: exportar la caché columnar
+                df = self.get_all_data()
+                if df is None:
+                    return False
+                fmt, compression = SteamDBExporter.detect_format(filename, fmt, compression)
+                if fmt == 'parquet':
+                    df.to_parquet(filename, index=False)
+                else:
+                    df.to_csv(filename, index=False, compression=compression)
+            else:
+                SteamDBExporter(self.engine, self.config.EXPORT_CHUNK_SIZE).export(filename, fmt, compression)
+            
+            print(f"✅ Datos exportados exitosamente a: {filename}")
+            return True
             
         except Exception as e:
             print(f"❌ Error al exportar: {e}")
             return False
 
+    def get_cache_stats(self):
+        """Mostrar las estadísticas de la caché de resultados de consultas"""
+        try:
+            if not self.engine:
+                return None
+            
+            stats = self.query_cache.stats()
+            print("\n🗄️  CACHÉ DE CONSULTAS")
+            print("-" * 40)
+            print(f"  {'entradas':<20} {stats['entries']:>12}")
+            print(f"  {'memoria (MB)':<20} {stats['bytes'] / 1024 / 1024:>12.2f}")
+            print(f"  {'aciertos':<20} {stats['hits']:>12}")
+            print(f"  {'fallos':<20} {stats['misses']:>12}")
+            print(f"  {'tasa de aciertos':<20} {stats['hit_rate']:>12.1%}")
+            print(f"  {'expulsiones':<20} {stats['evictions']:>12}")
+            print(f"  {'invalidaciones':<20} {stats['invalidations']:>12}")
+            return stats
+            
+        except Exception as e:
+            print(f"❌ Error al obtener estadísticas de la caché: {e}")
+            return None
+
+    def get_pool_metrics(self):
+        """Mostrar las métricas del pool de conexiones compartido"""
+        try:
+            if not self.engine:
+                return None
+            
+            metrics = get_pool_metrics(self.config.DATABASE_URL)
+            print("\n🔌 POOL DE CONEXIONES")
+            print("-" * 40)
+            for key, value in metrics.items():
+                print(f"  {key:<20} {value:>12.2f}" if isinstance(value, float) else f"  {key:<20} {value!s:>12}")
+            return metrics
+            
+        except Exception as e:
+            print(f"❌ Error al obtener métricas del pool: {e}")
+            return None
+
+    def _prompt_menu(self):
+        """Mostrar las opciones del menú y leer la elegida"""
+        print("\n" + "=" * 60)
+        print("🎮 MENÚ INTERACTIVO - VIDEO GAMES SALES DATABASE")
+        print("=" * 60)
+        print("1. Ver estadísticas básicas")
+        print("2. Análisis por plataforma")
+        print("3. Análisis por género")
+        print("4. Análisis por año")
+        print("5. Buscar juegos")
+        print("6. Top publishers")
+        print("7. Ver todos los datos (limitado)")
+        print("8. Información de la base de datos")
+        print("9. Exportar a CSV")
+        mode = 'activado' if self.approximate else 'desactivado'
+        if self.approximate and self.rollups_available:
+            mode += " (plataformas y géneros: exactos desde las tablas de resumen)"
+        print(f"a. Modo aproximado: {mode}")
+        print("0. Salir")
+        print("-" * 60)
+        
+        return input("Selecciona una opción (0-9, a): ").strip().lower()
+
     def interactive_menu(self):
         """Menú interactivo para explorar los datos"""
         while True:
-            print("\n" + "=" * 60)
-            print("🎮 MENÚ INTERACTIVO - VIDEO GAMES SALES DATABASE")
-            print("=" * 60)
-            print("1. Ver estadísticas básicas")
-            print("2. Análisis por plataforma")
-            print("3. Análisis por género")
-            print("4. Análisis por año")
-            print("5. Buscar juegos")
-            print("6. Top publishers")
-            print("7. Ver todos los datos (limitado)")
-            print("8. Información de la base de datos")
-            print("9. Exportar a CSV")
-            print("0. Salir")
-            print("-" * 60)
-            
-            choice = input("Selecciona una opción (0-9): ").strip()
+            choice = self._prompt_menu()
             
             if choice == "0":
+                self.get_cache_stats()
+                self.get_pool_metrics()
                 print("👋 ¡Hasta luego!")
                 break
             elif choice == "1":
                 self.get_basic_stats()
             elif choice == "2":
                 self.get_platform_analysis()
+                if self._offer_exact():
+                    self.get_platform_analysis(approximate=False)
             elif choice == "3":
                 self.get_genre_analysis()
+                if self._offer_exact():
+                    self.get_genre_analysis(approximate=False)
             elif choice == "4":
                 self.get_yearly_analysis()
             elif choice == "5":
@@ -398,18 +946,18 @@ class SteamDBView:
             elif choice == "6":
                 self.get_top_publishers()
             elif choice == "7":
-                limit = input("¿Cuántos registros quieres ver? (Enter para 20): ").strip()
-                limit = int(limit) if limit.isdigit() else 20
-                df = self.get_all_data(limit)
-                if df is not None:
-                    print(f"\n📋 PRIMEROS {len(df)} REGISTROS:")
-                    print(df.to_string(index=False))
+                limit = input("¿Cuántos registros quieres ver? (Enter para todos, por páginas): ").strip()
+                self.show_data(int(limit) if limit.isdigit() else None)
             elif choice == "8":
                 self.get_database_info()
+                if self._offer_exact():
+                    self.get_database_info(approximate=False)
             elif choice == "9":
-                filename = input("Nombre del archivo (Enter para auto): ").strip()
+                filename = input("Nombre del archivo (.csv, .csv.gz, .csv.zst o .parquet; Enter para auto): ").strip()
                 filename = filename if filename else None
                 self.export_to_csv(filename)
+            elif choice == "a":
+                self._toggle_approximate()
             else:
                 print("❌ Opción inválida. Intenta de nuevo.")
             
@@ -423,14 +971,14 @@ def main():
     # Crear instancia de la vista
     view = SteamDBView()
     
-    # Verificar conexión
+    # Sin conexión los informes se calculan en memoria sobre la caché columnar o el CSV
     if not view.engine:
-        print("❌ No se pudo conectar a la base de datos.")
-        print("Asegúrate de que:")
-        print("1. PostgreSQL esté ejecutándose")
-        print("2. La base de datos 'steam_db' exista")
-        print("3. Las credenciales en .env sean correctas")
-        return
+        print("⚠️  No se pudo conectar a la base de datos: se usa el motor de análisis local")
+        if view._local_backend() is None:
+            print("Asegúrate de que:")
+            print("1. PostgreSQL esté ejecutándose y las credenciales en .env sean correctas, o")
+            print(f"2. Exista el CSV de origen ({view.config.INPUT_PATH}) o la caché columnar")
+            return
     
     # Mostrar información básica
     view.get_database_info()